@@ -9,16 +9,28 @@ from pathlib import Path
 
 from mcp_agent.app import MCPApp
 from mcp_agent.agents.agent import Agent
-from mcp_agent.workflows.llm.augmented_llm_openai import OpenAIAugmentedLLM
 
 # from mcp_agent.workflows.orchestrator.orchestrator import Orchestrator
 from mcp_agent.workflows.llm.augmented_llm import RequestParams
 
 from .settings import get_settings
-from ..tool.rendering import render_design
+from ..tool.render_tools import render_design, render_design_views
+from ..tool.render_pool import get_render_pool
+from ..tool.render_cache import configure_render_cache
+from ..tool.threaded import threaded_tool
 from ..tool.image_check import load_image
+from ..tool.design_check import check_design_file, clear_design_history
+from ..tool.kinematic_preview import preview_actuation
+from ..tool.workspace_analysis import analyze_workspace, design_score
 from ..llm.openai import OpenAIAugmentedLLMWithImage
+from ..llm.cache import (
+    CachedOpenAIAugmentedLLM,
+    configure_llm_cache,
+    get_llm_cache,
+)
+from ..llm.scheduler import configure_llm_scheduler
 from ..llm.workflow import ElasticaSynthesizeTeam
+from ..tracing import configure_tracer, span
 from ..prompts.designer import design_instructions
 from ..prompts.rendering import rendering_instructions
 
@@ -49,28 +61,70 @@ class ElasticaAgents:
         self.workdir = Path(workdir).resolve()
         self.verbose = verbose
         self.model = "gpt-4o-mini"
+        self.n_candidates = 1
+        self.plan_type = "iterative"
+        self.llm_cache = None
+        self.call_timeout = None
 
         self.logger.debug(f"Initialized ElasticaAgents with workdir: {self.workdir}")
 
         # Create working directory
         self.workdir.mkdir(parents=True, exist_ok=True)
 
-    def config(self, model: str | None = None):
+        # Re-rendering an unchanged design.json is served from disk
+        configure_render_cache(self.workdir / ".render_cache")
+
+    def config(
+        self,
+        model: str | None = None,
+        candidates: int | None = None,
+        plan_type: str | None = None,
+        llm_cache: str | None = None,
+        call_timeout: float | None = None,
+        rpm: float | None = None,
+    ):
         """Configure the agents
 
         Args:
             model: LLM model to use
             temp: Temperature for LLM generation
+            candidates: Number of designs explored concurrently (best-of-N)
+            plan_type: "iterative" (default) or "full" LLM planning, or "pipeline"
+                (fixed design/render/evaluate loop), see ElasticaSynthesizeTeam
+            llm_cache: "record" to cache LLM responses in the workdir, "replay" to
+                serve every call from that cache and fail on a miss
+            call_timeout: Seconds after which a planner or agent call is cancelled
+            rpm: Requests per minute allowed for the model, shared by every
+                session in the process
 
         Returns:
             self: For method chaining
         """
         if model:
             self.model = model
-
-        self.logger.debug(f"Configured with model={self.model}")
+        if candidates:
+            self.n_candidates = candidates
+        if plan_type:
+            self.plan_type = plan_type
+        if llm_cache:
+            self.llm_cache = llm_cache
+            configure_llm_cache(self.workdir / ".llm_cache.sqlite", mode=llm_cache)
+        if call_timeout:
+            self.call_timeout = call_timeout
+        if rpm:
+            configure_llm_scheduler(rate_limits={self.model: rpm})
+
+        self.logger.debug(
+            f"Configured with model={self.model}, candidates={self.n_candidates}, "
+            f"plan_type={self.plan_type}, llm_cache={self.llm_cache}, "
+            f"call_timeout={self.call_timeout}"
+        )
         return self
 
+    def score_candidate(self, index: int, plan_result) -> float:
+        """Score of design candidate index, from its design file in the workdir"""
+        return design_score(self.workdir / f"design_{index}.json")
+
     async def _run_agents(
         self, app: MCPApp, planner: Agent, agents: list[Agent], prompt: str
     ):
@@ -89,12 +143,18 @@ class ElasticaAgents:
             # context.config.mcp.servers["filesystem"].args.extend([self.workdir.as_posix()])
 
             team = ElasticaSynthesizeTeam(
-                llm_factory=OpenAIAugmentedLLM,
-                planner=OpenAIAugmentedLLM(planner),
+                llm_factory=CachedOpenAIAugmentedLLM,
+                planner=CachedOpenAIAugmentedLLM(planner),
                 context=context,
                 available_llms=agents,
-                # We will let the orchestrator iteratively plan the task at every step
-                plan_type="iterative",
+                # "iterative" plans every step; the opt-in pipeline runs design ->
+                # render -> evaluate and only asks the planner on failures
+                plan_type=self.plan_type,
+                n_candidates=self.n_candidates,
+                # Each candidate runs one agent at a time
+                max_concurrency=self.n_candidates,
+                scorer=self.score_candidate,
+                call_timeout=self.call_timeout,
             )
 
             # Let the judge LLM coordinate the game
@@ -104,6 +164,8 @@ class ElasticaAgents:
             )
 
             logger.info(f"Orchestrator result: {response}")
+            if get_llm_cache() is not None:
+                logger.info("LLM cache: ", data=get_llm_cache().stats())
 
     async def run(self, prompt: str):
         """Run the ElasticaAgents with the given prompt
@@ -123,10 +185,17 @@ class ElasticaAgents:
             self.logger.info("Agent processing the design request...")
             team = self.create_team()
             planner = self.create_planner()
-            start_time = time.time()
-            await self._run_agents(app, planner, team, prompt)
-            end_time = time.time()
-            self.logger.info(f"Agent processing time: {end_time - start_time:.2f}s")
+            # Earlier sessions' attempts are not repeats of this one's
+            clear_design_history()
+            # Spans of planner/agent calls, LLM requests, tools and renders
+            tracer = configure_tracer(
+                self.workdir / "logs" / time.strftime("trace-%Y%m%d-%H%M%S.jsonl")
+            )
+            with span("run", "elastica-agents", model=self.model) as run:
+                await self._run_agents(app, planner, team, prompt)
+            self.logger.info(
+                f"Agent processing time: {run.duration:.2f}s (trace: {tracer.path})"
+            )
 
         except Exception as e:
             self.logger.error(f"Error running agents: {e}")
@@ -158,33 +227,42 @@ class ElasticaAgents:
         Create the team of agents
         """
 
-        design_agent = OpenAIAugmentedLLM(
+        design_agent = CachedOpenAIAugmentedLLM(
             Agent(
                 name="design_agent",
                 instruction=design_instructions,
                 server_names=["filesystem"],
+                functions=[
+                    threaded_tool(check_design_file),
+                    threaded_tool(preview_actuation),
+                ],
             )
         )
 
-        rendering_agent = OpenAIAugmentedLLM(
+        # Start the render workers now rather than on the first render
+        get_render_pool()
+
+        rendering_agent = CachedOpenAIAugmentedLLM(
             Agent(
                 name="rendering_agent",
                 instruction=rendering_instructions.format(
                     workdir=self.workdir.as_posix()
                 ),
                 server_names=["filesystem"],
-                functions=[render_design],
+                functions=[render_design, render_design_views],
             )
         )
 
-        evaluator_agent = OpenAIAugmentedLLM(
+        evaluator_agent = CachedOpenAIAugmentedLLM(
             Agent(
                 name="evaluator_agent",
                 instruction="""
                 Load the latest design rendered image and report what does it look like, and if it convey the design intent.
+                Call analyze_workspace on the design file and report its reachable volume and tip displacements,
+                so designs can be compared by what they can reach.
                 If it is reasonably good, confirm the design. Don't be too strict.
             """,
-                functions=[load_image],
+                functions=[threaded_tool(load_image), threaded_tool(analyze_workspace)],
                 # server_names=["fetch"],
             )
         )
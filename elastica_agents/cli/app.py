@@ -12,10 +12,55 @@ from elastica_agents.agents import ElasticaAgents
     "--workdir", type=click.Path(), default=".", help="Working directory for outputs"
 )
 @click.option("--model", default="gpt-4o-mini", help="LLM model to use.")
+@click.option(
+    "--candidates",
+    type=int,
+    default=1,
+    help="Design candidates explored concurrently; the best scoring one is kept",
+)
+@click.option(
+    "--plan-type",
+    type=click.Choice(["iterative", "full", "pipeline"]),
+    default="iterative",
+    help="iterative/full: LLM planning; pipeline: fixed design/render/evaluate loop",
+)
+@click.option(
+    "--llm-cache",
+    type=click.Choice(["record", "replay"]),
+    default=None,
+    help="record: cache LLM responses in the workdir; replay: serve every call "
+    "from that cache and fail on a miss",
+)
+@click.option(
+    "--call-timeout",
+    type=float,
+    default=None,
+    help="Seconds after which a planner or agent call is cancelled",
+)
+@click.option(
+    "--rpm", type=float, default=None, help="Requests per minute allowed for the model"
+)
 @click.option("--verbose", is_flag=True, help="Enable verbose output")
-def main(message: str, workdir: str, verbose: bool, model: str):
+def main(
+    message: str,
+    workdir: str,
+    verbose: bool,
+    model: str,
+    candidates: int,
+    plan_type: str,
+    llm_cache: str | None,
+    call_timeout: float | None,
+    rpm: float | None,
+):
     """ElasticaAgents CLI tool for soft robotics design"""
 
     # Run simple mcp-agent
-    agents = ElasticaAgents(workdir=workdir, verbose=verbose).config(model=model)
+    agents = ElasticaAgents(workdir=workdir, verbose=verbose).config(
+        model=model,
+        candidates=candidates,
+        plan_type=plan_type,
+        llm_cache=llm_cache,
+        call_timeout=call_timeout,
+        rpm=rpm,
+    )
     asyncio.run(agents.run(message))
@@ -0,0 +1,30 @@
+import click
+import uvicorn
+from elastica_agents.simulation.server import (
+    QUEUE_SIZE,
+    SimulationService,
+    create_app,
+)
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Interface to bind")
+@click.option("--port", type=int, default=8000, help="Port to bind")
+@click.option(
+    "-j",
+    "--workers",
+    type=int,
+    default=None,
+    help="Simulations run at once (default: all CPUs)",
+)
+@click.option(
+    "--queue-size",
+    type=int,
+    default=QUEUE_SIZE,
+    help="Waiting jobs before new requests are refused",
+)
+def main(host: str, port: int, workers: int | None, queue_size: int):
+    """Simulation server (HTTP job API and MCP tools) shared by agent sessions"""
+
+    service = SimulationService(max_workers=workers, queue_size=queue_size)
+    uvicorn.run(create_app(service), host=host, port=port)
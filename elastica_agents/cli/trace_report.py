@@ -0,0 +1,33 @@
+import sys
+import click
+from elastica_agents.tracing import format_report, load_spans, summarize_spans
+
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True), required=True)
+@click.option("--top", type=int, default=20, help="Rows to show, slowest first")
+@click.option(
+    "--kind",
+    multiple=True,
+    help="Only these span kinds (run, planner, agent, llm, tool, render)",
+)
+def main(paths: tuple[str, ...], top: int, kind: tuple[str, ...]):
+    """Summarize trace-*.jsonl files (or workdirs' logs/) into hot spots"""
+
+    spans = load_spans(paths)
+    if kind:
+        spans = [record for record in spans if record["kind"] in kind]
+    if not spans:
+        click.echo("No spans found")
+        sys.exit(1)
+
+    runs = [record for record in spans if record["kind"] == "run"]
+    click.echo(
+        f"{len({record['run'] for record in spans})} runs, {len(spans)} spans"
+        + (
+            f", mean run time {sum(r['ms'] for r in runs) / len(runs) / 1e3:.2f}s"
+            if runs
+            else ""
+        )
+    )
+    click.echo(format_report(summarize_spans(spans), top=top))
@@ -0,0 +1,23 @@
+import sys
+import click
+from elastica_agents.tool.bulk_validation import validate_archive
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True))
+@click.option(
+    "-j", "--jobs", type=int, default=None, help="Worker processes (default: all CPUs)"
+)
+@click.option("--chunksize", type=int, default=256, help="Designs per worker task")
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Also run geometric consistency and self-intersection checks",
+)
+def main(path: str, jobs: int | None, chunksize: int, check: bool):
+    """Validate a directory of design.json files or a JSONL archive of designs"""
+
+    _, failed = validate_archive(
+        path, max_workers=jobs, chunksize=chunksize, checks=check, echo=click.echo
+    )
+    sys.exit(1 if failed else 0)
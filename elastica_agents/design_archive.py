@@ -0,0 +1,235 @@
+"""
+Binary archive of many designs with memory-mapped random access.
+
+An archive is a directory of ``.npy`` columns. Every PackedDesign field is
+concatenated across designs into one column, and ``offsets.npy`` holds, for
+each design, where its rows start in every row space (actuators, modes,
+connections, ...). Columns are opened with ``mmap_mode="r"``, so reading one
+design or one column (e.g. every radius of every design) touches only those
+bytes and never parses JSON.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.packed_design import PackedDesign, RADIUS, ROD_COLUMNS
+
+FORMAT_VERSION = 1
+
+# Row spaces of the offset table
+ACTUATORS = 0
+IDS = 1
+MODES = 2
+PARAMETERS = 3
+CONNECTIONS = 4
+CONNECTION_ACTUATORS = 5
+LINKS = 6
+GROUPS = 7
+GROUP_PAIRS = 8
+N_SPACES = 9
+
+# Column name -> (row space, dtype, shape of one row)
+COLUMNS = {
+    "rods": (ACTUATORS, np.float64, (ROD_COLUMNS,)),
+    "mode_counts": (ACTUATORS, np.int64, ()),
+    "parameter_counts": (ACTUATORS, np.int64, ()),
+    "ids": (IDS, np.str_, ()),
+    "modes": (MODES, np.int8, ()),
+    "parameter_kinds": (PARAMETERS, np.int8, ()),
+    "parameter_directions": (PARAMETERS, np.float64, (3,)),
+    "parameter_magnitudes": (PARAMETERS, np.float64, ()),
+    "connection_sizes": (CONNECTIONS, np.int64, ()),
+    "link_counts": (CONNECTIONS, np.int64, ()),
+    "connection_directors": (CONNECTIONS, np.float64, (3, 3)),
+    "connection_actuators": (CONNECTION_ACTUATORS, np.int64, ()),
+    "link_locations": (LINKS, np.float64, (3,)),
+    "group_names": (GROUPS, np.str_, ()),
+    "group_sizes": (GROUPS, np.int64, ()),
+    "group_actuators": (GROUP_PAIRS, np.int64, ()),
+    "group_parameters": (GROUP_PAIRS, np.int64, ()),
+}
+
+
+def _offsets(counts) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _columns(packed: PackedDesign) -> dict[str, np.ndarray]:
+    return {
+        "rods": packed.rods,
+        "mode_counts": np.diff(packed.mode_offsets),
+        "parameter_counts": np.diff(packed.parameter_offsets),
+        "ids": packed.ids,
+        "modes": packed.modes,
+        "parameter_kinds": packed.parameter_kinds,
+        "parameter_directions": packed.parameter_directions,
+        "parameter_magnitudes": packed.parameter_magnitudes,
+        "connection_sizes": np.diff(packed.connection_offsets),
+        "link_counts": np.diff(packed.link_offsets),
+        "connection_directors": packed.connection_directors,
+        "connection_actuators": packed.connection_actuators,
+        "link_locations": packed.link_locations,
+        "group_names": packed.group_names,
+        "group_sizes": np.diff(packed.group_offsets),
+        "group_actuators": packed.group_actuators,
+        "group_parameters": packed.group_parameters,
+    }
+
+
+def write_archive(
+    path: str | Path, designs: Iterable[RobotDesignSchema | PackedDesign]
+) -> int:
+    """
+    Write designs to a new archive directory (existing columns are replaced).
+
+    Returns:
+        Number of designs written
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    parts = {name: [] for name in COLUMNS}
+    counts = []
+    for design in designs:
+        packed = (
+            design
+            if isinstance(design, PackedDesign)
+            else PackedDesign.from_design(design)
+        )
+        columns = _columns(packed)
+        row = [0] * N_SPACES
+        for name, (space, _, _) in COLUMNS.items():
+            parts[name].append(columns[name])
+            row[space] = len(columns[name])
+        counts.append(row)
+
+    offsets = np.zeros((len(counts) + 1, N_SPACES), dtype=np.int64)
+    np.cumsum(
+        np.array(counts, dtype=np.int64).reshape(-1, N_SPACES), axis=0, out=offsets[1:]
+    )
+    np.save(path / "offsets.npy", offsets)
+    for name, (_, dtype, shape) in COLUMNS.items():
+        if dtype is np.str_:
+            values = [value for part in parts[name] for value in part]
+            column = np.array(values, dtype=np.str_) if values else np.zeros(0, "<U1")
+        else:
+            column = np.empty((0, *shape), dtype=dtype)
+            if parts[name]:
+                column = np.concatenate(
+                    [
+                        np.asarray(part, dtype=dtype).reshape(-1, *shape)
+                        for part in parts[name]
+                    ]
+                )
+        np.save(path / f"{name}.npy", column)
+
+    with open(path / "meta.json", "w") as f:
+        json.dump({"version": FORMAT_VERSION, "designs": len(counts)}, f)
+    return len(counts)
+
+
+class DesignArchive:
+    """
+    Read-only, memory-mapped view of an archive written by write_archive.
+
+    Example:
+        archive = DesignArchive("designs.archive")
+        design = archive.design(42)            # RobotDesignSchema
+        radii = archive.column("radii")        # every radius of every design
+        owner = archive.design_of("actuators") # design index of every rod
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", "r") as f:
+            meta = json.load(f)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported design archive version {meta['version']} "
+                f"(expected {FORMAT_VERSION})"
+            )
+        self.offsets = np.load(self.path / "offsets.npy", mmap_mode="r")
+        self.columns = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode="r") for name in COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[PackedDesign]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _rows(self, name: str, index: int) -> np.ndarray:
+        space = COLUMNS[name][0]
+        lo, hi = self.offsets[index, space], self.offsets[index + 1, space]
+        return self.columns[name][lo:hi]
+
+    def __getitem__(self, index: int) -> PackedDesign:
+        """Design index as a PackedDesign whose arrays are views of the archive."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"design index {index} out of range")
+
+        def rows(name):
+            return self._rows(name, index)
+
+        return PackedDesign(
+            ids=rows("ids").tolist(),
+            rods=rows("rods"),
+            mode_offsets=_offsets(rows("mode_counts")),
+            modes=rows("modes"),
+            parameter_offsets=_offsets(rows("parameter_counts")),
+            parameter_kinds=rows("parameter_kinds"),
+            parameter_directions=rows("parameter_directions"),
+            parameter_magnitudes=rows("parameter_magnitudes"),
+            connection_offsets=_offsets(rows("connection_sizes")),
+            connection_actuators=rows("connection_actuators"),
+            link_offsets=_offsets(rows("link_counts")),
+            link_locations=rows("link_locations"),
+            connection_directors=rows("connection_directors"),
+            group_names=rows("group_names").tolist(),
+            group_offsets=_offsets(rows("group_sizes")),
+            group_actuators=rows("group_actuators"),
+            group_parameters=rows("group_parameters"),
+        )
+
+    def design(self, index: int) -> RobotDesignSchema:
+        return self[index].to_design()
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        A whole column across all designs, memory-mapped.
+
+        Besides the stored columns, "start_points", "end_points", "radii" and
+        "directors" are views into "rods".
+        """
+        rods = self.columns["rods"]
+        views = {
+            "start_points": lambda: rods[:, 0:3],
+            "end_points": lambda: rods[:, 3:6],
+            "radii": lambda: rods[:, RADIUS],
+            "directors": lambda: rods[:, 7:16].reshape(-1, 3, 3),
+        }
+        if name in views:
+            return views[name]()
+        return self.columns[name]
+
+    def design_of(self, space: str = "actuators") -> np.ndarray:
+        """Design index of every row of a row space, e.g. of every rod."""
+        column = {
+            "actuators": ACTUATORS,
+            "modes": MODES,
+            "parameters": PARAMETERS,
+            "connections": CONNECTIONS,
+            "links": LINKS,
+            "groups": GROUPS,
+        }[space]
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets[:, column]))
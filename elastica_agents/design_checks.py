@@ -0,0 +1,314 @@
+"""
+Semantic checks of a RobotDesignSchema beyond what the type schema enforces.
+
+Every check runs as one batched NumPy operation over the PackedDesign arrays,
+so the cost does not grow with per-actuator Python work.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Literal
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.packed_design import MODES, PackedDesign
+from elastica_agents.tool.collision import connected_pairs, find_self_intersections
+from elastica_agents.tool.geometry import RodGeometry
+
+ORTHONORMAL_TOLERANCE = 1e-3
+ALIGNMENT_TOLERANCE = 1e-3  # 1 - cos(angle) between d3 and the rod axis
+MAX_RADIUS_TO_LENGTH = 0.1
+
+
+@dataclass
+class DesignIssue:
+    """
+    One problem found in a design.
+
+    Attributes:
+        code: Machine readable kind of issue, e.g. "d3_not_along_rod"
+        message: What is wrong and how to fix it
+        severity: "error" for inconsistent designs, "warning" for questionable ones
+        actuator: Id of the offending actuator, if any
+        connection: Index of the offending connection, if any
+        group: Name of the offending actuation group, if any
+    """
+
+    code: str
+    message: str
+    severity: Literal["error", "warning"] = "error"
+    actuator: str | None = None
+    connection: int | None = None
+    group: str | None = None
+
+    def __str__(self) -> str:
+        where = [
+            f"{name} {value}"
+            for name, value in (
+                ("actuator", self.actuator),
+                ("connection", self.connection),
+                ("group", self.group),
+            )
+            if value is not None
+        ]
+        location = f" ({', '.join(where)})" if where else ""
+        return f"[{self.severity}] {self.code}{location}: {self.message}"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def orthonormality_error(directors: np.ndarray) -> np.ndarray:
+    """Max deviation of each (3, 3) frame from a right-handed orthonormal frame."""
+    gram = directors @ directors.transpose(0, 2, 1)
+    deviation = np.abs(gram - np.eye(3)).max(axis=(1, 2), initial=0.0)
+    # A reflection is orthonormal but left-handed
+    handed = np.abs(np.linalg.det(directors) - 1.0)
+    return np.maximum(deviation, handed)
+
+
+def check_actuators(packed: PackedDesign) -> list[DesignIssue]:
+    ids = packed.actuator_ids
+    issues = []
+
+    # Frames
+    bad_frames = np.flatnonzero(
+        orthonormality_error(packed.directors) > ORTHONORMAL_TOLERANCE
+    )
+    issues += [
+        DesignIssue(
+            "directors_not_orthonormal",
+            "d1, d2, d3 must be unit length, mutually perpendicular and right-handed "
+            "(d3 = d1 x d2).",
+            actuator=ids[i],
+        )
+        for i in bad_frames
+    ]
+
+    # Geometry
+    tangents = packed.end_points - packed.start_points
+    lengths = np.linalg.norm(tangents, axis=1)
+    zero_length = lengths <= 0.0
+    issues += [
+        DesignIssue(
+            "zero_length",
+            "start_point and end_point coincide.",
+            actuator=ids[i],
+        )
+        for i in np.flatnonzero(zero_length)
+    ]
+
+    d3_norm = np.linalg.norm(packed.directors[:, 2], axis=1)
+    cosine = np.einsum("ij,ij->i", tangents, packed.directors[:, 2]) / np.where(
+        zero_length | (d3_norm == 0.0), 1.0, lengths * d3_norm
+    )
+    misaligned = ~zero_length & (1.0 - cosine > ALIGNMENT_TOLERANCE)
+    issues += [
+        DesignIssue(
+            "d3_not_along_rod",
+            f"orientation.d3 must point along end_point - start_point "
+            f"(angle is {np.degrees(np.arccos(np.clip(c, -1.0, 1.0))):.1f} deg).",
+            actuator=ids[i],
+        )
+        for i, c in zip(np.flatnonzero(misaligned), cosine[misaligned])
+    ]
+
+    radii = packed.radii
+    issues += [
+        DesignIssue("nonpositive_radius", "radius must be positive.", actuator=ids[i])
+        for i in np.flatnonzero(radii <= 0.0)
+    ]
+    thick = ~zero_length & (radii > MAX_RADIUS_TO_LENGTH * lengths)
+    issues += [
+        DesignIssue(
+            "not_slender",
+            f"radius {radii[i]:g} is large for length {lengths[i]:g}; keep "
+            f"radius below {MAX_RADIUS_TO_LENGTH:g} x length.",
+            severity="warning",
+            actuator=ids[i],
+        )
+        for i in np.flatnonzero(thick)
+    ]
+
+    # Ids
+    _, first, counts = np.unique(
+        np.array(ids, dtype=object), return_index=True, return_counts=True
+    )
+    issues += [
+        DesignIssue("duplicate_id", "actuator ids must be unique.", actuator=ids[i])
+        for i in first[counts > 1]
+    ]
+
+    # Modes and their parameters
+    n_modes = np.diff(packed.mode_offsets)
+    n_parameters = np.diff(packed.parameter_offsets)
+    mismatch = n_modes != n_parameters
+    issues += [
+        DesignIssue(
+            "parameter_count_mismatch",
+            f"{n_modes[i]} modes but {n_parameters[i]} actuation_parameter entries; "
+            "give one parameter per mode, in the same order.",
+            actuator=ids[i],
+        )
+        for i in np.flatnonzero(mismatch)
+    ]
+    # Parameter kinds use the same codes as MODES
+    paired = np.repeat(~mismatch, n_modes)
+    wrong_kind = np.zeros(len(packed.modes), dtype=bool)
+    wrong_kind[paired] = (
+        packed.modes[paired]
+        != packed.parameter_kinds[np.repeat(~mismatch, n_parameters)]
+    )
+    owner = np.repeat(np.arange(packed.n_actuators), n_modes)
+    issues += [
+        DesignIssue(
+            "parameter_mode_mismatch",
+            f"mode {k - packed.mode_offsets[owner[k]]} is "
+            f"{MODES[packed.modes[k]].value!r} but its actuation_parameter does "
+            "not match it.",
+            actuator=ids[owner[k]],
+        )
+        for k in np.flatnonzero(wrong_kind)
+    ]
+    return issues
+
+
+def check_connections(packed: PackedDesign) -> list[DesignIssue]:
+    issues = []
+    owner = np.repeat(
+        np.arange(len(packed.connection_offsets) - 1),
+        np.diff(packed.connection_offsets),
+    )
+    unknown = packed.connection_actuators >= packed.n_actuators
+    issues += [
+        DesignIssue(
+            "unknown_actuator",
+            f"connection refers to actuator {packed.ids[a]!r}, which does not exist.",
+            connection=int(c),
+        )
+        for a, c in zip(packed.connection_actuators[unknown], owner[unknown])
+    ]
+
+    bad_frames = np.flatnonzero(
+        orthonormality_error(packed.connection_directors) > ORTHONORMAL_TOLERANCE
+    )
+    issues += [
+        DesignIssue(
+            "directors_not_orthonormal",
+            "connection orientation must be a right-handed orthonormal frame.",
+            connection=int(c),
+        )
+        for c in bad_frames
+    ]
+    return issues
+
+
+def check_actuation_groups(packed: PackedDesign) -> list[DesignIssue]:
+    issues = []
+    owner = np.repeat(
+        np.arange(len(packed.group_offsets) - 1), np.diff(packed.group_offsets)
+    )
+    actuators = packed.group_actuators
+    unknown = actuators >= packed.n_actuators
+    issues += [
+        DesignIssue(
+            "unknown_actuator",
+            f"actuation group refers to actuator {packed.ids[a]!r}, which does not exist.",
+            group=packed.group_names[g],
+        )
+        for a, g in zip(actuators[unknown], owner[unknown])
+    ]
+
+    n_modes = np.diff(packed.mode_offsets)
+    # Unknown actuators are given zero modes (and are reported above)
+    available = np.append(n_modes, 0)[np.minimum(actuators, packed.n_actuators)]
+    parameters = packed.group_parameters
+    out_of_range = ~unknown & ((parameters < 0) | (parameters >= available))
+    issues += [
+        DesignIssue(
+            "invalid_mode_index",
+            f"mode index {p} of actuator {packed.ids[a]!r} is out of range "
+            f"(it has {m} modes).",
+            group=packed.group_names[g],
+        )
+        for a, p, m, g in zip(
+            actuators[out_of_range],
+            parameters[out_of_range],
+            available[out_of_range],
+            owner[out_of_range],
+        )
+    ]
+    return issues
+
+
+def check_finite_geometry(packed: PackedDesign) -> list[DesignIssue]:
+    """Infinite or NaN coordinates, which JSON parsing lets through."""
+    issues = [
+        DesignIssue(
+            "non_finite_geometry",
+            "start_point, end_point, radius and orientation must be finite numbers.",
+            actuator=packed.actuator_ids[i],
+        )
+        for i in np.flatnonzero(~np.isfinite(packed.rods).all(axis=1))
+    ]
+    owner = np.repeat(
+        np.arange(len(packed.link_offsets) - 1), np.diff(packed.link_offsets)
+    )
+    bad_links = ~np.isfinite(packed.link_locations).all(axis=1)
+    bad_frames = ~np.isfinite(packed.connection_directors).all(axis=(1, 2))
+    bad_frames[owner[bad_links]] = True
+    issues += [
+        DesignIssue(
+            "non_finite_geometry",
+            "rigid_link_locations and orientation must be finite numbers.",
+            connection=int(c),
+        )
+        for c in np.flatnonzero(bad_frames)
+    ]
+    return issues
+
+
+def check_self_intersections(packed: PackedDesign) -> list[DesignIssue]:
+    """Rods that interpenetrate without sharing a connection."""
+    members = np.where(
+        packed.connection_actuators < packed.n_actuators,
+        packed.connection_actuators,
+        -1,
+    )
+    pairs, penetration = find_self_intersections(
+        RodGeometry.from_packed(packed),
+        exclude=connected_pairs(packed.connection_offsets, members),
+    )
+    ids = packed.actuator_ids
+    return [
+        DesignIssue(
+            "rods_intersect",
+            f"overlaps actuator {ids[j]!r} by {depth:.3g}; move the rods apart or "
+            "connect them.",
+            actuator=ids[i],
+        )
+        for (i, j), depth in zip(pairs.tolist(), penetration.tolist())
+    ]
+
+
+def check_design(design: RobotDesignSchema | PackedDesign) -> list[DesignIssue]:
+    """
+    Run every semantic check on a design.
+
+    Returns:
+        Issues found, empty if the design is consistent
+    """
+    packed = (
+        design if isinstance(design, PackedDesign) else PackedDesign.from_design(design)
+    )
+    non_finite = check_finite_geometry(packed)
+    issues = (
+        non_finite
+        + check_actuators(packed)
+        + check_connections(packed)
+        + check_actuation_groups(packed)
+    )
+    # The collision broad phase cannot bin infinite or NaN coordinates
+    if not non_finite:
+        issues += check_self_intersections(packed)
+    return issues
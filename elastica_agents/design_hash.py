@@ -0,0 +1,262 @@
+"""
+Canonical hashing and near-duplicate lookup of designs.
+
+The canonical form drops everything that does not change the robot: actuator
+ids and the names of actuation groups, and the order of actuators,
+connections, connection members, rigid links and group members. Floats are
+rounded to DECIMALS before hashing so round-off from re-serialisation does
+not change the hash.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.packed_design import PackedDesign
+
+DECIMALS = 9
+LENGTH_QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+N_FEATURES = 4 + 3 + 2 * len(LENGTH_QUANTILES) + 3 + 6
+
+
+def _round(values) -> np.ndarray:
+    # +0.0 folds -0.0 into 0.0
+    return np.round(np.asarray(values, dtype=np.float64), DECIMALS) + 0.0
+
+
+def _sort_rows(rows: np.ndarray) -> np.ndarray:
+    """Row order that sorts rows lexicographically."""
+    if len(rows) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.lexsort(rows.T[::-1])
+
+
+def canonical_form(design: RobotDesignSchema | PackedDesign) -> list[np.ndarray]:
+    """
+    Order and naming independent arrays describing design.
+
+    Returns:
+        Arrays for actuators, connections and actuation groups; equal designs
+        (up to renaming and reordering) give equal arrays
+    """
+    packed = (
+        design if isinstance(design, PackedDesign) else PackedDesign.from_design(design)
+    )
+    n = packed.n_actuators
+    n_modes = np.diff(packed.mode_offsets)
+    n_parameters = np.diff(packed.parameter_offsets)
+
+    # Actuators: geometry, then each mode and parameter in order
+    width = int(max(n_modes.max(initial=0), n_parameters.max(initial=0)))
+    modes = np.full((n, width), -1.0)
+    parameters = np.full((n, width, 5), np.nan)
+    for row in range(n):
+        lo, hi = packed.mode_offsets[row], packed.mode_offsets[row + 1]
+        modes[row, : hi - lo] = packed.modes[lo:hi]
+        lo, hi = packed.parameter_offsets[row], packed.parameter_offsets[row + 1]
+        parameters[row, : hi - lo] = np.column_stack(
+            [
+                packed.parameter_kinds[lo:hi],
+                packed.parameter_directions[lo:hi],
+                packed.parameter_magnitudes[lo:hi],
+            ]
+        )
+    actuators = np.column_stack(
+        [
+            _round(packed.rods),
+            n_modes,
+            n_parameters,
+            modes,
+            np.nan_to_num(_round(parameters.reshape(n, width * 5)), nan=-np.inf),
+        ]
+    )
+    order = _sort_rows(actuators)
+    actuators = actuators[order]
+
+    # Canonical row of every id; unknown ids keep their (sorted) name rank
+    rank = np.empty(len(packed.ids), dtype=np.int64)
+    rank[order] = np.arange(n)
+    dangling = sorted(range(n, len(packed.ids)), key=packed.ids.__getitem__)
+    rank[dangling] = n + np.arange(len(dangling))
+
+    connections = []
+    for c in range(len(packed.connection_offsets) - 1):
+        lo, hi = packed.connection_offsets[c], packed.connection_offsets[c + 1]
+        members = np.sort(rank[packed.connection_actuators[lo:hi]])
+        lo, hi = packed.link_offsets[c], packed.link_offsets[c + 1]
+        links = _round(packed.link_locations[lo:hi])
+        links = links[_sort_rows(links)]
+        connections.append(
+            np.concatenate(
+                [
+                    [len(members), len(links)],
+                    members,
+                    links.ravel(),
+                    _round(packed.connection_directors[c]).ravel(),
+                ]
+            )
+        )
+    groups = []
+    for g in range(len(packed.group_offsets) - 1):
+        lo, hi = packed.group_offsets[g], packed.group_offsets[g + 1]
+        pairs = np.column_stack(
+            [rank[packed.group_actuators[lo:hi]], packed.group_parameters[lo:hi]]
+        )
+        groups.append(np.concatenate([[hi - lo], pairs[_sort_rows(pairs)].ravel()]))
+
+    return [
+        actuators,
+        *sorted(connections, key=lambda row: tuple(row.tolist())),
+        np.array([np.nan]),  # separator between connections and groups
+        *sorted(groups, key=lambda row: tuple(row.tolist())),
+    ]
+
+
+def design_hash(design: RobotDesignSchema | PackedDesign) -> str:
+    """Stable hash of the canonical form of design."""
+    digest = hashlib.sha256()
+    for part in canonical_form(design):
+        part = np.ascontiguousarray(part, dtype="<f8")
+        digest.update(np.array(part.shape, dtype="<i8").tobytes())
+        digest.update(part.tobytes())
+    return digest.hexdigest()
+
+
+def design_features(design: RobotDesignSchema | PackedDesign) -> np.ndarray:
+    """
+    Fixed-length, order independent geometric summary of design.
+
+    Counts, total length, bounding box, length and radius quantiles, mode
+    histogram and the second moment of rod directions (weighted by length).
+    """
+    packed = (
+        design if isinstance(design, PackedDesign) else PackedDesign.from_design(design)
+    )
+    tangents = packed.end_points - packed.start_points
+    lengths = np.linalg.norm(tangents, axis=1)
+    if packed.n_actuators:
+        points = np.vstack([packed.start_points, packed.end_points])
+        extent = points.max(axis=0) - points.min(axis=0)
+        length_quantiles = np.quantile(lengths, LENGTH_QUANTILES)
+        radius_quantiles = np.quantile(packed.radii, LENGTH_QUANTILES)
+        weights = lengths / max(lengths.sum(), np.finfo(float).tiny)
+        units = tangents / np.where(lengths > 0.0, lengths, 1.0)[:, None]
+        moment = np.einsum("i,ij,ik->jk", weights, units, units)
+    else:
+        extent = np.zeros(3)
+        length_quantiles = radius_quantiles = np.zeros(len(LENGTH_QUANTILES))
+        moment = np.zeros((3, 3))
+    return np.concatenate(
+        [
+            [
+                packed.n_actuators,
+                len(packed.connection_offsets) - 1,
+                len(packed.group_names),
+                lengths.sum(),
+            ],
+            np.sort(extent),
+            length_quantiles,
+            radius_quantiles,
+            np.bincount(packed.modes, minlength=3)[:3],
+            moment[np.triu_indices(3)],
+        ]
+    )
+
+
+@dataclass
+class DesignMatch:
+    """
+    A previously seen design that matches a query.
+
+    Attributes:
+        key: Key the prior design was added with
+        value: Payload stored with it (e.g. render path or evaluation)
+        distance: 0.0 for an exact (canonical hash) match, otherwise the
+            relative feature distance
+    """
+
+    key: Any
+    value: Any
+    distance: float
+
+    @property
+    def exact(self) -> bool:
+        return self.distance == 0.0
+
+
+@dataclass
+class DesignSimilarityIndex:
+    """
+    Exact and near-duplicate lookup of designs seen before.
+
+    Exact repeats are found by canonical hash. Near duplicates are found by
+    the relative distance between feature vectors,
+    ``|f - g| / max(|f|, |g|)``, computed against every stored design at once.
+
+    Example:
+        index = DesignSimilarityIndex()
+        index.add("step-3", design, value="design_3.png")
+        match = index.match(new_design)
+        if match is not None and match.exact: ...
+    """
+
+    tolerance: float = 0.02
+    keys: list = field(default_factory=list)
+    values: list = field(default_factory=list)
+    hashes: dict[str, int] = field(default_factory=dict)
+    features: np.ndarray = field(default_factory=lambda: np.zeros((0, N_FEATURES)))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key, design: RobotDesignSchema | PackedDesign, value=None) -> None:
+        packed = (
+            design
+            if isinstance(design, PackedDesign)
+            else PackedDesign.from_design(design)
+        )
+        self.hashes.setdefault(design_hash(packed), len(self.keys))
+        self.features = np.vstack([self.features, design_features(packed)])
+        self.keys.append(key)
+        self.values.append(value)
+
+    def match(
+        self,
+        design: RobotDesignSchema | PackedDesign,
+        tolerance: float | None = None,
+    ) -> DesignMatch | None:
+        """
+        The exact repeat of design if one was added, otherwise the closest
+        stored design within tolerance, otherwise None.
+        """
+        packed = (
+            design
+            if isinstance(design, PackedDesign)
+            else PackedDesign.from_design(design)
+        )
+        position = self.hashes.get(design_hash(packed))
+        if position is not None:
+            return DesignMatch(self.keys[position], self.values[position], 0.0)
+        if not len(self):
+            return None
+
+        query = design_features(packed)
+        norms = np.maximum(np.linalg.norm(self.features, axis=1), np.linalg.norm(query))
+        distance = np.linalg.norm(self.features - query, axis=1) / np.where(
+            norms > 0.0, norms, 1.0
+        )
+        # Only designs with the same number of actuators and connections are candidates
+        distance[np.any(self.features[:, :2] != query[:2], axis=1)] = np.inf
+        position = int(np.argmin(distance))
+        tolerance = self.tolerance if tolerance is None else tolerance
+        if distance[position] > tolerance:
+            return None
+        # A near duplicate never reports distance 0.0, which is reserved for exact
+        return DesignMatch(
+            self.keys[position],
+            self.values[position],
+            max(float(distance[position]), np.finfo(float).tiny),
+        )
@@ -0,0 +1,267 @@
+"""
+Connectivity index of a RobotDesignSchema.
+
+Actuator ids are resolved to rows once, and the actuator/connection incidence
+is stored in CSR form (``offsets[i]:offsets[i + 1]`` slices ``values``), so
+consumers look up ids, neighbours and the kinematic tree without scanning
+``design.actuators``.
+"""
+
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+
+
+def _csr(groups: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    np.cumsum([len(group) for group in groups], out=offsets[1:])
+    values = np.fromiter(
+        (value for group in groups for value in group),
+        dtype=np.int64,
+        count=int(offsets[-1]),
+    )
+    return offsets, values
+
+
+def _transpose(
+    offsets: np.ndarray, values: np.ndarray, n_columns: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """CSR of the transposed incidence; entries with value -1 are dropped."""
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    keep = values >= 0
+    rows, values = rows[keep], values[keep]
+    order = np.argsort(values, kind="stable")
+    transposed = np.zeros(n_columns + 1, dtype=np.int64)
+    np.cumsum(np.bincount(values, minlength=n_columns), out=transposed[1:])
+    return transposed, rows[order]
+
+
+def _layout(design: RobotDesignSchema) -> tuple:
+    """The top-level lists of design and their lengths; O(1) to compare."""
+    return (
+        design.actuators,
+        len(design.actuators),
+        design.connections,
+        len(design.connections),
+        design.actuation_groups,
+        len(design.actuation_groups),
+    )
+
+
+def _same_layout(design: RobotDesignSchema, layout: tuple) -> bool:
+    return all(
+        current is cached if isinstance(cached, list) else current == cached
+        for current, cached in zip(_layout(design), layout)
+    )
+
+
+@dataclass
+class DesignIndex:
+    """
+    Id lookup, actuator/connection adjacency and kinematic tree of a design.
+
+    Rows are positions in ``design.actuators``. References to ids that no
+    actuator defines are stored as -1.
+
+    Attributes:
+        ids: Actuator id of each row
+        rows: Actuator id -> row (first actuator with that id)
+        connection_offsets, connection_actuators: CSR connection -> actuator rows
+        actuator_offsets, actuator_connections: CSR actuator row -> connections
+        neighbor_offsets, neighbors: CSR actuator row -> actuator rows sharing
+            a connection with it
+        groups: Actuation group name -> (actuator row, mode index) pairs
+        root: Row the kinematic tree is grown from
+        parent: Parent row in the tree, -1 for the root of each component
+        depth: Number of connections between each row and its root
+        order: Rows in breadth-first order, parents before children
+        child_offsets, children: CSR row -> child rows in the tree
+    """
+
+    ids: list[str]
+    rows: dict[str, int]
+    connection_offsets: np.ndarray
+    connection_actuators: np.ndarray
+    actuator_offsets: np.ndarray
+    actuator_connections: np.ndarray
+    neighbor_offsets: np.ndarray
+    neighbors: np.ndarray
+    groups: dict[str, list[tuple[int, int]]]
+    root: int = 0
+    parent: np.ndarray = field(init=False)
+    depth: np.ndarray = field(init=False)
+    order: np.ndarray = field(init=False)
+    child_offsets: np.ndarray = field(init=False)
+    children: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.build_tree(self.root)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_design(cls, design: RobotDesignSchema, root: int = 0) -> "DesignIndex":
+        ids = [actuator.id for actuator in design.actuators]
+        rows = {}
+        for row, actuator_id in enumerate(ids):
+            rows.setdefault(actuator_id, row)
+
+        members = [
+            [rows.get(actuator_id, -1) for actuator_id in connection.actuators]
+            for connection in design.connections
+        ]
+        connection_offsets, connection_actuators = _csr(members)
+        actuator_offsets, actuator_connections = _transpose(
+            connection_offsets, connection_actuators, len(ids)
+        )
+
+        adjacent = [set() for _ in ids]
+        for group in members:
+            known = [row for row in group if row >= 0]
+            for row in known:
+                adjacent[row].update(known)
+        for row, group in enumerate(adjacent):
+            group.discard(row)
+        neighbor_offsets, neighbors = _csr([sorted(group) for group in adjacent])
+
+        groups = {
+            group.name: [
+                (rows.get(actuator_id, -1), mode)
+                for actuator_id, mode in group.actuators_actuation
+            ]
+            for group in design.actuation_groups
+        }
+        return cls(
+            ids=ids,
+            rows=rows,
+            connection_offsets=connection_offsets,
+            connection_actuators=connection_actuators,
+            actuator_offsets=actuator_offsets,
+            actuator_connections=actuator_connections,
+            neighbor_offsets=neighbor_offsets,
+            neighbors=neighbors,
+            groups=groups,
+            root=root,
+        )
+
+    def row(self, actuator_id: str) -> int:
+        """Row of an actuator id. Raises KeyError for unknown ids."""
+        return self.rows[actuator_id]
+
+    def connections_of(self, row: int) -> np.ndarray:
+        return self.actuator_connections[
+            self.actuator_offsets[row] : self.actuator_offsets[row + 1]
+        ]
+
+    def actuators_of(self, connection: int) -> np.ndarray:
+        return self.connection_actuators[
+            self.connection_offsets[connection] : self.connection_offsets[
+                connection + 1
+            ]
+        ]
+
+    def neighbors_of(self, row: int) -> np.ndarray:
+        return self.neighbors[
+            self.neighbor_offsets[row] : self.neighbor_offsets[row + 1]
+        ]
+
+    def build_tree(self, root: int = 0) -> None:
+        """
+        Grow the kinematic tree breadth first from root. Components that are
+        not connected to root get their own root, the lowest row in them.
+        """
+        n = len(self.ids)
+        self.root = root
+        self.parent = np.full(n, -1, dtype=np.int64)
+        self.depth = np.full(n, -1, dtype=np.int64)
+        order = []
+        for start in ([root] if 0 <= root < n else []) + list(range(n)):
+            if self.depth[start] >= 0:
+                continue
+            self.depth[start] = 0
+            queue = deque([start])
+            while queue:
+                row = queue.popleft()
+                order.append(row)
+                for neighbor in self.neighbors_of(row).tolist():
+                    if self.depth[neighbor] < 0:
+                        self.depth[neighbor] = self.depth[row] + 1
+                        self.parent[neighbor] = row
+                        queue.append(neighbor)
+        self.order = np.array(order, dtype=np.int64)
+        self.child_offsets, self.children = _transpose(np.arange(n + 1), self.parent, n)
+
+    @property
+    def roots(self) -> np.ndarray:
+        return np.flatnonzero(self.parent < 0)
+
+    def children_of(self, row: int) -> np.ndarray:
+        return self.children[self.child_offsets[row] : self.child_offsets[row + 1]]
+
+    def branch_points(self) -> np.ndarray:
+        """Rows with more than one child in the kinematic tree."""
+        return np.flatnonzero(np.diff(self.child_offsets) > 1)
+
+    def serial_chains(self) -> list[list[int]]:
+        """
+        Maximal serial chains of the kinematic tree, root side first.
+
+        A chain starts at a root or at a child of a branch point and continues
+        while each actuator has exactly one child.
+        """
+        counts = np.diff(self.child_offsets)
+        starts = [
+            row
+            for row in self.order.tolist()
+            if self.parent[row] < 0 or counts[self.parent[row]] != 1
+        ]
+        chains = []
+        for row in starts:
+            chain = [row]
+            while counts[row] == 1:
+                row = int(self.children[self.child_offsets[row]])
+                chain.append(row)
+            chains.append(chain)
+        return chains
+
+
+# id(design) -> (weak reference to design, layout, index). Kept off the model
+# so that indexing a design does not change its equality.
+_indexes: dict[int, tuple[weakref.ref, tuple, DesignIndex]] = {}
+
+
+def design_index(design: RobotDesignSchema, root: int = 0) -> DesignIndex:
+    """
+    Index of design, built once per design object and then looked up in O(1).
+
+    The index is rebuilt when actuators, connections or actuation groups are
+    added, removed or replaced. Edits inside them (an actuator id, the ids of
+    a connection, the members of a group) are not detected: call
+    invalidate_design_index after making them. The cached index is dropped
+    when the design is garbage collected.
+    """
+    key = id(design)
+    cached = _indexes.get(key)
+    if (
+        cached is None
+        or cached[0]() is not design
+        or not _same_layout(design, cached[1])
+    ):
+        index = DesignIndex.from_design(design, root=root)
+        reference = weakref.ref(design, lambda _: _indexes.pop(key, None))
+        _indexes[key] = (reference, _layout(design), index)
+        return index
+    index = cached[2]
+    if index.root != root:
+        index.build_tree(root)
+    return index
+
+
+def invalidate_design_index(design: RobotDesignSchema) -> None:
+    """Drop the cached index of design after editing its connectivity in place."""
+    _indexes.pop(id(design), None)
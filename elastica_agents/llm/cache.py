@@ -0,0 +1,343 @@
+"""
+On-disk cache of LLM responses with record and replay modes.
+
+Every chat completion request of an OpenAIAugmentedLLM is keyed by its full
+argument set (model, messages, tools and sampling parameters) and the response
+is kept in a SQLite file. Because the conversation so far is part of the key,
+a run that repeats the same prompt, model and tool results walks the same
+chain of cached responses; tools are still executed, so files written by
+them (design.json, renders) are reproduced as well.
+
+Modes:
+    "record": serve hits, call the API on a miss and store the response
+    "replay": serve hits only; a miss raises CacheMissError, so a workflow run
+        can be replayed offline and any divergence fails loudly
+
+Example:
+    configure_llm_cache("runs/.llm_cache.sqlite", mode="replay")
+    llm = CachedOpenAIAugmentedLLM(agent)
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Literal, Type
+
+from openai import OpenAI, RateLimitError
+from openai.types.chat import ChatCompletion
+from pydantic import BaseModel
+
+from mcp_agent.workflows.llm.augmented_llm import ModelT, RequestParams
+from mcp_agent.workflows.llm.augmented_llm_openai import OpenAIAugmentedLLM
+
+from elastica_agents.llm.scheduler import (
+    ScheduledExecutor,
+    get_llm_scheduler,
+    is_chat_completion,
+)
+from elastica_agents.tracing import Span, span
+
+CacheMode = Literal["record", "replay"]
+
+
+class CacheMissError(LookupError):
+    """A request was not found in a cache in replay mode."""
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f"Cannot hash {type(value).__name__} in an LLM request")
+
+
+def request_key(kind: str, arguments: dict) -> str:
+    """Canonical hash of an LLM request; kind separates request types."""
+    payload = json.dumps(
+        [kind, arguments], sort_keys=True, separators=(",", ":"), default=_jsonable
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed cache of LLM responses with TTL and size-bounded LRU eviction.
+
+    The last-access time of every entry is updated on a hit, so eviction
+    removes the least recently used responses first. The file can be shared
+    by several processes; SQLite serializes the writes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: CacheMode = "record",
+        ttl: float | None = None,
+        max_bytes: int = 512 * 1024**2,
+    ):
+        """
+        Args:
+            path: SQLite file to store the responses in
+            mode: "record" or "replay" (see the module docstring)
+            ttl: Seconds after which an entry expires (never if None); ignored
+                in replay mode, where every recorded response stays valid
+            max_bytes: Total response size above which least recently used
+                entries are evicted
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown LLM cache mode {mode!r}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, kind TEXT, model TEXT, created REAL, "
+                "accessed REAL, size INTEGER, response TEXT)"
+            )
+
+    def _expired(self, created: float) -> bool:
+        return (
+            self.mode == "record"
+            and self.ttl is not None
+            and time.time() - created > self.ttl
+        )
+
+    def get(self, key: str) -> str | None:
+        """Stored response for key; None on a miss in record mode."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created, response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and not self._expired(row[0]):
+                with self._db:
+                    self._db.execute(
+                        "UPDATE responses SET accessed = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+                self.hits += 1
+                return row[1]
+            self.misses += 1
+        if self.mode == "replay":
+            raise CacheMissError(f"LLM response {key[:12]} is not in {self.path}")
+        return None
+
+    def put(self, key: str, response: str, kind: str = "", model: str = "") -> None:
+        """Store response under key and evict old entries if needed."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, model, now, now, len(response), response),
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones above max_bytes."""
+        with self._lock, self._db:
+            if self.ttl is not None and self.mode == "record":
+                self._db.execute(
+                    "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,)
+                )
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed"
+            ).fetchall()
+            stale = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_llm_cache: LLMCache | None = None
+
+
+def configure_llm_cache(
+    path: str | Path | None,
+    mode: CacheMode = "record",
+    ttl: float | None = None,
+    max_bytes: int = 512 * 1024**2,
+) -> LLMCache | None:
+    """Set (or, with path=None, disable) the cache used by CachedOpenAIAugmentedLLM."""
+    global _llm_cache
+    if _llm_cache is not None:
+        _llm_cache.close()
+    _llm_cache = None if path is None else LLMCache(path, mode, ttl, max_bytes)
+    return _llm_cache
+
+
+def get_llm_cache() -> LLMCache | None:
+    return _llm_cache
+
+
+class CachingExecutor:
+    """
+    Wraps an mcp-agent executor so chat completion calls go through the LLM
+    cache, each in an "llm" span with its token usage; every other task is
+    passed on unchanged.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+    async def execute(self, *tasks, **kwargs):
+        if len(tasks) != 1 or not is_chat_completion(tasks[0]):
+            return await self.executor.execute(*tasks, **kwargs)
+
+        with span("llm", str(kwargs.get("model"))) as current:
+            results = await self._complete(tasks, kwargs, current)
+            response = results[0]
+            if isinstance(response, BaseException):
+                current.set(error=type(response).__name__)
+            elif current.attrs.get("cache") != "hit" and response.usage:
+                current.add(
+                    tokens_in=response.usage.prompt_tokens,
+                    tokens_out=response.usage.completion_tokens,
+                )
+            return results
+
+    async def _complete(self, tasks, kwargs, current: Span):
+        cache = get_llm_cache()
+        if cache is None:
+            return await self.executor.execute(*tasks, **kwargs)
+
+        key = request_key("chat", kwargs)
+        cached = cache.get(key)
+        current.set(cache="miss" if cached is None else "hit")
+        if cached is not None:
+            return [ChatCompletion.model_validate_json(cached)]
+        results = await self.executor.execute(*tasks, **kwargs)
+        if isinstance(results[0], ChatCompletion):
+            cache.put(
+                key, results[0].model_dump_json(), "chat", str(kwargs.get("model"))
+            )
+        return results
+
+
+class CachedOpenAIAugmentedLLM(OpenAIAugmentedLLM):
+    """
+    OpenAIAugmentedLLM whose API calls are served from the LLM cache; misses,
+    structured extractions included, are sent under the rate limits of the
+    process-wide LLMScheduler. API
+    requests and tool calls are traced (see elastica_agents.tracing).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = CachingExecutor(ScheduledExecutor(self.executor))
+
+    async def generate_structured(
+        self,
+        message,
+        response_model: Type[ModelT],
+        request_params: RequestParams | None = None,
+    ) -> ModelT:
+        import instructor
+
+        # Same two steps as OpenAIAugmentedLLM: free text, then extraction
+        response = await self.generate_str(
+            message=message, request_params=request_params
+        )
+        params = self.get_request_params(request_params)
+        model = await self.select_model(params) or "gpt-4o"
+
+        with span("llm", model, structured=response_model.__name__) as current:
+            cache = get_llm_cache()
+            if cache is not None:
+                key = request_key(
+                    "structured",
+                    {
+                        "model": model,
+                        "schema": response_model.model_json_schema(),
+                        "response": response,
+                    },
+                )
+                cached = cache.get(key)
+                current.set(cache="miss" if cached is None else "hit")
+                if cached is not None:
+                    return response_model.model_validate_json(cached)
+
+            client = instructor.from_openai(
+                OpenAI(
+                    api_key=self.context.config.openai.api_key,
+                    base_url=self.context.config.openai.base_url,
+                ),
+                mode=instructor.Mode.TOOLS_STRICT,
+            )
+
+            async def send():
+                # The sync client runs in a thread so the event loop keeps going
+                try:
+                    return [
+                        await asyncio.to_thread(
+                            client.chat.completions.create,
+                            model=model,
+                            response_model=response_model,
+                            messages=[{"role": "user", "content": response}],
+                        )
+                    ]
+                except Exception as error:
+                    # instructor wraps API errors; unwrap rate limits to retry them
+                    cause = error.__cause__
+                    return [cause if isinstance(cause, RateLimitError) else error]
+
+            structured_response = (await get_llm_scheduler().request(model, send))[0]
+            if isinstance(structured_response, BaseException):
+                raise structured_response
+            usage = getattr(
+                getattr(structured_response, "_raw_response", None), "usage", None
+            )
+            if usage is not None:
+                current.add(
+                    tokens_in=usage.prompt_tokens, tokens_out=usage.completion_tokens
+                )
+            if cache is not None:
+                cache.put(
+                    key, structured_response.model_dump_json(), "structured", model
+                )
+            return structured_response
+
+    async def execute_tool_call(self, tool_call):
+        with span("tool", tool_call.function.name, agent=self.name):
+            return await super().execute_tool_call(tool_call)
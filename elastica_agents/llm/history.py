@@ -0,0 +1,133 @@
+"""
+Incremental, token-budgeted rendering of a PlanResult for planner and task prompts.
+
+format_plan_result re-formats every step on every call and pastes the whole
+history into each prompt, so prompts grow with every iteration. PlanHistory
+formats each step once as it is appended, keeps only the latest steps in full,
+compacts older ones into one-line summaries under a token budget, and caches
+the rendered string until the plan changes.
+
+Example:
+    history = PlanHistory(plan_result, token_budget=4000)
+    prompt = TASK_PROMPT_TEMPLATE.format(context=history.render(), ...)
+"""
+
+from mcp_agent.workflows.orchestrator.orchestrator_models import (
+    PlanResult,
+    StepResult,
+    format_step_result,
+)
+from mcp_agent.workflows.orchestrator.orchestrator_prompts import (
+    PLAN_RESULT_TEMPLATE,
+)
+
+# Rough token estimate of English and JSON text without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def summarize_step(step_result: StepResult, max_chars: int = 240) -> str:
+    """One-line digest of a step: its description and the start of each result."""
+    tasks = []
+    for task in step_result.task_results:
+        result = " ".join(str(task.result).split())
+        if len(result) > max_chars:
+            result = result[: max_chars - 3] + "..."
+        agent = getattr(task, "agent", None) or task.description
+        tasks.append(f"{agent}: {result}")
+    return f"{step_result.step.description} -> " + " | ".join(tasks or ["no tasks"])
+
+
+class PlanHistory:
+    """
+    Rendered context of one PlanResult, kept in sync as steps are appended.
+
+    The newest recent_steps steps are shown in full (as format_plan_result
+    would), older ones as summarize_step lines. Once the rendered context
+    exceeds token_budget, further full steps are compacted, and then the
+    oldest summaries are dropped and only counted.
+    """
+
+    def __init__(
+        self,
+        plan_result: PlanResult,
+        token_budget: int | None = 4000,
+        recent_steps: int = 3,
+    ):
+        """
+        Args:
+            plan_result: Plan whose steps are rendered
+            token_budget: Approximate token limit of the rendered steps (None
+                keeps every step in full)
+            recent_steps: Latest steps always shown in full (at least one)
+        """
+        self.plan_result = plan_result
+        self.token_budget = token_budget
+        self.recent_steps = max(recent_steps, 1)
+        self.n_steps = 0
+        self.omitted = 0
+        # (step number, step, text, tokens) of the compacted and the full steps
+        self.summaries: list[tuple[int, StepResult, str, int]] = []
+        self.full: list[tuple[int, StepResult, str, int]] = []
+        self._rendered: str | None = None
+        self._status = None
+
+    @property
+    def tokens(self) -> int:
+        return sum(tokens for *_, tokens in self.summaries + self.full)
+
+    def sync(self) -> None:
+        """Append the steps added to the plan since the last call, once each."""
+        steps = self.plan_result.step_results
+        for step_result in steps[self.n_steps :]:
+            self.n_steps += 1
+            text = f"{self.n_steps}:\n{format_step_result(step_result)}"
+            self.full.append((self.n_steps, step_result, text, estimate_tokens(text)))
+            self._compact()
+            self._rendered = None
+
+    def _compact(self) -> None:
+        while len(self.full) > self.recent_steps or (
+            self._over_budget() and len(self.full) > 1
+        ):
+            number, step_result, *_ = self.full.pop(0)
+            summary = f"{number}: {summarize_step(step_result)}"
+            self.summaries.append(
+                (number, step_result, summary, estimate_tokens(summary))
+            )
+        while self._over_budget() and self.summaries:
+            self.summaries.pop(0)
+            self.omitted += 1
+
+    def _over_budget(self) -> bool:
+        return self.token_budget is not None and self.tokens > self.token_budget
+
+    def render(self) -> str:
+        """The plan in PLAN_RESULT_TEMPLATE form, re-rendered only on changes."""
+        self.sync()
+        status = (self.plan_result.is_complete, self.plan_result.result)
+        if self._rendered is not None and status == self._status:
+            return self._rendered
+
+        parts = []
+        if self.omitted:
+            parts.append(f"({self.omitted} earlier steps omitted)")
+        if self.summaries:
+            parts.append(
+                "Earlier steps (summarized):\n"
+                + "\n".join(text for *_, text, _ in self.summaries)
+            )
+        parts.extend(text for *_, text, _ in self.full)
+
+        is_complete, result = status
+        self._rendered = PLAN_RESULT_TEMPLATE.format(
+            plan_objective=self.plan_result.objective,
+            steps_str="\n\n".join(parts) if parts else "No steps executed yet",
+            plan_status="Complete" if is_complete else "In Progress",
+            plan_result=result if is_complete else "In Progress",
+        )
+        self._status = status
+        return self._rendered
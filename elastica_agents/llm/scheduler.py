@@ -0,0 +1,258 @@
+"""
+Process-wide scheduling of LLM calls.
+
+One LLMScheduler is shared by every ElasticaSynthesizeTeam (and every cached
+OpenAI LLM) in the process, so concurrent sessions draw from the same limits:
+
+- Calls (a planner step or an agent task) run in a bounded number of slots;
+  planner calls are granted free slots before worker calls, since a waiting
+  planner blocks the next step of its whole session.
+- Each call gets a deadline after which it is cancelled (TimeoutError).
+- Each API request waits for a token of its model's token bucket (requests
+  per minute), and rate-limit errors are retried with exponential backoff
+  (or the server's Retry-After), pausing the bucket for every caller.
+
+Example:
+    configure_llm_scheduler(max_concurrency=8, rate_limits={"gpt-4o-mini": 500})
+    result = await get_llm_scheduler().run(llm.generate_str(prompt), PLANNER, 60)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Coroutine
+
+from openai import RateLimitError
+
+from elastica_agents.tracing import current_span
+
+# Priorities of scheduled calls, lower runs first
+PLANNER = 0
+WORKER = 1
+
+
+def is_chat_completion(task) -> bool:
+    """Whether an executor task is an OpenAI chat completion request."""
+    return getattr(task, "__qualname__", "") == "Completions.create"
+
+
+def _retry_after(error: RateLimitError) -> float | None:
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens per second up to capacity.
+
+    Tokens are reserved immediately and may go negative, so concurrent
+    callers are served in arrival order, each sleeping until its token exists.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = max(rate, 1.0) if capacity is None else capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take amount tokens; returns the seconds to wait until they exist."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return max(-self.tokens / self.rate, 0.0)
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        wait = self.reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next seconds (after a rate-limit error)."""
+        self.reserve(0.0)
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class LLMScheduler:
+    """
+    Bounded, prioritized and rate-limited execution of LLM calls.
+
+    Not thread-safe: share it between the sessions of one event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        rate_limits: dict[str, float] | None = None,
+        default_rate: float | None = None,
+        timeout: float | None = None,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+    ):
+        """
+        Args:
+            max_concurrency: Calls running at once
+            rate_limits: Requests per minute allowed for each model
+            default_rate: Requests per minute of models not in rate_limits
+                (unlimited if None)
+            timeout: Default deadline of a call in seconds (None waits forever)
+            max_retries: Retries of a request that hit a rate limit
+            backoff: Delay before the first retry; doubled for each further one
+        """
+        self.max_concurrency = max_concurrency
+        self.rate_limits = dict(rate_limits or {})
+        self.default_rate = default_rate
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.active = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.retries = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, model: str | None) -> TokenBucket | None:
+        """Token bucket of model, or None if it is not rate limited."""
+        rate = self.rate_limits.get(model, self.default_rate)
+        if rate is None:
+            return None
+        if model not in self._buckets:
+            self._buckets[model] = TokenBucket(rate / 60.0)
+        return self._buckets[model]
+
+    async def _acquire(self, priority: int) -> None:
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot to the most urgent waiter still waiting
+        while self._waiters:
+            *_, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    async def run(
+        self,
+        coroutine: Coroutine[Any, Any, Any],
+        priority: int = WORKER,
+        timeout: float | None = None,
+    ) -> Any:
+        """
+        Await coroutine in a slot, cancelling it after its deadline.
+
+        Args:
+            coroutine: The LLM call
+            priority: PLANNER or WORKER
+            timeout: Deadline in seconds once running (defaults to self.timeout)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        queued = time.perf_counter()
+        try:
+            await self._acquire(priority)
+        except asyncio.CancelledError:
+            coroutine.close()
+            raise
+        if (span := current_span()) is not None:
+            span.set(queue_ms=round((time.perf_counter() - queued) * 1e3, 2))
+        self.calls += 1
+        try:
+            return await asyncio.wait_for(coroutine, timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self._release()
+
+    async def request(
+        self, model: str | None, send: Callable[[], Awaitable[list]]
+    ) -> list:
+        """
+        Send one API request under model's rate limit.
+
+        Args:
+            model: Model the request is for
+            send: Issues the request; returns executor results, where a
+                RateLimitError result is retried
+
+        Returns:
+            The results of the last attempt
+        """
+        bucket = self.bucket(model)
+        for attempt in range(self.max_retries + 1):
+            if bucket is not None:
+                await bucket.acquire()
+            results = await send()
+            if (
+                not isinstance(results[0], RateLimitError)
+                or attempt == self.max_retries
+            ):
+                return results
+            delay = _retry_after(results[0]) or self.backoff * 2**attempt
+            self.retries += 1
+            if (span := current_span()) is not None:
+                span.add(retries=1)
+            if bucket is not None:
+                bucket.pause(delay)
+            await asyncio.sleep(delay)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": sum(not waiter.done() for *_, waiter in self._waiters),
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+        }
+
+
+_llm_scheduler = LLMScheduler()
+
+
+def configure_llm_scheduler(**kwargs) -> LLMScheduler:
+    """Replace the process-wide scheduler; kwargs are those of LLMScheduler."""
+    global _llm_scheduler
+    _llm_scheduler = LLMScheduler(**kwargs)
+    return _llm_scheduler
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    return _llm_scheduler
+
+
+class ScheduledExecutor:
+    """
+    Wraps an mcp-agent executor so chat completion requests go through the
+    rate limits of the process-wide scheduler; other tasks pass unchanged.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+    async def execute(self, *tasks, **kwargs):
+        if len(tasks) != 1 or not is_chat_completion(tasks[0]):
+            return await self.executor.execute(*tasks, **kwargs)
+        return await get_llm_scheduler().request(
+            kwargs.get("model"), lambda: self.executor.execute(*tasks, **kwargs)
+        )
@@ -1,6 +1,11 @@
+import asyncio
 import contextlib
+import inspect
+import re
+from dataclasses import dataclass
 from typing import (
     Any,
+    Awaitable,
     Callable,
     Coroutine,
     List,
@@ -19,7 +24,7 @@ from mcp_agent.workflows.llm.augmented_llm import (
     RequestParams,
 )
 from mcp_agent.workflows.orchestrator.orchestrator_models import (
-    format_plan_result,
+    AgentTask,
     format_step_result,
     NextStep,
     Plan,
@@ -36,11 +41,56 @@ from mcp_agent.workflows.orchestrator.orchestrator_prompts import (
 )
 from mcp_agent.logging.logger import get_logger
 
+from elastica_agents.llm.history import PlanHistory
+from elastica_agents.llm.scheduler import (
+    PLANNER,
+    WORKER,
+    LLMScheduler,
+    get_llm_scheduler,
+)
+from elastica_agents.tracing import span
+
 if TYPE_CHECKING:
     from mcp_agent.context import Context
 
 logger = get_logger(__name__)
 
+CANDIDATE_NOTE = """
+You are exploring design candidate {index} of {count}. Candidates are designed
+in parallel in the same directory: write the design to design_{index}.json and
+render it to design_{index}.png (instead of design.json and design.png) so they
+do not overwrite each other.
+"""
+
+
+# The fixed loop of the "pipeline" plan type: (agent, task) per stage. The
+# evaluator's verdict decides between finishing and starting over.
+PIPELINE = [
+    (
+        "design_agent",
+        "Design the robot for the objective and write the design file. If an earlier "
+        "evaluation rejected the design, address its feedback.",
+    ),
+    ("rendering_agent", "Render the latest design file to an image."),
+    (
+        "evaluator_agent",
+        "Evaluate the latest rendered design against the objective. End your answer "
+        "with 'VERDICT: CONFIRMED' if the design is acceptable, otherwise with "
+        "'VERDICT: REJECTED' and what to change.",
+    ),
+]
+VERDICT = re.compile(r"VERDICT\W*(CONFIRMED|REJECTED)", re.IGNORECASE)
+
+
+@dataclass
+class Candidate:
+    """One branch of a best-of-N exploration, see ElasticaSynthesizeTeam."""
+
+    index: int
+    plan_result: PlanResult
+    score: float = float("-inf")
+    complete: bool = False
+
 
 class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
     """
@@ -64,8 +114,15 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
         llm_factory: Callable[[Agent], AugmentedLLM[MessageParamT, MessageT]],
         planner: AugmentedLLM | None = None,
         available_llms: List[AugmentedLLM] | None = None,
-        plan_type: Literal["full", "iterative"] = "full",
+        plan_type: Literal["full", "iterative", "pipeline"] = "full",
         context: Optional["Context"] = None,
+        n_candidates: int = 1,
+        max_concurrency: int | None = None,
+        scorer: Callable[[int, PlanResult], float | Awaitable[float]] | None = None,
+        prune_after: int = 2,
+        history_budget: int | None = 4000,
+        scheduler: LLMScheduler | None = None,
+        call_timeout: float | None = None,
         **kwargs,
     ):
         """
@@ -73,8 +130,25 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
             llm_factory: Factory function to create an LLM for a given agent
             planner: LLM to use for planning steps (if not provided, a default planner will be used)
             plan_type: "full" planning generates the full plan first, then executes. "iterative" plans the next step, and loops until success.
+                "pipeline" runs the PIPELINE stages in a fixed loop and only asks the planner
+                when a stage fails or the evaluator's verdict is unclear.
             available_llms: List of agents available to tasks executed by this orchestrator
             context: Application context
+            n_candidates: Number of design candidates explored concurrently from the
+                same objective (best-of-N); 1 runs a single trajectory
+            max_concurrency: Cap on LLM calls in flight across all candidates
+            scorer: (candidate index, plan result) -> score, higher is better; used
+                to pick the winner and prune the losers. A plain function runs in
+                a worker thread so it does not block the event loop
+            prune_after: Iterations every candidate gets before the lower-scoring
+                half is pruned after each iteration
+            history_budget: Approximate token budget of the plan history pasted
+                into planner and task prompts; older steps are summarized to fit
+                (None keeps the full history, see PlanHistory)
+            scheduler: Runs every planner and agent call, planner calls first;
+                defaults to the process-wide scheduler shared by all teams
+            call_timeout: Deadline of a planner or agent call in seconds; a task
+                that times out is recorded as failed (defaults to the scheduler's)
         """
         super().__init__(context=context, **kwargs)
 
@@ -91,11 +165,21 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
             )
         )
 
-        self.plan_type: Literal["full", "iterative"] = plan_type
+        self.plan_type: Literal["full", "iterative", "pipeline"] = plan_type
         self.server_registry = self.context.server_registry
         self.agents = {llm.aggregator.name: llm for llm in available_llms or []}
 
-        breakpoint()
+        self.n_candidates = n_candidates
+        self.scorer = scorer
+        self.prune_after = prune_after
+        self.history_budget = history_budget
+        self._histories: dict[int, PlanHistory] = {}
+        self.scheduler = scheduler or get_llm_scheduler()
+        self.call_timeout = call_timeout
+        self._llm_slots = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+
         self.default_request_params = self.default_request_params or RequestParams(
             # History tracking is not yet supported for orchestrator workflows
             use_history=False,
@@ -173,61 +257,227 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
             ),
         )
 
+        self._histories.clear()
+        if self.n_candidates > 1:
+            return await self._execute_candidates(objective=objective, params=params)
+
         plan_result = PlanResult(objective=objective, step_results=[])
 
         while iterations < params.max_iterations:
-            if self.plan_type == "iterative":
-                # Get next plan/step
-                next_step = await self._get_next_step(
-                    objective=objective, plan_result=plan_result, model=params.model
-                )
-                logger.debug(f"Iteration {iterations}: Iterative plan:", data=next_step)
-                plan = Plan(steps=[next_step], is_complete=next_step.is_complete)
-            elif self.plan_type == "full":
-                plan = await self._get_full_plan(
-                    objective=objective, plan_result=plan_result, request_params=params
-                )
-                logger.debug(f"Iteration {iterations}: Full Plan:", data=plan)
-            else:
-                raise ValueError(f"Invalid plan type {self.plan_type}")
+            if await self._iterate(plan_result, iterations, params):
+                return plan_result
+            iterations += 1
 
-            plan_result.plan = plan
+        raise RuntimeError(
+            f"Task failed to complete in {params.max_iterations} iterations"
+        )
 
-            if plan.is_complete:
-                plan_result.is_complete = True
+    async def _iterate(
+        self, plan_result: PlanResult, iterations: int, params: RequestParams
+    ) -> bool:
+        """Plan and execute one iteration; True once the objective is complete"""
+        objective = plan_result.objective
+        pipeline_step = None
+        if self.plan_type == "pipeline":
+            pipeline_step = self._next_pipeline_step(plan_result)
+
+        if pipeline_step is not None:
+            logger.debug(f"Iteration {iterations}: Pipeline step:", data=pipeline_step)
+            plan = Plan(steps=[pipeline_step], is_complete=pipeline_step.is_complete)
+        elif self.plan_type in ("iterative", "pipeline"):
+            # Get next plan/step (the pipeline falls back to the planner)
+            next_step = await self._get_next_step(
+                objective=objective, plan_result=plan_result, model=params.model
+            )
+            logger.debug(f"Iteration {iterations}: Iterative plan:", data=next_step)
+            plan = Plan(steps=[next_step], is_complete=next_step.is_complete)
+        elif self.plan_type == "full":
+            plan = await self._get_full_plan(
+                objective=objective, plan_result=plan_result, request_params=params
+            )
+            logger.debug(f"Iteration {iterations}: Full Plan:", data=plan)
+        else:
+            raise ValueError(f"Invalid plan type {self.plan_type}")
 
-                # Synthesize final result into a single message
-                synthesis_prompt = SYNTHESIZE_PLAN_PROMPT_TEMPLATE.format(
-                    plan_result=format_plan_result(plan_result)
-                )
+        plan_result.plan = plan
+
+        if plan.is_complete and pipeline_step is not None:
+            # Confirmed by the evaluator, whose answer is the result
+            plan_result.is_complete = True
+            plan_result.result = format_step_result(plan_result.step_results[-1])
+            return True
+
+        if plan.is_complete:
+            plan_result.is_complete = True
+
+            # Synthesize final result into a single message
+            synthesis_prompt = SYNTHESIZE_PLAN_PROMPT_TEMPLATE.format(
+                plan_result=self._history(plan_result)
+            )
 
-                plan_result.result = await self.planner.generate_str(
+            plan_result.result = await self._limited(
+                self.planner.generate_str(
                     message=synthesis_prompt,
                     request_params=params.model_copy(update={"max_iterations": 1}),
-                )
+                ),
+                PLANNER,
+                "synthesize",
+            )
 
-                return plan_result
+            return True
 
-            # Execute each step, collecting results
-            # Note that in iterative mode this will only be a single step
-            for step in plan.steps:
-                step_result = await self._execute_step(
-                    step=step,
-                    previous_result=plan_result,
-                    request_params=params,
-                )
+        # Execute each step, collecting results
+        # Note that in iterative mode this will only be a single step
+        for step in plan.steps:
+            step_result = await self._execute_step(
+                step=step,
+                previous_result=plan_result,
+                request_params=params,
+            )
 
-                plan_result.add_step_result(step_result)
+            plan_result.add_step_result(step_result)
 
+        logger.debug(
+            f"Iteration {iterations}: Intermediate plan result:", data=plan_result
+        )
+        return False
+
+    def _next_pipeline_step(self, plan_result: PlanResult) -> NextStep | None:
+        """
+        Next stage of the PIPELINE loop after the last executed step, or None
+        when the planner has to decide: a pipeline agent is missing, the last
+        step failed or ran outside the pipeline, or the evaluator gave no verdict.
+        """
+        agents = [agent for agent, _ in PIPELINE]
+        if any(agent not in self.agents for agent in agents):
+            return None
+
+        if not plan_result.step_results:
+            stage = 0
+        else:
+            tasks = plan_result.step_results[-1].task_results
+            if not tasks or any(getattr(task, "failed", False) for task in tasks):
+                return None
+            last = tasks[-1]
+            if last.agent not in agents:
+                return None
+            stage = agents.index(last.agent) + 1
+            if stage == len(PIPELINE):
+                verdicts = VERDICT.findall(last.result)
+                if not verdicts:
+                    return None
+                if verdicts[-1].upper() == "CONFIRMED":
+                    return NextStep(
+                        description="Design confirmed", tasks=[], is_complete=True
+                    )
+                stage = 0
+
+        agent, task = PIPELINE[stage]
+        return NextStep(
+            description=f"Pipeline stage {stage + 1}: {agent}",
+            tasks=[AgentTask(description=task, agent=agent)],
+            is_complete=False,
+        )
+
+    async def _execute_candidates(
+        self, objective: str, params: RequestParams
+    ) -> PlanResult:
+        """
+        Best-of-N: advance every live candidate by one iteration concurrently,
+        score them, and after prune_after iterations keep the better half. The
+        best scoring candidate among those that complete wins.
+        """
+        alive = [
+            Candidate(
+                index=index,
+                plan_result=PlanResult(
+                    objective=objective
+                    + CANDIDATE_NOTE.format(index=index, count=self.n_candidates),
+                    step_results=[],
+                ),
+            )
+            for index in range(1, self.n_candidates + 1)
+        ]
+
+        for iterations in range(params.max_iterations):
+            outcomes = await asyncio.gather(
+                *(
+                    self._iterate(candidate.plan_result, iterations, params)
+                    for candidate in alive
+                ),
+                return_exceptions=True,
+            )
+            survivors = []
+            for candidate, outcome in zip(alive, outcomes):
+                if isinstance(outcome, BaseException):
+                    logger.warning(f"Candidate {candidate.index} failed: {outcome!r}")
+                    continue
+                candidate.complete = outcome
+                survivors.append(candidate)
+            if not survivors:
+                raise outcomes[0]
+            scores = await asyncio.gather(*map(self._score, survivors))
+            for candidate, score in zip(survivors, scores):
+                candidate.score = score
+            alive = sorted(survivors, key=lambda c: c.score, reverse=True)
             logger.debug(
-                f"Iteration {iterations}: Intermediate plan result:", data=plan_result
+                f"Iteration {iterations}: Candidate scores:",
+                data={c.index: c.score for c in alive},
             )
-            iterations += 1
+
+            finished = [candidate for candidate in alive if candidate.complete]
+            if finished:
+                best = finished[0]
+                logger.info(f"Candidate {best.index} accepted (score {best.score})")
+                return best.plan_result
+            if iterations + 1 >= self.prune_after and len(alive) > 1:
+                alive = alive[: (len(alive) + 1) // 2]
 
         raise RuntimeError(
             f"Task failed to complete in {params.max_iterations} iterations"
         )
 
+    async def _score(self, candidate: Candidate) -> float:
+        if self.scorer is None:
+            return 0.0
+        if inspect.iscoroutinefunction(self.scorer):
+            score = await self.scorer(candidate.index, candidate.plan_result)
+        else:
+            # Scoring a design is CPU-bound (see design_score); keep the loop free
+            score = await asyncio.to_thread(
+                self.scorer, candidate.index, candidate.plan_result
+            )
+            if inspect.isawaitable(score):
+                score = await score
+        return float(score)
+
+    def _history(self, plan_result: PlanResult) -> str:
+        """Rendered plan history of plan_result for prompts, see PlanHistory"""
+        history = self._histories.get(id(plan_result))
+        if history is None or history.plan_result is not plan_result:
+            history = PlanHistory(plan_result, token_budget=self.history_budget)
+            self._histories[id(plan_result)] = history
+        return history.render()
+
+    async def _limited(
+        self,
+        coroutine: Coroutine[Any, Any, Any],
+        priority: int = WORKER,
+        name: str = "call",
+    ) -> Any:
+        """
+        Await coroutine once a slot under max_concurrency and a scheduler slot
+        are free, cancelling it after call_timeout; traced as a planner or
+        agent span called name
+        """
+        kind = "planner" if priority == PLANNER else "agent"
+        with span(kind, name):
+            call = self.scheduler.run(coroutine, priority, self.call_timeout)
+            if self._llm_slots is None:
+                return await call
+            async with self._llm_slots:
+                return await call
+
     async def _execute_step(
         self,
         step: Step,
@@ -239,7 +489,7 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
         step_result = StepResult(step=step, task_results=[])
 
         # Format previous results
-        context = format_plan_result(previous_result)
+        context = self._history(previous_result)
 
         # Execute subtasks in parallel
         futures: List[Coroutine[Any, Any, str]] = []
@@ -267,9 +517,13 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
                 )
 
                 futures.append(
-                    llm.generate_str(
-                        message=task_description,
-                        request_params=params,
+                    self._limited(
+                        llm.generate_str(
+                            message=task_description,
+                            request_params=params,
+                        ),
+                        WORKER,
+                        task.agent,
                     )
                 )
 
@@ -279,7 +533,11 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
         # Store task results
         for task, result in zip(step.tasks, results):
             step_result.add_task_result(
-                TaskWithResult(**task.model_dump(), result=str(result))
+                TaskWithResult(
+                    **task.model_dump(),
+                    result=str(result),
+                    failed=isinstance(result, BaseException),
+                )
             )
 
         # Synthesize overall step result
@@ -326,14 +584,18 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
 
         prompt = FULL_PLAN_PROMPT_TEMPLATE.format(
             objective=objective,
-            plan_result=format_plan_result(plan_result),
+            plan_result=self._history(plan_result),
             agents=agents,
         )
 
-        plan = await self.planner.generate_structured(
-            message=prompt,
-            response_model=Plan,
-            request_params=params,
+        plan = await self._limited(
+            self.planner.generate_structured(
+                message=prompt,
+                response_model=Plan,
+                request_params=params,
+            ),
+            PLANNER,
+            "full_plan",
         )
 
         return plan
@@ -352,13 +614,17 @@ class ElasticaSynthesizeTeam(AugmentedLLM[MessageParamT, MessageT]):
 
         prompt = ITERATIVE_PLAN_PROMPT_TEMPLATE.format(
             objective=objective,
-            plan_result=format_plan_result(plan_result),
+            plan_result=self._history(plan_result),
             agents=agents,
         )
 
-        next_step = await self.planner.generate_structured(
-            message=prompt,
-            response_model=NextStep,
+        next_step = await self._limited(
+            self.planner.generate_structured(
+                message=prompt,
+                response_model=NextStep,
+            ),
+            PLANNER,
+            "next_step",
         )
         return next_step
 
@@ -0,0 +1,309 @@
+"""
+Packed array representation of RobotDesignSchema.
+
+Every float of the rods lives in one contiguous (N, 16) float64 buffer; start
+points, end points, radii and directors are views into it. Ragged fields
+(modes, actuation parameters, connections, actuation groups) are stored as
+flat value arrays with CSR-style offsets, and actuator references are integer
+indices into ``ids``.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from elastica_agents.design_schema import (
+    ActuatorMode,
+    BendingParameter,
+    RobotDesignSchema,
+)
+
+# Column layout of PackedDesign.rods
+START = slice(0, 3)
+END = slice(3, 6)
+RADIUS = 6
+DIRECTORS = slice(7, 16)
+ROD_COLUMNS = 16
+
+MODES = tuple(ActuatorMode)
+
+# Values of PackedDesign.parameter_kinds
+BENDING = 0
+TWISTING_CW = 1
+TWISTING_CCW = 2
+
+
+def _offsets(lengths) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _segments(offsets: np.ndarray, values) -> list:
+    bounds = offsets.tolist()
+    return [values[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+@dataclass
+class PackedDesign:
+    """
+    Struct-of-arrays form of a RobotDesignSchema.
+
+    Attributes:
+        ids: Actuator ids, followed by any id that connections or actuation
+            groups reference but no actuator defines
+        rods: (N, 16) per-actuator start point, end point, radius and the
+            directors d1, d2, d3
+        mode_offsets: (N + 1,) offsets of each actuator's modes in ``modes``
+        modes: Index of each mode in ``MODES``
+        parameter_offsets: (N + 1,) offsets of each actuator's parameters
+        parameter_kinds: BENDING, TWISTING_CW or TWISTING_CCW per parameter
+        parameter_directions: (P, 3) bending direction (zero for twisting)
+        parameter_magnitudes: (P,) maximum bending or twisting magnitude
+        connection_offsets: (C + 1,) offsets into ``connection_actuators``
+        connection_actuators: Index into ``ids`` of each connected actuator
+        link_offsets: (C + 1,) offsets into ``link_locations``
+        link_locations: (L, 3) rigid link locations of all connections
+        connection_directors: (C, 3, 3) orientation of each connection
+        group_names: Name of each actuation group
+        group_offsets: (G + 1,) offsets into ``group_actuators``
+        group_actuators: Index into ``ids`` of each (actuator, parameter) pair
+        group_parameters: Parameter index of each (actuator, parameter) pair
+    """
+
+    ids: list[str]
+    rods: np.ndarray
+    mode_offsets: np.ndarray
+    modes: np.ndarray
+    parameter_offsets: np.ndarray
+    parameter_kinds: np.ndarray
+    parameter_directions: np.ndarray
+    parameter_magnitudes: np.ndarray
+    connection_offsets: np.ndarray
+    connection_actuators: np.ndarray
+    link_offsets: np.ndarray
+    link_locations: np.ndarray
+    connection_directors: np.ndarray
+    group_names: list[str]
+    group_offsets: np.ndarray
+    group_actuators: np.ndarray
+    group_parameters: np.ndarray
+
+    @property
+    def n_actuators(self) -> int:
+        return len(self.rods)
+
+    @property
+    def actuator_ids(self) -> list[str]:
+        return self.ids[: self.n_actuators]
+
+    @property
+    def start_points(self) -> np.ndarray:
+        return self.rods[:, START]
+
+    @property
+    def end_points(self) -> np.ndarray:
+        return self.rods[:, END]
+
+    @property
+    def radii(self) -> np.ndarray:
+        return self.rods[:, RADIUS]
+
+    @property
+    def directors(self) -> np.ndarray:
+        """(N, 3, 3) view with rows d1, d2, d3 (the layout of RotationMatrix.Q())."""
+        return self.rods[:, DIRECTORS].reshape(-1, 3, 3)
+
+    @classmethod
+    def from_design(cls, design: RobotDesignSchema) -> "PackedDesign":
+        actuators = design.actuators
+        ids = [actuator.id for actuator in actuators]
+        index = {}
+        for i, actuator_id in enumerate(ids):
+            index.setdefault(actuator_id, i)
+
+        def lookup(actuator_id: str) -> int:
+            if actuator_id not in index:
+                index[actuator_id] = len(ids)
+                ids.append(actuator_id)
+            return index[actuator_id]
+
+        rods = np.array(
+            [
+                (
+                    actuator.start_point.x,
+                    actuator.start_point.y,
+                    actuator.start_point.z,
+                    actuator.end_point.x,
+                    actuator.end_point.y,
+                    actuator.end_point.z,
+                    actuator.radius,
+                    *actuator.orientation.d1,
+                    *actuator.orientation.d2,
+                    *actuator.orientation.d3,
+                )
+                for actuator in actuators
+            ],
+            dtype=np.float64,
+        ).reshape(-1, ROD_COLUMNS)
+
+        mode_codes = {mode: code for code, mode in enumerate(MODES)}
+        modes = [mode_codes[mode] for actuator in actuators for mode in actuator.mode]
+
+        parameters = [
+            parameter
+            for actuator in actuators
+            for parameter in actuator.actuation_parameter
+        ]
+        kinds, directions, magnitudes = [], [], []
+        for parameter in parameters:
+            if isinstance(parameter, BendingParameter):
+                kinds.append(BENDING)
+                directions.append(parameter.bending_direction)
+                magnitudes.append(parameter.max_bending_magnitude)
+            else:
+                kinds.append(
+                    TWISTING_CW
+                    if parameter.twisting_direction == "CW"
+                    else TWISTING_CCW
+                )
+                directions.append((0.0, 0.0, 0.0))
+                magnitudes.append(parameter.max_twisting_magnitude)
+
+        connections = design.connections
+        groups = design.actuation_groups
+        pairs = [pair for group in groups for pair in group.actuators_actuation]
+
+        return cls(
+            ids=ids,
+            rods=rods,
+            mode_offsets=_offsets([len(actuator.mode) for actuator in actuators]),
+            modes=np.array(modes, dtype=np.int8),
+            parameter_offsets=_offsets(
+                [len(actuator.actuation_parameter) for actuator in actuators]
+            ),
+            parameter_kinds=np.array(kinds, dtype=np.int8),
+            parameter_directions=np.array(directions, dtype=np.float64).reshape(-1, 3),
+            parameter_magnitudes=np.array(magnitudes, dtype=np.float64),
+            connection_offsets=_offsets(
+                [len(connection.actuators) for connection in connections]
+            ),
+            connection_actuators=np.array(
+                [
+                    lookup(actuator_id)
+                    for connection in connections
+                    for actuator_id in connection.actuators
+                ],
+                dtype=np.int64,
+            ),
+            link_offsets=_offsets(
+                [len(connection.rigid_link_locations) for connection in connections]
+            ),
+            link_locations=np.array(
+                [
+                    (point.x, point.y, point.z)
+                    for connection in connections
+                    for point in connection.rigid_link_locations
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 3),
+            connection_directors=np.array(
+                [
+                    (
+                        connection.orientation.d1,
+                        connection.orientation.d2,
+                        connection.orientation.d3,
+                    )
+                    for connection in connections
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 3, 3),
+            group_names=[group.name for group in groups],
+            group_offsets=_offsets(
+                [len(group.actuators_actuation) for group in groups]
+            ),
+            group_actuators=np.array(
+                [lookup(actuator_id) for actuator_id, _ in pairs], dtype=np.int64
+            ),
+            group_parameters=np.array(
+                [parameter for _, parameter in pairs], dtype=np.int64
+            ),
+        )
+
+    def to_design(self) -> RobotDesignSchema:
+        """Rebuild the pydantic model; exact inverse of from_design."""
+        ids = self.ids
+
+        parameters = []
+        for kind, direction, magnitude in zip(
+            self.parameter_kinds.tolist(),
+            self.parameter_directions.tolist(),
+            self.parameter_magnitudes.tolist(),
+        ):
+            if kind == BENDING:
+                parameters.append(
+                    {"bending_direction": direction, "max_bending_magnitude": magnitude}
+                )
+            else:
+                parameters.append(
+                    {
+                        "twisting_direction": "CW" if kind == TWISTING_CW else "CCW",
+                        "max_twisting_magnitude": magnitude,
+                    }
+                )
+
+        actuators = [
+            {
+                "id": actuator_id,
+                "mode": [MODES[code] for code in modes],
+                "actuation_parameter": actuation_parameter,
+                "start_point": dict(zip("xyz", row[START])),
+                "end_point": dict(zip("xyz", row[END])),
+                "radius": row[RADIUS],
+                "orientation": {
+                    "d1": row[7:10],
+                    "d2": row[10:13],
+                    "d3": row[13:16],
+                },
+            }
+            for actuator_id, row, modes, actuation_parameter in zip(
+                self.actuator_ids,
+                self.rods.tolist(),
+                _segments(self.mode_offsets, self.modes.tolist()),
+                _segments(self.parameter_offsets, parameters),
+            )
+        ]
+
+        connections = [
+            {
+                "actuators": [ids[i] for i in members],
+                "rigid_link_locations": [dict(zip("xyz", point)) for point in links],
+                "orientation": dict(zip(("d1", "d2", "d3"), directors)),
+            }
+            for members, links, directors in zip(
+                _segments(self.connection_offsets, self.connection_actuators.tolist()),
+                _segments(self.link_offsets, self.link_locations.tolist()),
+                self.connection_directors.tolist(),
+            )
+        ]
+
+        pairs = [
+            (ids[i], parameter)
+            for i, parameter in zip(
+                self.group_actuators.tolist(), self.group_parameters.tolist()
+            )
+        ]
+        actuation_groups = [
+            {"name": name, "actuators_actuation": members}
+            for name, members in zip(
+                self.group_names, _segments(self.group_offsets, pairs)
+            )
+        ]
+
+        return RobotDesignSchema.model_validate(
+            {
+                "actuators": actuators,
+                "connections": connections,
+                "actuation_groups": actuation_groups,
+            }
+        )
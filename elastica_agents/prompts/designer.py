@@ -47,5 +47,14 @@ You can use up to 10 actuators.
 For each actuation, specify start and end points in 3D, radius of actuator, and the orientation.
 Slender rod typically has a small radius compare to its length.
 
+After writing design.json, call check_design_file on it. It returns a list of issues
+(e.g. d3 not along the rod, non-orthonormal orientation, unknown actuator ids, invalid mode
+indices in actuation groups). Fix every issue with severity "error" before handing the design off.
+A "repeated_design" warning means an earlier attempt written to the same file was the same design;
+change it rather than resubmitting. Checking an unchanged file again does not raise it.
+To check that an actuation group moves the robot the way the prompt asks, call preview_actuation
+with the design file and one activation per group; it returns the predicted tip displacement of
+every actuator.
+
 Do not iterate or call tools too much.
 """
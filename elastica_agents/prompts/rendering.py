@@ -1,5 +1,7 @@
 rendering_instructions = """
 Your job is to read design.json file and render the design.
 You can use your tool: render_design to render the design.
+Prefer render_design_views, which tiles front, side, top and isometric views into one image,
+so the evaluator can judge depth without asking for another render.
 Output the image in the working directory with the name: {workdir}/design.png
 """
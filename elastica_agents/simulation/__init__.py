@@ -0,0 +1,43 @@
+from elastica_agents.simulation.builder import (
+    DesignSimulation,
+    SimulationSettings,
+    SimulationSetup,
+    SimulationState,
+    build_simulation,
+    get_setup,
+)
+from elastica_agents.simulation.checkpoint import (
+    SettledStateCache,
+    settle,
+    settled_state,
+)
+from elastica_agents.simulation.kinematics import KinematicPreview, preview_kinematics
+from elastica_agents.simulation.workspace import WorkspaceEstimate, estimate_workspace
+from elastica_agents.simulation.batch import SweepResult, actuation_grid, simulate_sweep
+from elastica_agents.simulation.trajectory import (
+    Trajectory,
+    TrajectoryWriter,
+    trajectory_callbacks,
+)
+
+__all__ = [
+    "DesignSimulation",
+    "SimulationSettings",
+    "SimulationSetup",
+    "SimulationState",
+    "build_simulation",
+    "get_setup",
+    "SettledStateCache",
+    "settle",
+    "settled_state",
+    "KinematicPreview",
+    "preview_kinematics",
+    "WorkspaceEstimate",
+    "estimate_workspace",
+    "SweepResult",
+    "actuation_grid",
+    "simulate_sweep",
+    "Trajectory",
+    "TrajectoryWriter",
+    "trajectory_callbacks",
+]
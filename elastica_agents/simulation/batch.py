@@ -0,0 +1,204 @@
+"""
+Actuation sweeps of one design across a process pool.
+
+Each worker parses the design and builds its SimulationSetup once, then runs
+one simulation per job. Final rod centerlines are written straight into a
+shared-memory block allocated by the parent, so only job indices and timings
+cross process boundaries.
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.builder import (
+    SimulationSettings,
+    SimulationState,
+    build_simulation,
+    get_setup,
+)
+from elastica_agents.simulation.checkpoint import settled_state
+
+
+@dataclass
+class SweepResult:
+    """
+    Outcome of a sweep of J actuation inputs over a design with N rods.
+
+    Attributes:
+        actuations: (J, C) activation of each channel per job
+        positions: (J, N, n_elements + 1, 3) final node positions per job
+            (NaN for failed jobs)
+        timings: (J,) wall time of each job in seconds
+        errors: Job index -> error message of failed jobs
+        wall_time: Wall time of the whole sweep in seconds
+    """
+
+    actuations: np.ndarray
+    positions: np.ndarray
+    timings: np.ndarray
+    errors: dict[int, str]
+    wall_time: float
+
+    @property
+    def tip_positions(self) -> np.ndarray:
+        """(J, N, 3) final position of the end of every rod."""
+        return self.positions[:, :, -1]
+
+    def summary(self) -> str:
+        done = len(self.timings) - len(self.errors)
+        return (
+            f"{done}/{len(self.timings)} simulations in {self.wall_time:.2f}s "
+            f"(mean {np.nanmean(self.timings) if len(self.timings) else 0.0:.2f}s "
+            f"per job, {len(self.errors)} failed)"
+        )
+
+
+def actuation_grid(levels, n_channels: int) -> np.ndarray:
+    """Every combination of levels over n_channels, one per row."""
+    return np.array(
+        list(itertools.product(levels, repeat=n_channels)), dtype=np.float64
+    ).reshape(-1, n_channels)
+
+
+# Per-process state of a sweep worker
+_worker: dict = {}
+
+
+def _init_worker(
+    design_json: str,
+    settings: SimulationSettings,
+    duration: float,
+    actuations: np.ndarray,
+    shm_name: str,
+    shape: tuple,
+    state: SimulationState | None = None,
+) -> None:
+    design = RobotDesignSchema.model_validate_json(design_json)
+    get_setup(design)
+    _worker.update(
+        design=design,
+        settings=settings,
+        duration=duration,
+        actuations=actuations,
+        shm_name=shm_name,
+        shape=shape,
+        state=state,
+    )
+
+
+def _write_positions(index: int, rods) -> None:
+    """Copy the centerlines of rods into row index of the shared block."""
+    # Attached per job: pool workers exit without running cleanup handlers,
+    # so a handle kept for the worker's lifetime would never be closed
+    shm = shared_memory.SharedMemory(name=_worker["shm_name"])
+    positions = None
+    try:
+        positions = np.ndarray(_worker["shape"], dtype=np.float64, buffer=shm.buf)
+        for rod, state in enumerate(rods):
+            positions[index, rod] = state.position_collection.T
+    finally:
+        # The view must be released before the mapping can be closed
+        positions = None
+        shm.close()
+
+
+def _run_job(index: int) -> tuple[int, float, str | None]:
+    start = time.perf_counter()
+    try:
+        simulation = build_simulation(
+            _worker["design"],
+            actuation=_worker["actuations"][index],
+            settings=_worker["settings"],
+            state=_worker["state"],
+        )
+        simulation.run(_worker["duration"])
+        _write_positions(index, simulation.rods)
+    except Exception as e:
+        return index, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return index, time.perf_counter() - start, None
+
+
+def simulate_sweep(
+    design: RobotDesignSchema,
+    actuations,
+    duration: float = 1.0,
+    settings: SimulationSettings | None = None,
+    max_workers: int | None = None,
+    on_result=None,
+    warm_start: bool = False,
+) -> SweepResult:
+    """
+    Simulate design once per row of actuations, in parallel.
+
+    Args:
+        design: Robot design
+        actuations: (J, C) activations, one row per simulation
+            (see SimulationSetup.channels and actuation_grid)
+        duration: Simulated time of each job
+        settings: Material and solver parameters
+        max_workers: Number of worker processes (defaults to the CPU count)
+        on_result: Optional callback(index, seconds, error) called as jobs finish
+        warm_start: Start every job from the design's settled state (relaxed
+            once, see checkpoint.settled_state) instead of from straight rods;
+            duration then counts from the settled time
+
+    Returns:
+        SweepResult
+    """
+    settings = settings or SimulationSettings()
+    setup = get_setup(design)
+    actuations = np.asarray(actuations, dtype=np.float64).reshape(
+        -1, len(setup.channels)
+    )
+    n_jobs = len(actuations)
+    shape = (n_jobs, setup.n_rods, settings.n_elements + 1, 3)
+    max_workers = min(max_workers or os.cpu_count() or 1, max(n_jobs, 1))
+
+    start = time.perf_counter()
+    state = settled_state(design, settings) if warm_start else None
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    try:
+        positions = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        positions.fill(np.nan)
+        timings = np.full(n_jobs, np.nan)
+        errors = {}
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(
+                design.model_dump_json(),
+                settings,
+                duration,
+                actuations,
+                shm.name,
+                shape,
+                state,
+            ),
+        ) as executor:
+            futures = [executor.submit(_run_job, index) for index in range(n_jobs)]
+            for future in as_completed(futures):
+                index, seconds, error = future.result()
+                timings[index] = seconds
+                if error is not None:
+                    errors[index] = error
+                if on_result is not None:
+                    on_result(index, seconds, error)
+        result = positions.copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return SweepResult(
+        actuations=actuations,
+        positions=result,
+        timings=timings,
+        errors=errors,
+        wall_time=time.perf_counter() - start,
+    )
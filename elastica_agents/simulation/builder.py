@@ -0,0 +1,534 @@
+"""
+Build a PyElastica simulation from a RobotDesignSchema.
+
+Each actuator becomes a straight Cosserat rod, each Connection becomes fixed
+joints between the nearest ends of its rods, and the start of the first
+actuator of every connected component is clamped. Actuation is modelled the way pneumatic actuators behave: an
+activation level per channel (an ActuationGroup, or every actuator mode when
+the design has no groups) changes the rest curvature of the rods it drives,
+ramped in over ``ramp_time``.
+
+Everything that only depends on the design (rod discretization, director
+frames, joint topology, per-channel curvatures) is a SimulationSetup, cached
+per design hash so repeated simulations only pay for creating the rods.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import elastica as ea
+import numpy as np
+
+from elastica_agents.design_hash import design_hash
+from elastica_agents.design_index import design_index
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.packed_design import BENDING, TWISTING_CW, PackedDesign
+from elastica_agents.tool.geometry import frames_along
+
+SETUP_CACHE_SIZE = 64
+STATE_ARRAYS = (
+    "curvature_from",
+    "curvature",
+    "position",
+    "velocity",
+    "director",
+    "omega",
+    "rest_kappa",
+)
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    """Material, discretization and solver parameters shared by all rods."""
+
+    n_elements: int = 20
+    density: float = 1000.0
+    youngs_modulus: float = 1e6
+    poisson_ratio: float = 0.5
+    damping_constant: float = 0.1
+    time_step: float = 1e-4
+    gravity: tuple[float, float, float] = (0.0, 0.0, -9.81)
+    joint_stiffness: float = 1e5
+    joint_damping: float = 0.0
+    joint_rotational_stiffness: float = 5e3
+    ramp_time: float = 0.1
+    fix_base: bool = True
+
+
+@dataclass
+class SimulationSetup:
+    """
+    Design-dependent, state-free part of a simulation.
+
+    Attributes:
+        ids: Actuator id of each rod
+        starts, directions, normals: (N, 3) rod start, unit tangent and d1
+        lengths, radii: (N,) rod length and radius
+        joints: (rod_one, index_one, rod_two, index_two) of each fixed joint;
+            index 0 is the start of a rod and -1 its end
+        bases: (rod, index) of each clamped rod end
+        channels: Name of each actuation channel
+        channel_curvature: (C, N, 3) rest curvature (material frame) added to
+            each rod per unit activation of each channel
+    """
+
+    ids: list[str]
+    starts: np.ndarray
+    directions: np.ndarray
+    normals: np.ndarray
+    lengths: np.ndarray
+    radii: np.ndarray
+    joints: list[tuple[int, int, int, int]]
+    bases: list[tuple[int, int]]
+    channels: list[str]
+    channel_curvature: np.ndarray
+
+    @property
+    def n_rods(self) -> int:
+        return len(self.ids)
+
+    def curvature(self, actuation) -> np.ndarray:
+        """(N, 3) rest curvature of each rod for channel activations actuation."""
+        actuation = np.asarray(actuation, dtype=np.float64).reshape(-1)
+        if len(actuation) != len(self.channels):
+            raise ValueError(
+                f"Expected {len(self.channels)} activations "
+                f"({', '.join(self.channels)}), got {len(actuation)}"
+            )
+        return np.einsum("c,cnk->nk", actuation, self.channel_curvature)
+
+
+def _rod_frames(packed: PackedDesign) -> tuple[np.ndarray, np.ndarray]:
+    """Unit tangents and a d1 perpendicular to them, as close to the design's d1 as possible."""
+    tangents = packed.end_points - packed.start_points
+    fallback = frames_along(tangents)
+    directions = fallback[:, 2]
+    d1 = packed.directors[:, 0]
+    normals = d1 - np.einsum("ij,ij->i", d1, directions)[:, None] * directions
+    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    usable = norms[:, 0] > 1e-8
+    normals[usable] /= norms[usable]
+    normals[~usable] = fallback[~usable, 0]
+    return directions, normals
+
+
+def _nearest_ends(packed: PackedDesign, rows: list[int]) -> list[int]:
+    """For each rod of a connection, the end (0 or -1) closest to another member."""
+    ends = np.stack([packed.start_points[rows], packed.end_points[rows]], axis=1)
+    distance = [
+        np.linalg.norm(
+            ends[k][:, None] - np.delete(ends, k, axis=0).reshape(1, -1, 3), axis=2
+        ).min(axis=1)
+        for k in range(len(rows))
+    ]
+    return [0 if d[0] <= d[1] else -1 for d in distance]
+
+
+def _channel_curvature(
+    packed: PackedDesign, directions: np.ndarray, normals: np.ndarray, channels
+) -> np.ndarray:
+    binormals = np.cross(directions, normals)
+    curvature = np.zeros((len(channels), packed.n_actuators, 3))
+    for c, pairs in enumerate(channels):
+        for row, mode in pairs:
+            lo, hi = packed.parameter_offsets[row], packed.parameter_offsets[row + 1]
+            if not 0 <= mode < hi - lo:
+                continue
+            kind = packed.parameter_kinds[lo + mode]
+            magnitude = packed.parameter_magnitudes[lo + mode]
+            if kind == BENDING:
+                # Bending towards b needs curvature t x b (dt/ds = kappa x t)
+                bend = packed.parameter_directions[lo + mode]
+                bend = bend - np.dot(bend, directions[row]) * directions[row]
+                norm = np.linalg.norm(bend)
+                if norm == 0.0:
+                    continue
+                kappa = magnitude * np.cross(directions[row], bend / norm)
+                curvature[c, row, 0] += np.dot(kappa, normals[row])
+                curvature[c, row, 1] += np.dot(kappa, binormals[row])
+            else:
+                sign = -1.0 if kind == TWISTING_CW else 1.0
+                curvature[c, row, 2] += sign * magnitude
+    return curvature
+
+
+def build_setup(design: RobotDesignSchema) -> SimulationSetup:
+    packed = PackedDesign.from_design(design)
+    index = design_index(design)
+    directions, normals = _rod_frames(packed)
+
+    joints = []
+    for connection in range(len(design.connections)):
+        rows = [row for row in index.actuators_of(connection).tolist() if row >= 0]
+        rows = list(dict.fromkeys(rows))
+        if len(rows) < 2:
+            continue
+        ends = _nearest_ends(packed, rows)
+        joints += [(rows[0], ends[0], row, end) for row, end in zip(rows[1:], ends[1:])]
+
+    # Clamp the start of the first actuator of every connected component
+    bases = [(root, 0) for root in index.roots.tolist()]
+
+    if design.actuation_groups:
+        channels = [group.name for group in design.actuation_groups]
+        pairs = [
+            [(row, mode) for row, mode in index.groups[name] if row >= 0]
+            for name in channels
+        ]
+    else:
+        channels, pairs = [], []
+        for row, actuator in enumerate(design.actuators):
+            for mode in range(len(actuator.mode)):
+                channels.append(f"{actuator.id}:{mode}")
+                pairs.append([(row, mode)])
+
+    return SimulationSetup(
+        ids=list(packed.actuator_ids),
+        starts=packed.start_points.copy(),
+        directions=directions,
+        normals=normals,
+        lengths=np.linalg.norm(packed.end_points - packed.start_points, axis=1),
+        radii=packed.radii.copy(),
+        joints=joints,
+        bases=bases,
+        channels=channels,
+        channel_curvature=_channel_curvature(packed, directions, normals, pairs),
+    )
+
+
+_setup_cache: OrderedDict = OrderedDict()
+
+
+def setup_key(design: RobotDesignSchema) -> tuple:
+    """
+    Cache key of a design's setup. The canonical hash ignores naming and
+    order, which the setup depends on, so ids and group names are included.
+    """
+    return (
+        design_hash(design),
+        tuple(actuator.id for actuator in design.actuators),
+        tuple(group.name for group in design.actuation_groups),
+    )
+
+
+def get_setup(design: RobotDesignSchema) -> SimulationSetup:
+    """SimulationSetup of design, from the per-process LRU cache when possible."""
+    key = setup_key(design)
+    if key in _setup_cache:
+        _setup_cache.move_to_end(key)
+        return _setup_cache[key]
+    setup = build_setup(design)
+    _setup_cache[key] = setup
+    if len(_setup_cache) > SETUP_CACHE_SIZE:
+        _setup_cache.popitem(last=False)
+    return setup
+
+
+class RestCurvatureActuation(ea.NoForces):
+    """Ramp a rod's extra rest curvature from one value to another."""
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        target: np.ndarray,
+        ramp_start: np.ndarray,
+        ramp_time: float,
+        rest_kappa: np.ndarray,
+    ):
+        """
+        Args:
+            start, target: (3,) views of the rod's extra rest curvature at the
+                beginning and end of the ramp; updated in place by
+                DesignSimulation.set_actuation
+            ramp_start: (1,) view of the time the ramp begins
+            ramp_time: Time over which the curvature changes
+            rest_kappa: (3, n_elements - 1) rest curvature of the unactuated rod
+        """
+        super().__init__()
+        self.start = start
+        self.target = target
+        self.ramp_start = ramp_start
+        self.ramp_time = ramp_time
+        self.rest_kappa = rest_kappa
+
+    def apply_torques(self, system, time: np.float64 = np.float64(0.0)) -> None:
+        elapsed = time - self.ramp_start[0]
+        factor = 1.0
+        if self.ramp_time > 0.0:
+            factor = min(max(elapsed / self.ramp_time, 0.0), 1.0)
+        extra = self.start + factor * (self.target - self.start)
+        system.rest_kappa[:] = self.rest_kappa + extra[:, None]
+
+
+class ElasticaSimulator(
+    ea.BaseSystemCollection,
+    ea.Constraints,
+    ea.Connections,
+    ea.Forcing,
+    ea.Damping,
+    ea.CallBacks,
+):
+    pass
+
+
+@dataclass
+class SimulationState:
+    """
+    Complete dynamic state of a DesignSimulation at one time.
+
+    Rod kinematics and rest curvature are all that carries over between steps;
+    joints, boundary conditions and dampers hold no state of their own, so
+    restoring this into a fresh simulation of the same design continues the
+    run exactly.
+
+    Attributes:
+        ids: Actuator id of each rod, checked on restore
+        time: Simulation time
+        actuation: Channel activations, or None if never actuated
+        curvature_from, curvature: (N, 3) extra rest curvature at the start
+            and end of the current ramp, which began at ramp_start
+        position, velocity: (N, n_elements + 1, 3)
+        director: (N, n_elements, 3, 3)
+        omega: (N, n_elements, 3)
+        rest_kappa: (N, n_elements - 1, 3) rest curvature the next step's
+            internal forces use (forcing updates it only after them)
+    """
+
+    ids: list[str]
+    time: float
+    actuation: np.ndarray | None
+    curvature_from: np.ndarray
+    curvature: np.ndarray
+    ramp_start: float
+    position: np.ndarray
+    velocity: np.ndarray
+    director: np.ndarray
+    omega: np.ndarray
+    rest_kappa: np.ndarray
+
+    def save(self, path) -> None:
+        """Write to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            ids=np.array(self.ids, dtype=np.str_),
+            time=self.time,
+            ramp_start=self.ramp_start,
+            actuation=np.zeros(0) if self.actuation is None else self.actuation,
+            actuated=self.actuation is not None,
+            **{name: getattr(self, name) for name in STATE_ARRAYS},
+        )
+
+    @classmethod
+    def load(cls, path) -> "SimulationState":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                ids=data["ids"].tolist(),
+                time=float(data["time"]),
+                actuation=data["actuation"] if bool(data["actuated"]) else None,
+                ramp_start=float(data["ramp_start"]),
+                **{name: data[name] for name in STATE_ARRAYS},
+            )
+
+
+@dataclass
+class DesignSimulation:
+    """
+    A finalized, ready-to-step PyElastica simulation of a design.
+
+    Example:
+        simulation = build_simulation(design, actuation=[0.5, 0.0])
+        simulation.run(1.0)
+        tips = simulation.tip_positions()
+    """
+
+    setup: SimulationSetup
+    settings: SimulationSettings = field(default_factory=SimulationSettings)
+    actuation: np.ndarray | None = None
+    callbacks: list = field(default_factory=list)
+    time: float = 0.0
+
+    def __post_init__(self):
+        settings = self.settings
+        setup = self.setup
+        # Extra rest curvature of every rod ramps from curvature_from (at
+        # ramp_start) to curvature, see set_actuation
+        self.curvature = np.zeros((setup.n_rods, 3))
+        self.curvature_from = np.zeros((setup.n_rods, 3))
+        self.ramp_start = np.zeros(1)
+        self.simulator = ElasticaSimulator()
+        self.stepper = ea.PositionVerlet()
+
+        shear_modulus = settings.youngs_modulus / (2.0 * (1.0 + settings.poisson_ratio))
+        self.rods = []
+        for i in range(setup.n_rods):
+            rod = ea.CosseratRod.straight_rod(
+                settings.n_elements,
+                setup.starts[i],
+                setup.directions[i],
+                setup.normals[i],
+                max(setup.lengths[i], 1e-6),
+                setup.radii[i],
+                settings.density,
+                youngs_modulus=settings.youngs_modulus,
+                shear_modulus=shear_modulus,
+            )
+            self.simulator.append(rod)
+            self.rods.append(rod)
+
+        for rod_one, index_one, rod_two, index_two in setup.joints:
+            first, second = self.rods[rod_one], self.rods[rod_two]
+            rest_rotation = (
+                first.director_collection[..., index_one]
+                @ second.director_collection[..., index_two].T
+            )
+            self.simulator.connect(
+                first, second, first_connect_idx=index_one, second_connect_idx=index_two
+            ).using(
+                ea.FixedJoint,
+                k=settings.joint_stiffness,
+                nu=settings.joint_damping,
+                kt=settings.joint_rotational_stiffness,
+                rest_rotation_matrix=rest_rotation,
+            )
+
+        if settings.fix_base:
+            for rod, index in setup.bases:
+                self.simulator.constrain(self.rods[rod]).using(
+                    ea.OneEndFixedBC,
+                    constrained_position_idx=(index,),
+                    constrained_director_idx=(index,),
+                )
+
+        for i, rod in enumerate(self.rods):
+            self.simulator.add_forcing_to(rod).using(
+                ea.GravityForces, acc_gravity=np.array(settings.gravity)
+            )
+            self.simulator.add_forcing_to(rod).using(
+                RestCurvatureActuation,
+                start=self.curvature_from[i],
+                target=self.curvature[i],
+                ramp_start=self.ramp_start,
+                ramp_time=settings.ramp_time,
+                rest_kappa=rod.rest_kappa.copy(),
+            )
+            self.simulator.dampen(rod).using(
+                ea.AnalyticalLinearDamper,
+                damping_constant=settings.damping_constant,
+                time_step=settings.time_step,
+            )
+
+        for rod, callback, kwargs in self.callbacks:
+            self.simulator.collect_diagnostics(self.rods[rod]).using(callback, **kwargs)
+
+        self.simulator.finalize()
+        if self.actuation is not None:
+            self.set_actuation(self.actuation)
+
+    def set_actuation(self, actuation) -> None:
+        """Set channel activations; the rods follow within ramp_time of the current time."""
+        self.curvature_from[:] = self.current_curvature()
+        self.ramp_start[0] = self.time
+        self.actuation = np.asarray(actuation, dtype=np.float64)
+        self.curvature[:] = self.setup.curvature(self.actuation)
+
+    def current_curvature(self) -> np.ndarray:
+        """(N, 3) extra rest curvature of every rod at the current time."""
+        ramp_time = self.settings.ramp_time
+        elapsed = self.time - self.ramp_start[0]
+        factor = min(max(elapsed / ramp_time, 0.0), 1.0) if ramp_time > 0.0 else 1.0
+        return self.curvature_from + factor * (self.curvature - self.curvature_from)
+
+    def snapshot(self) -> SimulationState:
+        """Copy of the current state, see restore."""
+        return SimulationState(
+            ids=list(self.setup.ids),
+            time=self.time,
+            actuation=None if self.actuation is None else self.actuation.copy(),
+            curvature_from=self.curvature_from.copy(),
+            curvature=self.curvature.copy(),
+            ramp_start=float(self.ramp_start[0]),
+            position=np.array([rod.position_collection.T for rod in self.rods]),
+            velocity=np.array([rod.velocity_collection.T for rod in self.rods]),
+            director=np.array(
+                [np.moveaxis(rod.director_collection, -1, 0) for rod in self.rods]
+            ),
+            omega=np.array([rod.omega_collection.T for rod in self.rods]),
+            rest_kappa=np.array([rod.rest_kappa.T for rod in self.rods]),
+        )
+
+    def restore(self, state: SimulationState) -> None:
+        """Continue from state, e.g. a snapshot of another simulation of the design."""
+        if list(state.ids) != list(self.setup.ids) or state.position.shape != (
+            self.setup.n_rods,
+            self.settings.n_elements + 1,
+            3,
+        ):
+            raise ValueError(
+                "State does not match this simulation "
+                f"(rods {state.ids}, position shape {state.position.shape})"
+            )
+        for i, rod in enumerate(self.rods):
+            rod.position_collection[:] = state.position[i].T
+            rod.velocity_collection[:] = state.velocity[i].T
+            rod.director_collection[:] = np.moveaxis(state.director[i], 0, -1)
+            rod.omega_collection[:] = state.omega[i].T
+            rod.rest_kappa[:] = state.rest_kappa[i].T
+        self.time = state.time
+        self.actuation = None if state.actuation is None else state.actuation.copy()
+        self.curvature_from[:] = state.curvature_from
+        self.curvature[:] = state.curvature
+        self.ramp_start[0] = state.ramp_start
+
+    def step(self, n_steps: int = 1) -> float:
+        dt = np.float64(self.settings.time_step)
+        time = np.float64(self.time)
+        for _ in range(n_steps):
+            time = self.stepper.step(self.simulator, time, dt)
+        self.time = float(time)
+        return self.time
+
+    def run(self, duration: float) -> float:
+        """Advance by duration (rounded to whole time steps)."""
+        return self.step(max(int(round(duration / self.settings.time_step)), 0))
+
+    def tip_positions(self) -> np.ndarray:
+        """(N, 3) current position of the end node of every rod."""
+        return np.array([rod.position_collection[:, -1] for rod in self.rods]).reshape(
+            -1, 3
+        )
+
+
+def build_simulation(
+    design: RobotDesignSchema,
+    actuation=None,
+    settings: SimulationSettings | None = None,
+    callbacks: list | None = None,
+    state: SimulationState | None = None,
+) -> DesignSimulation:
+    """
+    Ready-to-step simulation of design.
+
+    Args:
+        design: Robot design
+        actuation: Activation of each channel (see SimulationSetup.channels);
+            None leaves the robot unactuated
+        settings: Material and solver parameters
+        callbacks: (rod index, CallBackBaseClass subclass, kwargs) to attach
+        state: Start from this state (e.g. a settled one, see
+            elastica_agents.simulation.checkpoint) instead of the straight
+            rods at time 0; actuation then ramps in from the state's curvature
+
+    Returns:
+        DesignSimulation
+    """
+    simulation = DesignSimulation(
+        get_setup(design),
+        settings=settings or SimulationSettings(),
+        actuation=None if state is not None else actuation,
+        callbacks=callbacks or [],
+    )
+    if state is not None:
+        simulation.restore(state)
+        if actuation is not None:
+            simulation.set_actuation(actuation)
+    return simulation
@@ -0,0 +1,167 @@
+"""
+Settled states for warm-starting simulations.
+
+A design first sags under gravity until it comes to rest; only then do
+actuation results mean anything. settle runs that relaxation once and returns
+the final SimulationState, and SettledStateCache keeps these states per design
+and settings (in memory, and optionally as .npz files), so sweeps and repeated
+evaluations start every run from rest instead of relaxing again.
+
+Example:
+    state = settled_state(design)
+    simulation = build_simulation(design, actuation=[1.0, 0.0], state=state)
+    simulation.run(0.5)
+"""
+
+import hashlib
+import inspect
+import json
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.builder import (
+    SimulationSettings,
+    SimulationState,
+    build_simulation,
+    setup_key,
+)
+
+SETTLED_CACHE_SIZE = 64
+
+
+def settle(
+    design: RobotDesignSchema,
+    settings: SimulationSettings | None = None,
+    max_duration: float = 2.0,
+    check_interval: float = 0.01,
+    tolerance: float = 1e-3,
+) -> tuple[SimulationState, bool]:
+    """
+    Run the unactuated design until every node is (nearly) at rest.
+
+    Args:
+        design: Robot design
+        settings: Material and solver parameters
+        max_duration: Give up relaxing after this much simulated time
+        check_interval: Simulated time between rest checks
+        tolerance: Largest node speed (m/s) counted as rest
+
+    Returns:
+        (final state, whether it came to rest before max_duration)
+    """
+    simulation = build_simulation(design, settings=settings)
+    while simulation.time < max_duration:
+        simulation.run(check_interval)
+        speed = max(
+            np.linalg.norm(rod.velocity_collection, axis=0).max()
+            for rod in simulation.rods
+        )
+        if not np.isfinite(speed):
+            raise FloatingPointError("Simulation diverged while settling")
+        if speed < tolerance:
+            return simulation.snapshot(), True
+    return simulation.snapshot(), False
+
+
+def settled_key(
+    design: RobotDesignSchema,
+    settings: SimulationSettings | None = None,
+    **settle_kwargs,
+) -> str:
+    """
+    Cache key of the settled state of design under settings and settle_kwargs.
+
+    Omitted settle arguments count as their defaults, so spelling out a default
+    gives the same key.
+    """
+    settings = settings or SimulationSettings()
+    arguments = inspect.signature(settle).bind(design, settings, **settle_kwargs)
+    arguments.apply_defaults()
+    relaxation = {
+        name: float(value)
+        for name, value in arguments.arguments.items()
+        if name not in ("design", "settings")
+    }
+    payload = json.dumps([setup_key(design), asdict(settings), relaxation])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SettledStateCache:
+    """
+    LRU cache of settled states, optionally backed by a directory of .npz files.
+
+    Keys combine the canonical design hash, rod ids and group names with the
+    settings and settle arguments (see settled_key).
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, max_entries: int = SETTLED_CACHE_SIZE
+    ):
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.states: OrderedDict[str, SimulationState] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> SimulationState | None:
+        if key in self.states:
+            self.states.move_to_end(key)
+            return self.states[key]
+        if self.directory is not None and self._path(key).exists():
+            state = SimulationState.load(self._path(key))
+            self._remember(key, state)
+            return state
+        return None
+
+    def put(self, key: str, state: SimulationState) -> None:
+        self._remember(key, state)
+        if self.directory is not None:
+            state.save(self._path(key))
+
+    def _remember(self, key: str, state: SimulationState) -> None:
+        self.states[key] = state
+        self.states.move_to_end(key)
+        if len(self.states) > self.max_entries:
+            self.states.popitem(last=False)
+
+
+_settled_cache = SettledStateCache()
+
+
+def settled_state(
+    design: RobotDesignSchema,
+    settings: SimulationSettings | None = None,
+    cache: SettledStateCache | None = None,
+    **settle_kwargs,
+) -> SimulationState:
+    """
+    Settled state of design, relaxed once and then served from cache.
+
+    A design that does not come to rest within settle's max_duration gets its
+    final state returned but not cached, so a later call relaxes it again
+    rather than being served a state that never settled.
+
+    Args:
+        design: Robot design
+        settings: Material and solver parameters
+        cache: Where states are kept (defaults to a per-process, in-memory cache)
+        settle_kwargs: Passed to settle on a cache miss
+    """
+    cache = _settled_cache if cache is None else cache
+    key = settled_key(design, settings, **settle_kwargs)
+    state = cache.get(key)
+    if state is None:
+        state, at_rest = settle(design, settings, **settle_kwargs)
+        if at_rest:
+            cache.put(key, state)
+    return state
@@ -0,0 +1,214 @@
+"""
+Piecewise constant-curvature forward kinematics.
+
+A reduced-order preview of what an actuation does, without the physics: every
+rod bends and twists with the constant curvature its channels prescribe
+(SimulationSetup.channel_curvature, built from the Bending/TwistingParameters),
+and the rods are chained rigidly through the joints built from the design's
+Connections, starting from the clamped bases. Gravity, contact and the
+elasticity of joints are ignored.
+
+Each rod has a closed form: with the curvature vector w (lab frame, constant
+along the rod since the frame rotates about w itself) and theta = s |w|,
+
+    R(s) = I + sin(theta) / |w| [w] + (1 - cos(theta)) / |w|^2 [w]^2
+    x(s) = x0 + s t + (1 - cos(theta)) / |w|^2 w x t
+              + (s - sin(theta) / |w|) / |w|^2 w x (w x t)
+
+so a whole batch of actuation samples is evaluated with array operations,
+looping only over the rods of the design.
+
+Example:
+    preview = preview_kinematics(design, actuation_grid([0.0, 0.5, 1.0], 2))
+    preview.tip_positions  # (9, N, 3)
+"""
+
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.builder import SimulationSetup, get_setup
+
+# Below this bending angle the series expansions of the coefficients are used
+SMALL_ANGLE = 1e-4
+
+
+@dataclass
+class KinematicPreview:
+    """
+    Constant-curvature poses of N rods for M actuation samples.
+
+    Attributes:
+        actuations: (M, C) channel activations of each sample
+        centerlines: (M, N, K, 3) points along every rod, start to end
+        tip_directors: (M, N, 3, 3) frame at the end of every rod, rows d1, d2, d3
+        rest_centerlines: (N, K, 3) the same points without actuation
+    """
+
+    actuations: np.ndarray
+    centerlines: np.ndarray
+    tip_directors: np.ndarray
+    rest_centerlines: np.ndarray
+
+    @property
+    def tip_positions(self) -> np.ndarray:
+        """(M, N, 3) end point of every rod."""
+        return self.centerlines[:, :, -1]
+
+    @property
+    def tip_displacements(self) -> np.ndarray:
+        """(M, N, 3) movement of every rod end away from its rest position."""
+        return self.tip_positions - self.rest_centerlines[None, :, -1]
+
+
+def _coefficients(norm: np.ndarray, s: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    sin(theta)/|w|, (1 - cos(theta))/|w|^2 and (s - sin(theta)/|w|)/|w|^2 for
+    every curvature magnitude (M,) and arc length (K,), shape (M, K).
+    """
+    w = norm[:, None]
+    theta = w * s[None, :]
+    small = theta < SMALL_ANGLE
+    safe = np.where(small, 1.0, w)
+    w2 = w * w
+    sin_term = np.where(small, s - s**3 * w2 / 6.0, np.sin(theta) / safe)
+    cos_term = np.where(
+        small, s**2 / 2.0 - s**4 * w2 / 24.0, (1.0 - np.cos(theta)) / safe**2
+    )
+    arc_term = np.where(
+        small, s**3 / 6.0 - s**5 * w2 / 120.0, (s - np.sin(theta) / safe) / safe**2
+    )
+    return sin_term, cos_term, arc_term
+
+
+def _rotation(omega: np.ndarray, sin_term: np.ndarray, cos_term: np.ndarray):
+    """(M, 3, 3) rotation about omega (M, 3) from the Rodrigues coefficients (M,)."""
+    skew = np.zeros((len(omega), 3, 3))
+    skew[:, 0, 1], skew[:, 0, 2] = -omega[:, 2], omega[:, 1]
+    skew[:, 1, 0], skew[:, 1, 2] = omega[:, 2], -omega[:, 0]
+    skew[:, 2, 0], skew[:, 2, 1] = -omega[:, 1], omega[:, 0]
+    return (
+        np.eye(3)
+        + sin_term[:, None, None] * skew
+        + cos_term[:, None, None] * skew @ skew
+    )
+
+
+def _kinematic_tree(setup: SimulationSetup) -> list[tuple[int, int, int, int]]:
+    """
+    (rod, anchor index, parent rod, parent index) in breadth-first order from
+    the clamped bases; roots have parent -1. Rods not reached from a base are
+    roots anchored at their start.
+    """
+    adjacent = [[] for _ in range(setup.n_rods)]
+    for rod_one, index_one, rod_two, index_two in setup.joints:
+        adjacent[rod_one].append((rod_two, index_two, index_one))
+        adjacent[rod_two].append((rod_one, index_one, index_two))
+
+    seen = np.zeros(setup.n_rods, dtype=bool)
+    roots = [(rod, index) for rod, index in setup.bases]
+    roots += [(rod, 0) for rod in range(setup.n_rods)]
+    tree = []
+    for root, anchor in roots:
+        if seen[root]:
+            continue
+        seen[root] = True
+        queue = deque([(root, anchor, -1, 0)])
+        while queue:
+            rod, anchor, parent, parent_index = queue.popleft()
+            tree.append((rod, anchor, parent, parent_index))
+            for child, child_index, index in adjacent[rod]:
+                if not seen[child]:
+                    seen[child] = True
+                    queue.append((child, child_index, rod, index))
+    return tree
+
+
+def _preview(
+    setup: SimulationSetup, actuations: np.ndarray, n_points: int
+) -> tuple[np.ndarray, np.ndarray]:
+    n_samples = len(actuations)
+    curvature = np.einsum("mc,cnk->mnk", actuations, setup.channel_curvature)
+    binormals = np.cross(setup.directions, setup.normals)
+    rest_frames = np.stack([setup.normals, binormals, setup.directions], axis=1)
+
+    centerlines = np.zeros((n_samples, setup.n_rods, n_points, 3))
+    tip_directors = np.zeros((n_samples, setup.n_rods, 3, 3))
+    # Rotation from rest and world position of both ends of every placed rod
+    end_rotations = np.zeros((setup.n_rods, 2, n_samples, 3, 3))
+    end_positions = np.zeros((setup.n_rods, 2, n_samples, 3))
+
+    for rod, anchor, parent, parent_index in _kinematic_tree(setup):
+        start, tangent = setup.starts[rod], setup.directions[rod]
+        length = setup.lengths[rod]
+        omega = curvature[:, rod] @ rest_frames[rod]  # material -> lab frame
+        s = np.linspace(0.0, length, n_points)
+        sin_term, cos_term, arc_term = _coefficients(np.linalg.norm(omega, axis=1), s)
+
+        # Rod clamped at its start in its rest pose
+        bend = np.cross(omega, tangent)
+        points = (
+            start
+            + s[None, :, None] * tangent
+            + cos_term[..., None] * bend[:, None]
+            + arc_term[..., None] * np.cross(omega, bend)[:, None]
+        )
+        tip_rotation = _rotation(omega, sin_term[:, -1], cos_term[:, -1])
+        rotations = [np.broadcast_to(np.eye(3), tip_rotation.shape), tip_rotation]
+
+        if anchor != 0:
+            # Held at its end instead: move the end back to its rest pose
+            undo = np.swapaxes(tip_rotation, 1, 2)
+            points = np.einsum("mij,mkj->mki", undo, points - points[:, -1:])
+            points += start + length * tangent
+            rotations = [undo, np.broadcast_to(np.eye(3), undo.shape)]
+
+        if parent >= 0:
+            # Follow the rigid motion of the parent's end it is attached to
+            side = 0 if parent_index == 0 else 1
+            parent_rotation = end_rotations[parent, side]
+            rest_point = setup.starts[parent] + side * (
+                setup.lengths[parent] * setup.directions[parent]
+            )
+            points = (
+                np.einsum("mij,mkj->mki", parent_rotation, points - rest_point)
+                + end_positions[parent, side][:, None]
+            )
+            rotations = [parent_rotation @ rotation for rotation in rotations]
+
+        centerlines[:, rod] = points
+        end_positions[rod] = points[:, 0], points[:, -1]
+        end_rotations[rod] = rotations
+        tip_directors[:, rod] = np.einsum("jk,mik->mji", rest_frames[rod], rotations[1])
+    return centerlines, tip_directors
+
+
+def preview_kinematics(
+    design: RobotDesignSchema, actuations, n_points: int = 11
+) -> KinematicPreview:
+    """
+    Constant-curvature poses of design for a batch of actuations.
+
+    Args:
+        design: Robot design
+        actuations: (M, C) or (C,) channel activations
+            (see SimulationSetup.channels and actuation_grid)
+        n_points: Points sampled along each rod
+
+    Returns:
+        KinematicPreview
+    """
+    setup = get_setup(design)
+    actuations = np.asarray(actuations, dtype=np.float64).reshape(
+        -1, len(setup.channels)
+    )
+    centerlines, tip_directors = _preview(setup, actuations, n_points)
+    rest, _ = _preview(setup, np.zeros((1, len(setup.channels))), n_points)
+    return KinematicPreview(
+        actuations=actuations,
+        centerlines=centerlines,
+        tip_directors=tip_directors,
+        rest_centerlines=rest[0],
+    )
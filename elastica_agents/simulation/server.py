@@ -0,0 +1,454 @@
+"""
+Asynchronous simulation server shared by many agent sessions.
+
+Requests enter a bounded asyncio queue that feeds a fixed number of worker
+tasks, each running one simulation at a time in a process pool. When the
+queue is full new work is refused (HTTP 503 with ``Retry-After``) instead of
+piling up. Requests for the same design (by canonical hash, ids and group
+names, see setup_key), actuation and duration share one job: a request that
+arrives while an identical job is queued, running or recently finished gets
+that job back instead of a new computation.
+
+Endpoints:
+    POST /simulations                 submit, 202 with the job status
+    GET  /simulations/{id}            job status
+    GET  /simulations/{id}/result     result (``?wait=`` seconds to long-poll)
+    GET  /health                      queue depth and worker count
+
+The same service is exposed as MCP tools over SSE (``/sse``) so agents can
+call it directly.
+
+Example:
+    elastica-mcp-server --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel, Field, ValidationError
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.builder import (
+    SimulationSettings,
+    build_simulation,
+    get_setup,
+    setup_key,
+)
+from elastica_agents.tool.bulk_validation import format_validation_error
+
+QUEUE_SIZE = 64
+MAX_FINISHED_JOBS = 1024
+MAX_DURATION = 60.0
+RETRY_AFTER = 5
+
+
+class SimulationRequest(BaseModel):
+    design: RobotDesignSchema = Field(description="Robot design to simulate")
+    actuation: list[float] | None = Field(
+        default=None,
+        description="Activation of each channel (actuation group, or actuator "
+        "mode when the design has no groups); omitted means unactuated",
+    )
+    duration: float = Field(
+        default=1.0, gt=0.0, le=MAX_DURATION, description="Simulated time in seconds"
+    )
+
+
+@dataclass
+class SimulationJob:
+    """
+    One (possibly shared) simulation.
+
+    Attributes:
+        id: Job id returned to clients
+        key: Coalescing key, see job_key
+        status: "queued", "running", "done" or "failed"
+        requests: Number of requests served by this job
+        result: Final state once done (see _simulate)
+    """
+
+    id: str
+    key: str
+    design_json: str
+    actuation: list[float] | None
+    duration: float
+    status: str = "queued"
+    requests: int = 1
+    submitted: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+    result: dict | None = None
+    error: str | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def status_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "requests": self.requests,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def job_key(
+    design: RobotDesignSchema, actuation: list[float] | None, duration: float
+) -> str:
+    """Coalescing key of a request; equal keys give equal simulation results."""
+    payload = json.dumps(
+        [
+            setup_key(design),
+            None if actuation is None else [float(a) for a in actuation],
+            float(duration),
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _simulate(
+    design_json: str,
+    actuation: list[float] | None,
+    duration: float,
+    settings: SimulationSettings,
+) -> dict:
+    """Run one simulation (in a worker process) and return its final state."""
+    start = time.perf_counter()
+    design = RobotDesignSchema.model_validate_json(design_json)
+    setup = get_setup(design)
+    if actuation is not None and len(actuation) != len(setup.channels):
+        raise ValueError(
+            f"Expected {len(setup.channels)} activations "
+            f"(channels {setup.channels}), got {len(actuation)}"
+        )
+    simulation = build_simulation(design, actuation=actuation, settings=settings)
+    simulation.run(duration)
+    positions = np.array([rod.position_collection.T for rod in simulation.rods])
+    if not np.isfinite(positions).all():
+        raise FloatingPointError("Simulation diverged")
+    return {
+        "ids": list(setup.ids),
+        "channels": list(setup.channels),
+        "time": simulation.time,
+        "tip_positions": positions[:, -1].tolist(),
+        "positions": positions.tolist(),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class SimulationService:
+    """
+    Bounded job queue, worker tasks and coalescing index.
+
+    Must be started (and stopped) inside the event loop that serves requests;
+    create_app does this in the FastAPI lifespan.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        queue_size: int = QUEUE_SIZE,
+        settings: SimulationSettings | None = None,
+        executor: Executor | None = None,
+        max_finished_jobs: int = MAX_FINISHED_JOBS,
+    ):
+        """
+        Args:
+            max_workers: Simulations run at once (defaults to the CPU count)
+            queue_size: Jobs waiting for a worker before requests are refused
+            settings: Material and solver parameters of every simulation
+            executor: Pool the simulations run in (defaults to a process pool
+                of max_workers)
+            max_finished_jobs: Finished jobs kept for status, results and
+                coalescing; the oldest are forgotten first
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.settings = settings or SimulationSettings()
+        self.executor = executor
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: OrderedDict[str, SimulationJob] = OrderedDict()
+        self.by_key: dict[str, SimulationJob] = {}
+        self.queue: asyncio.Queue | None = None
+        self.workers: list[asyncio.Task] = []
+        self.running = 0
+        self._owns_executor = executor is None
+
+    async def start(self) -> None:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_workers)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def submit(
+        self,
+        design: RobotDesignSchema,
+        actuation: list[float] | None = None,
+        duration: float = 1.0,
+    ) -> tuple[SimulationJob, bool]:
+        """
+        Queue a simulation, or attach to an identical job.
+
+        Returns:
+            (job, coalesced), coalesced being True for an existing job
+
+        Raises:
+            QueueFullError: The queue is full; retry later
+        """
+        key = job_key(design, actuation, duration)
+        job = self.by_key.get(key)
+        if job is not None and job.status != "failed":
+            job.requests += 1
+            if job.id in self.jobs:
+                self.jobs.move_to_end(job.id)
+            return job, True
+
+        job = SimulationJob(
+            id=uuid.uuid4().hex,
+            key=key,
+            design_json=design.model_dump_json(),
+            actuation=actuation,
+            duration=duration,
+        )
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Simulation queue is full ({self.queue_size} jobs waiting)"
+            ) from None
+        self.jobs[job.id] = job
+        self.by_key[key] = job
+        self._forget_finished()
+        return job, False
+
+    def get(self, job_id: str) -> SimulationJob | None:
+        return self.jobs.get(job_id)
+
+    async def wait(self, job: SimulationJob, timeout: float | None = None) -> bool:
+        """Wait until job finishes; False if timeout passed first."""
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "queue_size": self.queue_size,
+            "jobs": len(self.jobs),
+        }
+
+    def _forget_finished(self) -> None:
+        excess = len(self.jobs) - self.max_finished_jobs
+        for job_id in list(self.jobs):
+            if excess <= 0:
+                break
+            job = self.jobs[job_id]
+            if job.finished is None:
+                continue
+            del self.jobs[job_id]
+            if self.by_key.get(job.key) is job:
+                del self.by_key[job.key]
+            excess -= 1
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            job.started = time.time()
+            self.running += 1
+            try:
+                job.result = await loop.run_in_executor(
+                    self.executor,
+                    _simulate,
+                    job.design_json,
+                    job.actuation,
+                    job.duration,
+                    self.settings,
+                )
+                job.status = "done"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+            finally:
+                self.running -= 1
+                job.finished = time.time()
+                job.done.set()
+                self.queue.task_done()
+
+
+def create_mcp(service: SimulationService):
+    """MCP tools on top of service."""
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("elastica-simulation")
+
+    @mcp.tool()
+    async def simulate_design(
+        design_file: str,
+        actuation: list[float] | None = None,
+        duration: float = 1.0,
+        timeout: float = 300.0,
+    ) -> str:
+        """
+        Simulate a design.json with PyElastica and return the final rod positions.
+
+        Args:
+            design_file: Path to the design JSON file
+            actuation: Activation of each actuation group (or actuator mode
+                when the design has no groups); omit for the unactuated robot
+            duration: Simulated time in seconds
+            timeout: Seconds to wait before returning the job id instead
+
+        Returns:
+            JSON with the job status and, once done, the tip position of every rod
+        """
+        # The same bounds as POST /simulations
+        try:
+            with open(design_file, "rb") as f:
+                request = SimulationRequest(
+                    design=RobotDesignSchema.model_validate_json(f.read()),
+                    actuation=actuation,
+                    duration=duration,
+                )
+        except ValidationError as e:
+            return json.dumps(
+                {"status": "rejected", "error": format_validation_error(e)}
+            )
+        except OSError as e:
+            return json.dumps({"status": "error", "error": f"{type(e).__name__}: {e}"})
+        try:
+            job, _ = service.submit(request.design, request.actuation, request.duration)
+        except QueueFullError as e:
+            return json.dumps({"status": "rejected", "error": str(e)})
+        await service.wait(job, timeout)
+        return json.dumps(_job_summary(job))
+
+    @mcp.tool()
+    async def simulation_status(job_id: str, timeout: float = 0.0) -> str:
+        """
+        Status (and, once done, the rod tip positions) of a simulation job.
+
+        Args:
+            job_id: Id returned by simulate_design
+            timeout: Seconds to wait for the job to finish
+        """
+        job = service.get(job_id)
+        if job is None:
+            return json.dumps({"status": "unknown", "job_id": job_id})
+        if timeout > 0.0:
+            await service.wait(job, timeout)
+        return json.dumps(_job_summary(job))
+
+    return mcp
+
+
+def _job_summary(job: SimulationJob) -> dict:
+    summary = job.status_dict()
+    if job.status == "done":
+        summary.update(
+            ids=job.result["ids"],
+            time=job.result["time"],
+            tip_positions=job.result["tip_positions"],
+        )
+    return summary
+
+
+def create_app(service: SimulationService | None = None, mcp: bool = True) -> FastAPI:
+    """
+    FastAPI application serving service (a default one when None).
+
+    Args:
+        service: Simulation service, started and stopped with the application
+        mcp: Also serve the MCP tools over SSE at /sse
+    """
+    service = service or SimulationService()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await service.start()
+        try:
+            yield
+        finally:
+            await service.stop()
+
+    app = FastAPI(title="Elastica simulation server", lifespan=lifespan)
+    app.state.service = service
+
+    def find(job_id: str) -> SimulationJob:
+        job = service.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+        return job
+
+    @app.post("/simulations", status_code=202)
+    async def submit(request: SimulationRequest) -> dict:
+        try:
+            job, coalesced = service.submit(
+                request.design, request.actuation, request.duration
+            )
+        except QueueFullError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(RETRY_AFTER)},
+            )
+        return {**job.status_dict(), "coalesced": coalesced}
+
+    @app.get("/simulations/{job_id}")
+    async def status(job_id: str) -> dict:
+        return find(job_id).status_dict()
+
+    @app.get("/simulations/{job_id}/result")
+    async def result(job_id: str, response: Response, wait: float = 0.0) -> dict:
+        job = find(job_id)
+        if wait > 0.0:
+            await service.wait(job, min(wait, MAX_DURATION * 10))
+        if job.status == "failed":
+            raise HTTPException(status_code=500, detail=job.error)
+        if job.status != "done":
+            response.status_code = 202
+            response.headers["Retry-After"] = "1"
+            return job.status_dict()
+        return {**job.status_dict(), **job.result}
+
+    @app.get("/health")
+    async def health() -> dict:
+        return service.stats()
+
+    if mcp:
+        # Mounted at the root so the SSE transport's message endpoint resolves
+        app.mount("/", create_mcp(service).sse_app())
+    return app
@@ -0,0 +1,228 @@
+"""
+Append-only, memory-mapped trajectory files.
+
+A trajectory is a directory holding ``header.json`` and one raw little-endian
+float64 file per field. Every saved step appends one fixed-size record to each
+field file, so the number of steps follows from the file size and a run that
+stops early is still readable. Readers map the files with ``np.memmap`` and
+only touch the time window or rods they slice.
+
+    time.f64       (T,)
+    position.f64   (T, n_rods, n_elements + 1, 3)
+    director.f64   (T, n_rods, n_elements, 3, 3)
+
+Example:
+    with TrajectoryWriter("run/", setup.n_rods, settings.n_elements) as writer:
+        simulation = build_simulation(
+            design, actuation, settings, callbacks=trajectory_callbacks(writer)
+        )
+        simulation.run(2.0)
+"""
+
+import json
+from pathlib import Path
+
+import elastica as ea
+import numpy as np
+
+FORMAT_VERSION = 1
+DTYPE = np.dtype("<f8")
+
+
+def field_shapes(n_rods: int, n_elements: int) -> dict[str, tuple]:
+    """Shape of one saved step of each field."""
+    return {
+        "time": (),
+        "position": (n_rods, n_elements + 1, 3),
+        "director": (n_rods, n_elements, 3, 3),
+    }
+
+
+class TrajectoryWriter:
+    """
+    Buffer saved steps in memory and append them to disk in chunks.
+
+    Rods report their state one at a time (see TrajectoryCallback); a step is
+    committed once every rod has reported it.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        n_rods: int,
+        n_elements: int,
+        chunk_steps: int = 64,
+        metadata: dict | None = None,
+    ):
+        """
+        Args:
+            path: Directory of the trajectory (created, must not hold one already)
+            n_rods: Number of rods
+            n_elements: Elements per rod
+            chunk_steps: Steps buffered before they are written
+            metadata: Extra entries for the header, e.g. ids or time step
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        if (self.path / "header.json").exists():
+            raise FileExistsError(f"{self.path} already holds a trajectory")
+
+        self.n_rods = n_rods
+        self.shapes = field_shapes(n_rods, n_elements)
+        self.chunk_steps = chunk_steps
+        self.buffers = {
+            name: np.zeros((chunk_steps, *shape), dtype=DTYPE)
+            for name, shape in self.shapes.items()
+        }
+        self.buffered = 0
+        self.reported = np.zeros(n_rods, dtype=bool)
+        self.files = {
+            name: open(self.path / f"{name}.f64", "ab") for name in self.shapes
+        }
+
+        header = {
+            "version": FORMAT_VERSION,
+            "dtype": DTYPE.str,
+            "n_rods": n_rods,
+            "n_elements": n_elements,
+            "fields": {name: list(shape) for name, shape in self.shapes.items()},
+            **(metadata or {}),
+        }
+        with open(self.path / "header.json", "w") as f:
+            json.dump(header, f)
+
+    def record(
+        self, rod: int, time: float, position: np.ndarray, director: np.ndarray
+    ) -> None:
+        """
+        Store one rod's state at time.
+
+        Args:
+            rod: Rod index
+            time: Simulation time
+            position: (3, n_elements + 1) rod.position_collection
+            director: (3, 3, n_elements) rod.director_collection
+        """
+        slot = self.buffered
+        self.buffers["time"][slot] = time
+        self.buffers["position"][slot, rod] = position.T
+        self.buffers["director"][slot, rod] = np.moveaxis(director, -1, 0)
+        self.reported[rod] = True
+        if self.reported.all():
+            self.reported[:] = False
+            self.buffered += 1
+            if self.buffered == self.chunk_steps:
+                self.flush()
+
+    def flush(self) -> None:
+        """Append every complete buffered step to disk."""
+        for name, file in self.files.items():
+            file.write(self.buffers[name][: self.buffered].tobytes())
+            file.flush()
+        self.buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+        for file in self.files.values():
+            file.close()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TrajectoryCallback(ea.CallBackBaseClass):
+    """Send a rod's state to a TrajectoryWriter every step_skip steps."""
+
+    def __init__(self, writer: TrajectoryWriter, rod: int, step_skip: int = 100):
+        super().__init__()
+        self.writer = writer
+        self.rod = rod
+        self.step_skip = step_skip
+
+    def make_callback(self, system, time: np.float64, current_step: int) -> None:
+        if current_step % self.step_skip == 0:
+            self.writer.record(
+                self.rod, time, system.position_collection, system.director_collection
+            )
+
+
+def trajectory_callbacks(writer: TrajectoryWriter, step_skip: int = 100) -> list:
+    """Callbacks for build_simulation that record every rod into writer."""
+    return [
+        (
+            rod,
+            TrajectoryCallback,
+            {"writer": writer, "rod": rod, "step_skip": step_skip},
+        )
+        for rod in range(writer.n_rods)
+    ]
+
+
+class Trajectory:
+    """
+    Lazy, read-only view of a trajectory on disk.
+
+    Example:
+        trajectory = Trajectory("run/")
+        window = trajectory.window(0.5, 1.0)   # steps with 0.5 <= t < 1.0
+        tip = trajectory.positions[window, 2, -1]  # tip of rod 2 in that window
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path / "header.json", "r") as f:
+            self.header = json.load(f)
+        if self.header["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported trajectory version {self.header['version']} "
+                f"(expected {FORMAT_VERSION})"
+            )
+        self.shapes = {
+            name: tuple(shape) for name, shape in self.header["fields"].items()
+        }
+
+    def _field(self, name: str) -> np.ndarray:
+        shape = self.shapes[name]
+        n_steps = len(self)
+        if n_steps == 0:
+            return np.zeros((0, *shape), dtype=DTYPE)
+        return np.memmap(
+            self.path / f"{name}.f64", dtype=DTYPE, mode="r", shape=(n_steps, *shape)
+        )
+
+    def __len__(self) -> int:
+        """Number of steps written completely to every field."""
+        return min(
+            (self.path / f"{name}.f64").stat().st_size
+            // (DTYPE.itemsize * int(np.prod(shape)))
+            for name, shape in self.shapes.items()
+        )
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._field("time")
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(T, n_rods, n_elements + 1, 3)"""
+        return self._field("position")
+
+    @property
+    def directors(self) -> np.ndarray:
+        """(T, n_rods, n_elements, 3, 3)"""
+        return self._field("director")
+
+    def window(self, start: float, stop: float) -> slice:
+        """Slice of the steps with start <= time < stop."""
+        times = self.times
+        return slice(
+            int(np.searchsorted(times, start, side="left")),
+            int(np.searchsorted(times, stop, side="left")),
+        )
+
+    def rod(self, index: int) -> np.ndarray:
+        """(T, n_elements + 1, 3) positions of one rod, still memory-mapped."""
+        return self.positions[:, index]
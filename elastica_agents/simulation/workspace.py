@@ -0,0 +1,226 @@
+"""
+Monte Carlo estimate of the workspace a design can reach.
+
+Activations of every actuation channel are sampled uniformly in batches and
+pushed through the constant-curvature preview (see kinematics), and the tips
+of the tracked rods are binned into voxels (reachable volume) and their end
+directions into equal-area bins on the sphere (orientation coverage). Sampling
+stops once a few batches in a row add almost no new voxels.
+
+Example:
+    workspace = estimate_workspace(design, seed=0)
+    workspace.volume, workspace.converged
+    workspace.summary()  # JSON-ready statistics
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.builder import get_setup
+from elastica_agents.simulation.kinematics import _preview
+
+# Equal-area direction bins: uniform in cos(polar angle) times uniform in azimuth
+DIRECTION_BINS = (18, 36)
+# Voxel indices are packed into one int64 with this many bits per axis
+AXIS_BITS = 20
+# Voxels per total rod length when no voxel size is given
+VOXELS_PER_LENGTH = 50
+
+
+@dataclass
+class WorkspaceEstimate:
+    """
+    Reachable tip positions and directions of a design.
+
+    Attributes:
+        rods: Rows of the rods whose tips are tracked
+        n_samples: Actuation samples evaluated
+        voxel_size: Edge length of the voxels
+        voxels: (V, 3) integer index of every occupied voxel; voxel i spans
+            voxels[i] * voxel_size to (voxels[i] + 1) * voxel_size
+        tip_lower, tip_upper: (R, 3) bounds of each tracked tip
+        max_displacement: (R,) farthest each tip moves from its rest position
+        direction_coverage: (R,) fraction of the direction bins each tip's d3
+            visits
+        history: Occupied voxel count after each batch
+        converged: Whether sampling stopped because the voxel count settled
+    """
+
+    rods: np.ndarray
+    n_samples: int
+    voxel_size: float
+    voxels: np.ndarray
+    tip_lower: np.ndarray
+    tip_upper: np.ndarray
+    max_displacement: np.ndarray
+    direction_coverage: np.ndarray
+    history: np.ndarray
+    converged: bool
+
+    @property
+    def volume(self) -> float:
+        """Volume of the occupied voxels."""
+        return len(self.voxels) * self.voxel_size**3
+
+    def occupancy(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Dense occupancy grid.
+
+        Returns:
+            (X, Y, Z) boolean grid and the world position of its lowest corner
+        """
+        if not len(self.voxels):
+            return np.zeros((0, 0, 0), dtype=bool), np.zeros(3)
+        lower = self.voxels.min(axis=0)
+        grid = np.zeros(self.voxels.max(axis=0) - lower + 1, dtype=bool)
+        grid[tuple((self.voxels - lower).T)] = True
+        return grid, lower * self.voxel_size
+
+    def summary(self, ids: list[str] | None = None) -> dict:
+        """JSON-ready statistics; tips are keyed by ids[row] when ids are given."""
+        names = [ids[row] if ids else int(row) for row in self.rods.tolist()]
+        return {
+            "samples": self.n_samples,
+            "converged": self.converged,
+            "voxel_size": self.voxel_size,
+            "occupied_voxels": len(self.voxels),
+            "reachable_volume": self.volume,
+            "tips": {
+                name: {
+                    "lower": np.round(self.tip_lower[k], 4).tolist(),
+                    "upper": np.round(self.tip_upper[k], 4).tolist(),
+                    "max_displacement": round(float(self.max_displacement[k]), 4),
+                    "direction_coverage": round(float(self.direction_coverage[k]), 4),
+                }
+                for k, name in enumerate(names)
+            },
+        }
+
+
+def voxel_codes(points: np.ndarray, voxel_size: float) -> np.ndarray:
+    """Unique int64 code of the voxel containing each (P, 3) point."""
+    index = np.floor(points / voxel_size).astype(np.int64) + (1 << (AXIS_BITS - 1))
+    index = np.clip(index, 0, (1 << AXIS_BITS) - 1)
+    return (index[:, 0] << (2 * AXIS_BITS)) | (index[:, 1] << AXIS_BITS) | index[:, 2]
+
+
+def voxel_indices(codes: np.ndarray) -> np.ndarray:
+    """Inverse of voxel_codes: (V, 3) voxel indices."""
+    mask = (1 << AXIS_BITS) - 1
+    index = np.stack(
+        [codes >> (2 * AXIS_BITS), (codes >> AXIS_BITS) & mask, codes & mask], axis=1
+    )
+    return index - (1 << (AXIS_BITS - 1))
+
+
+def direction_bins(directions: np.ndarray) -> np.ndarray:
+    """Equal-area bin (see DIRECTION_BINS) of each (P, 3) unit direction."""
+    n_polar, n_azimuth = DIRECTION_BINS
+    polar = ((directions[:, 2] + 1.0) * 0.5 * n_polar).astype(np.int64)
+    polar = np.clip(polar, 0, n_polar - 1)
+    azimuth = np.arctan2(directions[:, 1], directions[:, 0])
+    azimuth = ((azimuth + np.pi) / (2.0 * np.pi) * n_azimuth).astype(np.int64)
+    return polar * n_azimuth + np.clip(azimuth, 0, n_azimuth - 1)
+
+
+def end_rods(design: RobotDesignSchema) -> np.ndarray:
+    """
+    Rows of the rods whose end is free (neither joined nor clamped); every
+    rod if there are none.
+    """
+    setup = get_setup(design)
+    held = {(rod, index) for rod, index, *_ in setup.joints}
+    held |= {(rod, index) for *_, rod, index in setup.joints}
+    held |= set(setup.bases)
+    free = [rod for rod in range(setup.n_rods) if (rod, -1) not in held]
+    return np.array(free or range(setup.n_rods), dtype=np.int64)
+
+
+def estimate_workspace(
+    design: RobotDesignSchema,
+    rods=None,
+    voxel_size: float | None = None,
+    batch_size: int = 4096,
+    max_samples: int = 200_000,
+    tolerance: float = 0.005,
+    patience: int = 2,
+    low: float = 0.0,
+    high: float = 1.0,
+    seed: int | None = None,
+) -> WorkspaceEstimate:
+    """
+    Sample the actuation space of design until its tip workspace stops growing.
+
+    Args:
+        design: Robot design
+        rods: Rows of the rods whose tips are tracked (defaults to end_rods)
+        voxel_size: Voxel edge length (defaults to the total rod length / 50)
+        batch_size: Actuation samples evaluated at once
+        max_samples: Upper bound on the number of samples
+        tolerance: A batch that grows the voxel count by less than this
+            fraction counts as converged
+        patience: Consecutive converged batches needed to stop early
+        low, high: Range each channel's activation is sampled from
+        seed: Seed of the random generator
+
+    Returns:
+        WorkspaceEstimate
+    """
+    setup = get_setup(design)
+    rods = end_rods(design) if rods is None else np.asarray(rods, dtype=np.int64)
+    if voxel_size is None:
+        voxel_size = max(float(setup.lengths.sum()), 1e-6) / VOXELS_PER_LENGTH
+    n_channels = len(setup.channels)
+    rng = np.random.default_rng(seed)
+    n_directions = np.prod(DIRECTION_BINS)
+
+    rest = _preview(setup, np.zeros((1, n_channels)), 2)[0][0, rods, -1]
+    codes = np.zeros(0, dtype=np.int64)
+    directions = np.zeros(0, dtype=np.int64)
+    tip_lower = np.full((len(rods), 3), np.inf)
+    tip_upper = np.full((len(rods), 3), -np.inf)
+    max_displacement = np.zeros(len(rods))
+    history = []
+    n_samples = calm = 0
+    converged = False
+    while n_samples < max_samples:
+        # Without channels there is only the rest pose
+        size = min(batch_size, max_samples - n_samples) if n_channels else 1
+        actuations = rng.uniform(low, high, (size, n_channels))
+        centerlines, tip_directors = _preview(setup, actuations, 2)
+        tips = centerlines[:, rods, -1]  # (B, R, 3)
+        n_samples += size
+
+        codes = np.union1d(codes, voxel_codes(tips.reshape(-1, 3), voxel_size))
+        bins = direction_bins(tip_directors[:, rods, 2].reshape(-1, 3))
+        directions = np.union1d(
+            directions, np.tile(np.arange(len(rods)), size) * n_directions + bins
+        )
+        tip_lower = np.minimum(tip_lower, tips.min(axis=0))
+        tip_upper = np.maximum(tip_upper, tips.max(axis=0))
+        max_displacement = np.maximum(
+            max_displacement, np.linalg.norm(tips - rest, axis=2).max(axis=0)
+        )
+
+        previous = history[-1] if history else 0
+        history.append(len(codes))
+        calm = calm + 1 if len(codes) - previous <= tolerance * len(codes) else 0
+        if not n_channels or calm >= patience:
+            converged = True
+            break
+
+    return WorkspaceEstimate(
+        rods=rods,
+        n_samples=n_samples,
+        voxel_size=voxel_size,
+        voxels=voxel_indices(codes),
+        tip_lower=tip_lower,
+        tip_upper=tip_upper,
+        max_displacement=max_displacement,
+        direction_coverage=np.bincount(directions // n_directions, minlength=len(rods))
+        / n_directions,
+        history=np.array(history, dtype=np.int64),
+        converged=converged,
+    )
@@ -1,3 +1,19 @@
-from elastica_agents.tool.rendering import render_design
+from elastica_agents.tool.geometry import RodGeometry
+from elastica_agents.tool.rendering import (
+    render_design,
+    render_design_views,
+    render_geometry,
+    render_geometry_views,
+)
+from elastica_agents.tool.render_pool import RenderJob, RenderPool, render_designs
 
-__all__ = ["render_design"]
+__all__ = [
+    "RodGeometry",
+    "render_design",
+    "render_design_views",
+    "render_geometry",
+    "render_geometry_views",
+    "RenderJob",
+    "RenderPool",
+    "render_designs",
+]
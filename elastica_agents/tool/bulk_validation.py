@@ -0,0 +1,188 @@
+import functools
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+
+from elastica_agents.design_checks import check_design
+from elastica_agents.design_schema import RobotDesignSchema
+
+
+@dataclass
+class ValidationResult:
+    """
+    Outcome of validating one design.
+
+    Attributes:
+        source: File path, or ``archive.jsonl:<line>`` for archived designs
+        error: None if the design is valid, otherwise a one-line-per-error message
+    """
+
+    source: str
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def iter_design_sources(path: str | Path) -> Iterator[tuple[str, bytes | None]]:
+    """
+    Stream the designs stored under path without loading them all.
+
+    A directory yields every ``*.json`` file below it (payload None, read by
+    the worker); a ``.jsonl`` archive yields one design per non-empty line.
+
+    Yields:
+        (source, raw JSON bytes or None)
+    """
+    path = Path(path)
+    if path.is_dir():
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    yield os.path.join(root, name), None
+    elif path.suffix == ".jsonl":
+        with open(path, "rb") as f:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield f"{path}:{line_number}", line
+    else:
+        yield str(path), None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc'])) or '<root>'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def validate_design(
+    source: str, payload: bytes | None = None, checks: bool = False
+) -> ValidationResult:
+    """
+    Validate one design.json. JSON is parsed by pydantic's native parser
+    (``model_validate_json``) instead of ``json.load`` + ``model_validate``.
+
+    With checks, the design must also pass the semantic checks of
+    elastica_agents.design_checks (warnings are ignored).
+    """
+    try:
+        if payload is None:
+            with open(source, "rb") as f:
+                payload = f.read()
+        design = RobotDesignSchema.model_validate_json(payload)
+    except ValidationError as e:
+        return ValidationResult(source, format_validation_error(e))
+    except OSError as e:
+        return ValidationResult(source, f"{type(e).__name__}: {e}")
+
+    if checks:
+        try:
+            issues = check_design(design)
+        except Exception as e:
+            return ValidationResult(source, f"check failed: {type(e).__name__}: {e}")
+        errors = [str(issue) for issue in issues if issue.severity == "error"]
+        if errors:
+            return ValidationResult(source, "; ".join(errors))
+    return ValidationResult(source)
+
+
+def _validate_item(
+    item: tuple[str, bytes | None], checks: bool = False
+) -> ValidationResult:
+    return validate_design(*item, checks=checks)
+
+
+def _validate_chunk(
+    chunk: list[tuple[str, bytes | None]], checks: bool = False
+) -> list[ValidationResult]:
+    return [validate_design(*item, checks=checks) for item in chunk]
+
+
+def validate_designs(
+    items: Iterable[tuple[str, bytes | None]],
+    max_workers: int | None = None,
+    chunksize: int = 256,
+    checks: bool = False,
+) -> Iterator[ValidationResult]:
+    """
+    Validate designs across a process pool, yielding results in input order.
+
+    Items are pulled lazily: at most 2 * max_workers chunks are in flight, so
+    an archive of any size is streamed with bounded memory.
+
+    Args:
+        items: (source, payload) pairs, e.g. from iter_design_sources
+        max_workers: Number of worker processes (defaults to the CPU count);
+            1 validates in the calling process
+        chunksize: Designs sent to a worker per task
+        checks: Also run the semantic design checks
+
+    Yields:
+        ValidationResult of each design; invalid designs never stop the run
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        yield from map(functools.partial(_validate_item, checks=checks), items)
+        return
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < 2 * max_workers:
+                    chunk = list(itertools.islice(items, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_validate_chunk, chunk, checks))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            # Abandoned early: don't validate the chunks nobody will read
+            for future in pending:
+                future.cancel()
+
+
+def validate_archive(
+    path: str | Path,
+    max_workers: int | None = None,
+    chunksize: int = 256,
+    checks: bool = False,
+    echo=print,
+) -> tuple[int, int]:
+    """
+    Validate every design under path, reporting each invalid design and the
+    overall throughput through echo.
+
+    Returns:
+        (number of designs, number of invalid designs)
+    """
+    start = time.perf_counter()
+    total = failed = 0
+    for result in validate_designs(
+        iter_design_sources(path),
+        max_workers=max_workers,
+        chunksize=chunksize,
+        checks=checks,
+    ):
+        total += 1
+        if not result.ok:
+            failed += 1
+            echo(f"{result.source}: {result.error}")
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    echo(
+        f"Validated {total} designs in {elapsed:.2f}s ({rate:.0f} designs/s): "
+        f"{total - failed} valid, {failed} invalid"
+    )
+    return total, failed
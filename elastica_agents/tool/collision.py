@@ -0,0 +1,185 @@
+"""
+Self-intersection detection between the rods of a design.
+
+Broad phase: every rod's bounding box (inflated by its radius) is binned into a
+uniform grid, and rods sharing a cell become candidate pairs. Narrow phase: the
+exact segment-segment distance of all candidates is computed at once and
+compared with the sum of the radii. Pairs of rods that share a connection touch
+by design and are skipped.
+"""
+
+import numpy as np
+
+from elastica_agents.tool.geometry import RodGeometry
+
+# Cells are never smaller than 1/MAX_CELLS_PER_ROD of the largest rod, which
+# bounds the number of cells one rod is binned into
+MAX_CELLS_PER_ROD = 8
+EPSILON = 1e-12
+
+
+def pair_codes(pairs: np.ndarray, n: int) -> np.ndarray:
+    """Encode (i, j) pairs with i < j as single integers i * n + j."""
+    return pairs[:, 0] * n + pairs[:, 1]
+
+
+def connected_pairs(offsets: np.ndarray, members: np.ndarray) -> np.ndarray:
+    """
+    Rod pairs that share a connection.
+
+    Args:
+        offsets, members: CSR connection -> rod rows (negative rows are ignored)
+
+    Returns:
+        (K, 2) pairs with i < j
+    """
+    pairs = []
+    for lo, hi in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        rows = np.unique(members[lo:hi])
+        rows = rows[rows >= 0]
+        i, j = np.triu_indices(len(rows), k=1)
+        pairs.append(np.stack([rows[i], rows[j]], axis=1))
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(pairs).astype(np.int64)
+
+
+def candidate_pairs(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Uniform-grid broad phase over axis-aligned boxes.
+
+    Returns:
+        (K, 2) unique pairs with i < j whose boxes overlap
+    """
+    n = len(lower)
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    extent = (upper - lower).max(axis=1)
+    cell = max(float(np.median(extent)), float(extent.max()) / MAX_CELLS_PER_ROD)
+    if cell <= 0.0:
+        cell = 1.0
+    origin = lower.min(axis=0)
+    cell_lo = np.floor((lower - origin) / cell).astype(np.int64)
+    cell_hi = np.floor((upper - origin) / cell).astype(np.int64)
+    span = cell_hi - cell_lo + 1
+    grid = cell_hi.max(axis=0) + 1
+
+    # One entry per (rod, cell) the box touches
+    counts = span.prod(axis=1)
+    rods = np.repeat(np.arange(n), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    span_r = span[rods]
+    offset = np.stack(
+        [
+            local // (span_r[:, 1] * span_r[:, 2]),
+            local // span_r[:, 2] % span_r[:, 1],
+            local % span_r[:, 2],
+        ],
+        axis=1,
+    )
+    cells = cell_lo[rods] + offset
+    keys = (cells[:, 0] * grid[1] + cells[:, 1]) * grid[2] + cells[:, 2]
+
+    # Pair every entry with the entries after it in the same cell
+    order = np.argsort(keys, kind="stable")
+    keys, rods = keys[order], rods[order]
+    cell_end = np.searchsorted(keys, keys, side="right")
+    partners = cell_end - np.arange(len(keys)) - 1
+    first = np.repeat(np.arange(len(keys)), partners)
+    second = (
+        np.arange(partners.sum())
+        - np.repeat(np.cumsum(partners) - partners, partners)
+        + first
+        + 1
+    )
+    i, j = rods[first], rods[second]
+    pairs = np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    pairs = np.unique(pairs, axis=0)
+
+    overlap = np.all(
+        (lower[pairs[:, 0]] <= upper[pairs[:, 1]])
+        & (lower[pairs[:, 1]] <= upper[pairs[:, 0]]),
+        axis=1,
+    )
+    return pairs[overlap]
+
+
+def segment_distances(
+    p1: np.ndarray, q1: np.ndarray, p2: np.ndarray, q2: np.ndarray
+) -> np.ndarray:
+    """
+    Closest distance between segments p1-q1 and p2-q2, row by row.
+
+    Vectorized form of the clamped closest-point algorithm (Ericson, Real-Time
+    Collision Detection, 5.1.9), including degenerate (zero length) segments.
+    """
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.einsum("ij,ij->i", d1, d1)
+    e = np.einsum("ij,ij->i", d2, d2)
+    b = np.einsum("ij,ij->i", d1, d2)
+    c = np.einsum("ij,ij->i", d1, r)
+    f = np.einsum("ij,ij->i", d2, r)
+    point1 = a > EPSILON
+    point2 = e > EPSILON
+    safe_a = np.where(point1, a, 1.0)
+    safe_e = np.where(point2, e, 1.0)
+
+    denom = a * e - b * b
+    s = np.where(
+        denom > EPSILON * np.maximum(a * e, EPSILON),
+        np.clip((b * f - c * e) / np.where(denom > 0.0, denom, 1.0), 0.0, 1.0),
+        0.0,
+    )
+    t = (b * s + f) / safe_e
+    s = np.where(t < 0.0, np.clip(-c / safe_a, 0.0, 1.0), s)
+    s = np.where(t > 1.0, np.clip((b - c) / safe_a, 0.0, 1.0), s)
+    t = np.clip(t, 0.0, 1.0)
+
+    # Degenerate segments
+    s = np.where(point2, s, np.clip(-c / safe_a, 0.0, 1.0))
+    t = np.where(point2, t, 0.0)
+    t = np.where(point1, t, np.clip(f / safe_e, 0.0, 1.0))
+    s = np.where(point1, s, 0.0)
+
+    gap = (p1 + d1 * s[:, None]) - (p2 + d2 * t[:, None])
+    return np.linalg.norm(gap, axis=1)
+
+
+def find_self_intersections(
+    geometry: RodGeometry,
+    exclude: np.ndarray | None = None,
+    clearance: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of rods whose surfaces overlap.
+
+    Args:
+        geometry: Rods to check
+        exclude: (K, 2) pairs (i < j) that may touch, e.g. from connected_pairs
+        clearance: Extra gap required between rod surfaces
+
+    Returns:
+        (M, 2) intersecting pairs with i < j, and the (M,) penetration depth of
+        each (sum of radii plus clearance minus the axis distance)
+    """
+    n = len(geometry)
+    radius = geometry.radii[:, None] + 0.5 * clearance
+    lower = np.minimum(geometry.start_points, geometry.end_points) - radius
+    upper = np.maximum(geometry.start_points, geometry.end_points) + radius
+
+    pairs = candidate_pairs(lower, upper)
+    if exclude is not None and len(exclude) and len(pairs):
+        pairs = pairs[~np.isin(pair_codes(pairs, n), pair_codes(exclude, n))]
+
+    i, j = pairs[:, 0], pairs[:, 1]
+    distance = segment_distances(
+        geometry.start_points[i],
+        geometry.end_points[i],
+        geometry.start_points[j],
+        geometry.end_points[j],
+    )
+    penetration = geometry.radii[i] + geometry.radii[j] + clearance - distance
+    hit = penetration > 0.0
+    return pairs[hit], penetration[hit]
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from elastica_agents.design_checks import check_design
+from elastica_agents.design_hash import DesignSimilarityIndex, design_hash
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.packed_design import PackedDesign
+from elastica_agents.tool.bulk_validation import format_validation_error
+
+# Designs checked so far per design file, to flag designs an agent already
+# tried. Candidates write separate files, so their attempts are not compared
+# with each other; a new session starts with clear_design_history().
+_histories: dict[Path, DesignSimilarityIndex] = {}
+
+
+def clear_design_history() -> None:
+    """Forget every checked design (at the start of a session)."""
+    _histories.clear()
+
+
+def check_design_file(design_file: str) -> str:
+    """
+    Check a design.json for schema and geometric consistency, and whether it
+    repeats an earlier attempt written to the same file. Checking an
+    unchanged file again is not a repeat.
+
+    Args:
+        design_file: Path to the design.json file
+
+    Returns:
+        JSON list of issues, each with code, message, severity and the offending
+        actuator id, connection index or actuation group name. An empty list
+        means the design is consistent and new.
+    """
+    try:
+        with open(design_file, "rb") as f:
+            design = RobotDesignSchema.model_validate_json(f.read())
+    except ValidationError as e:
+        issues = [
+            {
+                "code": "schema",
+                "message": format_validation_error(e),
+                "severity": "error",
+            }
+        ]
+        return json.dumps(issues)
+
+    packed = PackedDesign.from_design(design)
+    issues = [issue.to_dict() for issue in check_design(packed)]
+    if any(issue["code"] == "non_finite_geometry" for issue in issues):
+        # Such a design has no meaningful fingerprint; it is not an attempt
+        return json.dumps(issues)
+
+    history = _histories.setdefault(
+        Path(design_file).resolve(), DesignSimilarityIndex()
+    )
+    digest = design_hash(packed)
+    if history.values and history.values[-1] == digest:
+        # Same design as the latest attempt: a re-check, not a new attempt
+        return json.dumps(issues)
+
+    match = history.match(packed)
+    if match is not None:
+        similarity = "the same as" if match.exact else "nearly the same as"
+        issues.append(
+            {
+                "code": "repeated_design",
+                "message": f"This design is {similarity} attempt {match.key} "
+                "(ignoring actuator ids and ordering). Change it meaningfully "
+                "instead of resubmitting it.",
+                "severity": "warning",
+            }
+        )
+    history.add(len(history) + 1, packed, value=digest)
+    return json.dumps(issues)
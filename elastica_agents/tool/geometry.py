@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from elastica_agents.design_schema import Point3D, RobotDesignSchema
+from elastica_agents.packed_design import PackedDesign
+
+
+def as_point_array(points) -> np.ndarray:
+    """Convert a list of Point3D (or of 3-sequences) to an (N, 3) float array."""
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return np.array(
+        [(p.x, p.y, p.z) if isinstance(p, Point3D) else tuple(p) for p in points],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+
+
+def frames_along(tangents: np.ndarray) -> np.ndarray:
+    """
+    Orthonormal director frames with d3 along each tangent.
+
+    Args:
+        tangents: (N, 3) rod directions (need not be normalized)
+
+    Returns:
+        (N, 3, 3) array whose rows are d1, d2, d3
+    """
+    length = np.linalg.norm(tangents, axis=1, keepdims=True)
+    d3 = np.divide(tangents, length, out=np.zeros_like(tangents), where=length > 0)
+    d3[length[:, 0] == 0] = (0.0, 0.0, 1.0)
+
+    # Any axis that is not parallel to d3 gives a valid d1
+    helper = np.zeros_like(d3)
+    helper[np.arange(len(d3)), np.argmin(np.abs(d3), axis=1)] = 1.0
+    d1 = np.cross(helper, d3)
+    d1 /= np.linalg.norm(d1, axis=1, keepdims=True)
+    d2 = np.cross(d3, d1)
+    return np.stack([d1, d2, d3], axis=1)
+
+
+@dataclass
+class RodGeometry:
+    """
+    Struct-of-arrays geometry of N straight rods.
+
+    Attributes:
+        start_points: (N, 3) start point of each rod
+        end_points: (N, 3) end point of each rod
+        radii: (N,) radius of each rod
+        directors: (N, 3, 3) orientation frame of each rod, rows d1, d2, d3
+            (the same layout as RotationMatrix.Q())
+    """
+
+    start_points: np.ndarray
+    end_points: np.ndarray
+    radii: np.ndarray
+    directors: np.ndarray
+
+    def __post_init__(self):
+        self.start_points = np.asarray(self.start_points, dtype=np.float64).reshape(
+            -1, 3
+        )
+        self.end_points = np.asarray(self.end_points, dtype=np.float64).reshape(-1, 3)
+        self.radii = np.asarray(self.radii, dtype=np.float64).reshape(-1)
+        self.directors = np.asarray(self.directors, dtype=np.float64).reshape(-1, 3, 3)
+
+        n_rods = len(self.start_points)
+        if not (
+            len(self.end_points) == len(self.radii) == len(self.directors) == n_rods
+        ):
+            raise ValueError(
+                "start_points, end_points, radii and directors must have the same length"
+            )
+
+    def __len__(self) -> int:
+        return len(self.radii)
+
+    @classmethod
+    def from_points(
+        cls,
+        start_points,
+        end_points,
+        radii,
+        directors=None,
+    ) -> "RodGeometry":
+        """
+        Build from lists of Point3D (or arrays). Without directors, frames with
+        d3 along each rod are generated.
+        """
+        start_points = as_point_array(start_points)
+        end_points = as_point_array(end_points)
+        if directors is None:
+            directors = frames_along(end_points - start_points)
+        return cls(start_points, end_points, radii, directors)
+
+    @classmethod
+    def from_design(cls, design: RobotDesignSchema) -> "RodGeometry":
+        return cls.from_packed(PackedDesign.from_design(design))
+
+    @classmethod
+    def from_packed(cls, packed: PackedDesign) -> "RodGeometry":
+        """Views into the packed rod buffer; nothing is copied."""
+        return cls(
+            packed.start_points, packed.end_points, packed.radii, packed.directors
+        )
+
+    @property
+    def tangents(self) -> np.ndarray:
+        return self.end_points - self.start_points
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.linalg.norm(self.tangents, axis=1)
+
+    def bounding_sphere(self) -> tuple[np.ndarray, float]:
+        """Centre of the bounding box and the radius that encloses every rod."""
+        if len(self) == 0:
+            return np.zeros(3), 0.0
+        points = np.vstack([self.start_points, self.end_points])
+        center = 0.5 * (points.min(axis=0) + points.max(axis=0))
+        padding = np.tile(self.radii, 2)
+        extent = np.linalg.norm(points - center, axis=1) + padding
+        return center, float(extent.max())
@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+from pydantic import ValidationError
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.builder import get_setup
+from elastica_agents.simulation.kinematics import preview_kinematics
+from elastica_agents.tool.bulk_validation import format_validation_error
+
+
+def preview_actuation(design_file: str, actuation: list[float]) -> str:
+    """
+    Quickly predict how a design deforms under an actuation, without running
+    the physics simulation (constant-curvature model, gravity ignored).
+
+    Args:
+        design_file: Path to the design.json file
+        actuation: Activation of each actuation group in the order they are
+            listed (or of each actuator mode when there are no groups), e.g.
+            1.0 for full actuation
+
+    Returns:
+        JSON with the actuation channels and, for every actuator id, its tip
+        position at rest, under the actuation, and the displacement between them.
+    """
+    try:
+        with open(design_file, "rb") as f:
+            design = RobotDesignSchema.model_validate_json(f.read())
+    except ValidationError as e:
+        return json.dumps({"error": format_validation_error(e)})
+
+    setup = get_setup(design)
+    if len(actuation) != len(setup.channels):
+        return json.dumps(
+            {
+                "error": f"Expected {len(setup.channels)} activations, "
+                f"got {len(actuation)}",
+                "channels": setup.channels,
+            }
+        )
+    preview = preview_kinematics(design, actuation)
+    rest = preview.rest_centerlines[:, -1]
+    tips = preview.tip_positions[0]
+    return json.dumps(
+        {
+            "channels": setup.channels,
+            "tips": {
+                actuator_id: {
+                    "rest": np.round(rest[row], 4).tolist(),
+                    "actuated": np.round(tips[row], 4).tolist(),
+                    "displacement": np.round(tips[row] - rest[row], 4).tolist(),
+                }
+                for row, actuator_id in enumerate(setup.ids)
+            },
+        }
+    )
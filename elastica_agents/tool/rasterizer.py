@@ -0,0 +1,390 @@
+"""
+Pure NumPy renderer for rod designs.
+
+Cylinders are projected to the screen and binned into the 8 x 8 pixel tiles
+they can cover. The rays of all (rod, tile) pairs are intersected analytically
+in batches rather than rod by rod, and the nearest hit wins in a z-buffer.
+Shading (ambient + diffuse + Phong) and the ground grid
+are then evaluated for all covered pixels at once. The camera follows POV-Ray's
+``location``/``look_at`` convention so both backends frame a design the same way.
+The background (primary rays and ground plane) only depends on the camera and
+image size, so it is computed once per view and reused.
+"""
+
+import functools
+
+import numpy as np
+
+from elastica_agents.tool.geometry import as_point_array
+
+# Matches PVGeometry and povray_background.inc
+ROD_COLOR = np.array([0.45, 0.39, 1.0])
+BACKGROUND_COLOR = np.array([1.0, 1.0, 1.0])
+GROUND_COLOR = np.array([1.0, 1.0, 1.0])
+GRID_COLOR = np.array([0.6, 0.6, 0.6])
+GRID_SPACING = 0.1
+GRID_HALF_LINE = 0.03
+GRID_FADE = (1.5, 3.0)  # distance where grid lines start / finish fading out
+GROUND_TRANSMIT = 0.8
+AMBIENT = 0.1
+DIFFUSE = 0.9
+PHONG = 1.0
+PHONG_SIZE = 40.0
+# Rods are intersected with the rays of TILE x TILE pixel tiles, TILE_BATCH
+# (rod, tile) pairs at a time
+TILE = 8
+TILE_BATCH = 4096
+
+
+def camera_basis(
+    camera_position, look_at, width: int, height: int, sky=(0.0, 1.0, 0.0)
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    POV-Ray perspective camera after ``sky`` and ``look_at``.
+
+    Returns:
+        location, direction (unit), right (length width/height), up (unit)
+    """
+    location = np.asarray(camera_position, dtype=np.float64)
+    direction = np.asarray(look_at, dtype=np.float64) - location
+    direction /= np.linalg.norm(direction)
+    right = np.cross(np.asarray(sky, dtype=np.float64), direction)
+    right /= np.linalg.norm(right)
+    up = np.cross(direction, right)
+    return location, direction, right * (width / height), up
+
+
+def primary_rays(direction, right, up, width: int, height: int) -> np.ndarray:
+    """Unit ray direction through every pixel centre, shape (height, width, 3)."""
+    px = (np.arange(width) + 0.5) / width - 0.5
+    py = 0.5 - (np.arange(height) + 0.5) / height
+    rays = (
+        direction[None, None, :]
+        + px[None, :, None] * right[None, None, :]
+        + py[:, None, None] * up[None, None, :]
+    )
+    return rays / np.linalg.norm(rays, axis=-1, keepdims=True)
+
+
+def project(points, location, direction, right, up, width: int, height: int):
+    """
+    Project points (..., 3) to pixel coordinates.
+
+    Returns:
+        column, row and camera depth, each of shape (...)
+    """
+    v = points - location
+    depth = v @ direction
+    aspect = np.linalg.norm(right)
+    px = (v @ right) / (aspect**2) / depth
+    py = (v @ up) / depth
+    return (px + 0.5) * width, (0.5 - py) * height, depth
+
+
+def _screen_bounds(start_points, end_points, radii, camera, width, height):
+    """Conservative pixel bounding box (r0, r1, c0, c1) of every rod."""
+    offsets = np.array(
+        [[sx, sy, sz] for sx in (-1, 1) for sy in (-1, 1) for sz in (-1, 1)],
+        dtype=np.float64,
+    )
+    corners = np.concatenate(
+        [
+            start_points[:, None, :] + offsets[None] * radii[:, None, None],
+            end_points[:, None, :] + offsets[None] * radii[:, None, None],
+        ],
+        axis=1,
+    )
+    cols, rows, depth = project(corners, *camera, width, height)
+
+    behind = (depth <= 1e-6).any(axis=1)
+    c0 = np.where(behind, 0, np.floor(cols.min(axis=1)))
+    c1 = np.where(behind, width, np.ceil(cols.max(axis=1)) + 1)
+    r0 = np.where(behind, 0, np.floor(rows.min(axis=1)))
+    r1 = np.where(behind, height, np.ceil(rows.max(axis=1)) + 1)
+    bounds = np.stack([r0, r1, c0, c1], axis=1)
+    bounds[:, :2] = np.clip(bounds[:, :2], 0, height)
+    bounds[:, 2:] = np.clip(bounds[:, 2:], 0, width)
+    return bounds.astype(np.int64)
+
+
+def _screen_capsules(start_points, end_points, radii, camera, width, height):
+    """
+    2D capsule around the projection of every rod.
+
+    A sphere of radius r at depth z whose centre projects at tan(angle) off
+    the optical axis projects within ``height * r * (1 + tan) / (z - r)``
+    pixels of that point, and a rod lies inside the spheres swept along it.
+
+    Returns:
+        Projected start and end points (N, 2) as (column, row), and the capsule
+        radius in pixels (inf if the rod comes too close to the camera)
+    """
+    points, depths, tangents = [], [], []
+    for rod_points in (start_points, end_points):
+        cols, rows, depth = project(rod_points, *camera, width, height)
+        points.append(np.stack([cols, rows], axis=-1))
+        depths.append(depth)
+        tangents.append(np.hypot(cols - 0.5 * width, rows - 0.5 * height) / height)
+    near = np.minimum(*depths) - radii
+    with np.errstate(divide="ignore", invalid="ignore"):
+        radius = height * radii * (1.0 + np.maximum(*tangents)) / near
+    return points[0], points[1], np.where(near > 1e-6, radius, np.inf)
+
+
+def _rod_tiles(rods, bounds, capsules, n_columns):
+    """
+    Tiles of the bounding boxes of rods that their capsules may overlap.
+
+    Returns:
+        Rod and tile index of every (rod, tile) pair, rod-major
+    """
+    r0, c0 = bounds[rods, 0] // TILE, bounds[rods, 2] // TILE
+    r1, c1 = -(-bounds[rods, 1] // TILE), -(-bounds[rods, 3] // TILE)
+    columns = c1 - c0
+    sizes = (r1 - r0) * columns
+    owner = np.repeat(np.arange(len(rods)), sizes)
+    local = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    row = r0[owner] + local // columns[owner]
+    col = c0[owner] + local % columns[owner]
+
+    # Distance of each tile centre to the projected rod axis
+    p0, p1, radius = (array[rods][owner] for array in capsules)
+    axis = p1 - p0
+    offset = np.stack([col + 0.5, row + 0.5], axis=-1) * TILE - p0
+    length2 = np.einsum("ni,ni->n", axis, axis)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.clip(np.einsum("ni,ni->n", offset, axis) / length2, 0.0, 1.0)
+    s = np.where(length2 > 0.0, s, 0.0)
+    distance = np.linalg.norm(offset - s[:, None] * axis, axis=-1)
+    keep = distance <= radius + TILE / np.sqrt(2.0)
+    return rods[owner[keep]], row[keep] * n_columns + col[keep]
+
+
+def _intersect_cylinders(origin, rays, a, b, radius):
+    """
+    Ray / capped-cylinder intersection of blocks of rays, one cylinder each.
+
+    Args:
+        rays: (P, K, 3) unit ray directions
+        a, b, radius: (P, 3), (P, 3) and (P,) cylinder of each block
+
+    Returns:
+        Flat index (block * K + ray) of every hit, its distance, and the part
+        that was hit: 0 for the side, -1 for the cap at a, 1 for the cap at b
+    """
+    ba = b - a
+    oc = origin - a
+    baba = np.einsum("pi,pi->p", ba, ba)
+    baoc = np.einsum("pi,pi->p", oc, ba)
+    bard = np.matmul(rays, ba[:, :, None])[..., 0]
+    k2 = baba[:, None] - bard * bard
+    k1 = baba[:, None] * np.matmul(rays, oc[:, :, None])[..., 0] - baoc[:, None] * bard
+    k0 = baba * np.einsum("pi,pi->p", oc, oc) - baoc * baoc - radius * radius * baba
+    h = k1 * k1 - k2 * k0[:, None]
+
+    # Only rays that hit the infinite cylinder need the full test
+    (index,) = np.nonzero(h.ravel() >= 0.0)
+    block = index // rays.shape[1]
+    baba, baoc = baba[block], baoc[block]
+    bard, k1, k2 = bard.take(index), k1.take(index), k2.take(index)
+    h = np.sqrt(h.take(index))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Side of the cylinder
+        t_body = (-k1 - h) / k2
+        y = baoc + t_body * bard
+        body = (y > 0.0) & (y < baba) & (t_body > 0.0)
+
+        # Flat end caps
+        t_cap = (np.where(y < 0.0, 0.0, baba) - baoc) / bard
+        cap = ~body & (np.abs(k1 + k2 * t_cap) < h) & (t_cap > 0.0)
+
+    keep = body | cap
+    part = np.where(body, 0, np.where(y < 0.0, -1, 1)).astype(np.int8)
+    return index[keep], np.where(body, t_body, t_cap)[keep], part[keep]
+
+
+def _cylinder_normals(origin, rays, t, part, start_points, end_points, radii, rod):
+    """Surface normal at hits of _intersect_cylinders; rod is the hit rod per ray."""
+    ba = end_points - start_points
+    oc = origin - start_points
+    baba = np.einsum("ni,ni->n", ba, ba)
+    baoc = np.einsum("ni,ni->n", oc, ba)
+    ba, oc, radius = ba[rod], oc[rod], radii[rod]
+    y = baoc[rod] + t * np.einsum("ni,ni->n", rays, ba)
+    return np.where(
+        (part == 0)[:, None],
+        (oc + t[:, None] * rays - ba * (y / baba[rod])[:, None]) / radius[:, None],
+        part[:, None] * ba / np.sqrt(baba)[rod][:, None],
+    )
+
+
+def _to_tiles(image: np.ndarray) -> np.ndarray:
+    """(height, width, ...) -> (tiles, TILE * TILE, ...), edge-padded."""
+    height, width = image.shape[:2]
+    pad = [(0, -height % TILE), (0, -width % TILE)] + [(0, 0)] * (image.ndim - 2)
+    image = np.pad(image, pad, mode="edge")
+    rows, columns = image.shape[0] // TILE, image.shape[1] // TILE
+    tiles = image.reshape(rows, TILE, columns, TILE, *image.shape[2:])
+    return np.ascontiguousarray(tiles.swapaxes(1, 2)).reshape(
+        rows * columns, TILE * TILE, *image.shape[2:]
+    )
+
+
+def _from_tiles(tiles: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Inverse of _to_tiles."""
+    rows, columns = -(-height // TILE), -(-width // TILE)
+    image = tiles.reshape(rows, columns, TILE, TILE, *tiles.shape[2:]).swapaxes(1, 2)
+    return image.reshape(rows * TILE, columns * TILE, *tiles.shape[2:])[:height, :width]
+
+
+def _ground(location, rays):
+    """Hit distance and colour of the y = 0 grid plane for every ray."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = -location[1] / rays[..., 1]
+    t = np.where(np.isfinite(t) & (t > 0.0), t, np.inf)
+    hit = np.isfinite(t)
+    points = location + np.where(hit, t, 0.0)[..., None] * rays
+
+    def on_line(coordinate):
+        phase = np.mod(coordinate / GRID_SPACING, 1.0)
+        return (phase < GRID_HALF_LINE) | (phase > 1.0 - GRID_HALF_LINE)
+
+    # Fading distant lines avoids moire where they get thinner than a pixel
+    line = on_line(points[..., 0]) | on_line(points[..., 2])
+    near, far = GRID_FADE
+    weight = line * np.clip((far - t) / (far - near), 0.0, 1.0)
+    color = GROUND_COLOR + weight[..., None] * (GRID_COLOR - GROUND_COLOR)
+    return t, color
+
+
+def _to_uint8(color: np.ndarray) -> np.ndarray:
+    return (np.clip(color, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=16)
+def _view(camera_position: tuple, look_at: tuple, sky: tuple, width: int, height: int):
+    """
+    Camera, primary rays (also grouped by tile) and background image for one
+    view (read-only).
+    """
+    camera = camera_basis(camera_position, look_at, width, height, sky)
+    rays = primary_rays(*camera[1:], width, height)
+    tile_rays = _to_tiles(rays)
+    ground_depth, ground_color = _ground(camera[0], rays)
+    background = _to_uint8(
+        np.where(np.isfinite(ground_depth)[..., None], ground_color, BACKGROUND_COLOR)
+    )
+    for array in (rays, tile_rays, ground_depth, ground_color, background):
+        array.flags.writeable = False
+    return camera, rays, tile_rays, ground_depth, ground_color, background
+
+
+def rasterize_rods(
+    start_points: np.ndarray,
+    end_points: np.ndarray,
+    radii: np.ndarray,
+    width: int = 800,
+    height: int = 600,
+    camera_position=(0.6, 0.7, -0.9),
+    look_at=(0.0, 0.0, 0.0),
+    light_position=(2.0, 4.0, -3.0),
+    sky=(0.0, 1.0, 0.0),
+) -> np.ndarray:
+    """
+    Render rods as shaded cylinders.
+
+    Args:
+        start_points: (N, 3) start point of each rod
+        end_points: (N, 3) end point of each rod
+        radii: (N,) radius of each rod
+        width: Image width in pixels
+        height: Image height in pixels
+        camera_position: Location of the camera
+        look_at: Point the camera is aimed at
+        light_position: Location of the point light
+        sky: Up direction of the camera
+
+    Returns:
+        (height, width, 3) uint8 array
+    """
+    start_points = as_point_array(start_points)
+    end_points = as_point_array(end_points)
+    radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+
+    camera, rays, tile_rays, ground_depth, ground_color, background = _view(
+        tuple(map(float, camera_position)),
+        tuple(map(float, look_at)),
+        tuple(map(float, sky)),
+        int(width),
+        int(height),
+    )
+    location = camera[0]
+
+    # z-buffer pass: nearest cylinder hit per pixel. Each rod is binned into
+    # the TILE x TILE tiles its projection may overlap, and all (rod, tile)
+    # pairs are intersected together, a batch of pairs at a time.
+    depth = np.full(tile_rays.shape[0] * TILE * TILE, np.inf)
+    nearest = np.zeros(depth.shape, dtype=np.int64)
+    parts = np.zeros(depth.shape, dtype=np.int8)
+    bounds = _screen_bounds(start_points, end_points, radii, camera, width, height)
+    capsules = _screen_capsules(start_points, end_points, radii, camera, width, height)
+    rods = np.flatnonzero(
+        (bounds[:, 0] < bounds[:, 1])
+        & (bounds[:, 2] < bounds[:, 3])
+        & (radii > 0.0)
+        & ~np.all(np.isclose(start_points, end_points), axis=1)
+    )
+    rod, tile = _rod_tiles(rods, bounds, capsules, -(-width // TILE))
+    for batch in range(0, len(rod), TILE_BATCH):
+        batch_rod = rod[batch : batch + TILE_BATCH]
+        batch_tile = tile[batch : batch + TILE_BATCH]
+        index, t, part = _intersect_cylinders(
+            location,
+            tile_rays[batch_tile],
+            start_points[batch_rod],
+            end_points[batch_rod],
+            radii[batch_rod],
+        )
+        block, ray = np.divmod(index, TILE * TILE)
+        pixel = batch_tile[block] * (TILE * TILE) + ray
+        before = depth[pixel]
+        np.minimum.at(depth, pixel, t)
+        won = (t == depth[pixel]) & (t < before)
+        # Reversed, so on a tie the first rod's hit is written last and wins
+        won = np.flatnonzero(won)[::-1]
+        nearest[pixel[won]] = batch_rod[block[won]]
+        parts[pixel[won]] = part[won]
+    depth = _from_tiles(depth.reshape(-1, TILE * TILE), height, width)
+    nearest = _from_tiles(nearest.reshape(-1, TILE * TILE), height, width)
+    parts = _from_tiles(parts.reshape(-1, TILE * TILE), height, width)
+
+    # Shading pass over every covered pixel at once
+    hit = np.nonzero(np.isfinite(depth))
+    image = background.copy()
+    t = depth[hit]
+    ray = rays[hit]
+    normal = _cylinder_normals(
+        location, ray, t, parts[hit], start_points, end_points, radii, nearest[hit]
+    )
+    points = location + t[:, None] * ray
+    to_light = np.asarray(light_position, dtype=np.float64) - points
+    to_light /= np.linalg.norm(to_light, axis=-1, keepdims=True)
+    n_dot_l = np.einsum("ni,ni->n", normal, to_light)
+    reflected = 2.0 * n_dot_l[:, None] * normal - to_light
+    r_dot_v = np.clip(-np.einsum("ni,ni->n", reflected, ray), 0.0, None)
+    rod_color = (
+        ROD_COLOR * (AMBIENT + DIFFUSE * np.clip(n_dot_l, 0.0, None))[:, None]
+        + (PHONG * r_dot_v**PHONG_SIZE * (n_dot_l > 0.0))[:, None]
+    )
+
+    # The ground is mostly transparent: rods below it show through, tinted
+    under_ground = (ground_depth[hit] < t)[:, None]
+    image[hit] = _to_uint8(
+        np.where(
+            under_ground,
+            GROUND_TRANSMIT * rod_color + (1.0 - GROUND_TRANSMIT) * ground_color[hit],
+            rod_color,
+        )
+    )
+    return image
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.tool.geometry import as_point_array
+
+
+def render_key(
+    start_points,
+    end_points,
+    radii,
+    width: int,
+    height: int,
+    camera_position,
+    look_at,
+    backend: str = "povray",
+) -> str:
+    """
+    Canonical hash of everything that affects a rendered image.
+
+    Only the drawn geometry (rod end points and radii), the image size, the
+    camera and the backend enter the key, so fields like actuation parameters
+    or actuation groups never cause a re-render. Rods are sorted before
+    hashing because the draw order does not change the picture.
+    """
+    rods = np.hstack(
+        [
+            as_point_array(start_points),
+            as_point_array(end_points),
+            np.asarray(radii, dtype=np.float64).reshape(-1, 1),
+        ]
+    )
+    # Sort rows lexicographically; +0.0 folds -0.0 into 0.0
+    rods = rods[np.lexsort(rods.T[::-1])] + 0.0
+    view = np.array([*camera_position, *look_at, width, height], dtype=np.float64) + 0.0
+
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(rods, dtype="<f8").tobytes())
+    digest.update(b"|")
+    digest.update(np.ascontiguousarray(view, dtype="<f8").tobytes())
+    digest.update(b"|" + backend.encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered PNGs with size-bounded LRU eviction.
+
+    Entries are stored as ``<key>.png`` in ``directory``. The file
+    modification time doubles as the last-access time, so the LRU order
+    survives restarts and is shared by every process using the directory.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = 256 * 1024**2):
+        """
+        Args:
+            directory: Directory to store cached images
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Running size of the directory; other processes sharing it are only
+        # accounted for by the full scan in evict()
+        self._bytes = self._scan_bytes()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def get(self, key: str) -> Path | None:
+        """Return the cached image path for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def fetch(self, key: str, output_file_name: str) -> bool:
+        """Copy the cached image for key to output_file_name. Returns True on a hit."""
+        path = self.get(key)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, output_file_name)
+        except FileNotFoundError:
+            # Evicted by another process between get() and the copy: the
+            # image is rendered after all, so count a miss instead of a hit
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return False
+        return True
+
+    def put(self, key: str, image_file: str) -> None:
+        """Store a rendered image under key and evict old entries if needed."""
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        os.close(fd)
+        shutil.copyfile(image_file, tmp_path)
+        path = self._path(key)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._bytes += size - replaced
+            full = self._bytes > self.max_bytes
+        if full:
+            self.evict()
+
+    def _scan_bytes(self) -> int:
+        total = 0
+        for path in self.directory.glob("*.png"):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self.directory.glob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        with self._lock:
+            self._bytes = total
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.png"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        entries = list(self.directory.glob("*.png"))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(path.stat().st_size for path in entries),
+        }
+
+
+_render_cache: RenderCache | None = None
+
+
+def configure_render_cache(
+    directory: str | Path | None, max_bytes: int = 256 * 1024**2
+) -> RenderCache | None:
+    """Set (or, with directory=None, disable) the cache used by render_design."""
+    global _render_cache
+    _render_cache = None if directory is None else RenderCache(directory, max_bytes)
+    return _render_cache
+
+
+def get_render_cache() -> RenderCache | None:
+    return _render_cache
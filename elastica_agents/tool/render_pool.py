@@ -0,0 +1,320 @@
+import asyncio
+import atexit
+import dataclasses
+import json
+import os
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from elastica_agents.design_schema import Point3D, RobotDesignSchema
+from elastica_agents.tool.geometry import RodGeometry
+from elastica_agents.tool.render_cache import get_render_cache, render_key
+from elastica_agents.tool.rendering import (
+    DEFAULT_CAMERA_POSITION,
+    DEFAULT_LOOK_AT,
+    RenderBackend,
+    render_image,
+    render_views,
+    resolve_backend,
+    save_image,
+    view_cameras,
+)
+from elastica_agents.tracing import current_span
+
+
+@dataclass
+class RenderJob:
+    """A single image to render: rod geometry plus image and camera settings.
+
+    If ``output_file_name`` is None the rendered image is returned as an array
+    instead of being written to disk. With ``views``, the camera settings are
+    ignored and the named views (see rendering.VIEWS) are tiled into one image.
+    """
+
+    start_points: list[Point3D]
+    end_points: list[Point3D]
+    radii: list[float]
+    output_file_name: str | None = None
+    width: int = 800
+    height: int = 600
+    camera_position: tuple[float, float, float] = DEFAULT_CAMERA_POSITION
+    look_at: tuple[float, float, float] = DEFAULT_LOOK_AT
+    backend: RenderBackend = "auto"
+    views: tuple[str, ...] | None = None
+
+    @property
+    def geometry(self) -> RodGeometry:
+        return RodGeometry.from_points(self.start_points, self.end_points, self.radii)
+
+    def cache_key(self) -> str:
+        """Render cache key; the same as render_geometry(_views) would use."""
+        geometry = self.geometry
+        camera_position, look_at = self.camera_position, self.look_at
+        if self.views is not None:
+            cameras = view_cameras(geometry, list(self.views))
+            camera_position = np.ravel([camera[0] for camera in cameras])
+            look_at = np.ravel([camera[1:] for camera in cameras])
+        return render_key(
+            geometry.start_points,
+            geometry.end_points,
+            geometry.radii,
+            self.width,
+            self.height,
+            camera_position,
+            look_at,
+            resolve_backend(self.backend),
+        )
+
+    @classmethod
+    def from_design(cls, design: RobotDesignSchema, **kwargs) -> "RenderJob":
+        return cls(
+            start_points=[actuator.start_point for actuator in design.actuators],
+            end_points=[actuator.end_point for actuator in design.actuators],
+            radii=[actuator.radius for actuator in design.actuators],
+            **kwargs,
+        )
+
+    def with_camera(
+        self,
+        camera_position: tuple[float, float, float],
+        look_at: tuple[float, float, float] = DEFAULT_LOOK_AT,
+        output_file_name: str | None = None,
+    ) -> "RenderJob":
+        """Same geometry seen from another camera."""
+        return dataclasses.replace(
+            self,
+            camera_position=camera_position,
+            look_at=look_at,
+            output_file_name=output_file_name,
+        )
+
+
+# Per-process state of a render worker
+_scratch_dir: str | None = None
+
+
+def _init_worker(scratch_dir: str) -> None:
+    global _scratch_dir
+    _scratch_dir = scratch_dir
+
+    # Pay the import cost once per worker instead of once per image
+    import PIL.Image  # noqa: F401
+
+
+def _noop() -> None:
+    return None
+
+
+def _run_job(job: RenderJob) -> str | np.ndarray:
+    if job.views is not None:
+        image = render_views(
+            job.geometry,
+            width=job.width,
+            height=job.height,
+            views=list(job.views),
+            backend=job.backend,
+        )
+    else:
+        image = render_image(
+            job.geometry,
+            width=job.width,
+            height=job.height,
+            camera_position=job.camera_position,
+            look_at=job.look_at,
+            backend=job.backend,
+            scratch_dir=_scratch_dir,
+        )
+    if job.output_file_name is None:
+        return image
+    save_image(image, job.output_file_name)
+    return job.output_file_name
+
+
+class RenderPool:
+    """
+    Pool of warm rendering worker processes.
+
+    Each job still runs one POV-Ray process (vapory has no resident mode), but
+    the Python side of the workers is started once and reused, and independent
+    jobs are rendered in parallel across cores.
+
+    Example:
+        with RenderPool() as pool:
+            for index, path in pool.render(jobs):
+                ...
+    """
+
+    def __init__(self, max_workers: int | None = None, warm: bool = True):
+        """
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count)
+            warm: Start all workers immediately instead of on first use
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._scratch = tempfile.TemporaryDirectory(prefix="elastica-render-")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self._scratch.name,),
+        )
+        if warm:
+            self.warmup()
+
+    def warmup(self) -> None:
+        """Spawn every worker process and wait until they are ready."""
+        futures = [self._executor.submit(_noop) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, job: RenderJob) -> Future:
+        job = dataclasses.replace(job, backend=resolve_backend(job.backend))
+        return self._executor.submit(_run_job, job)
+
+    def _lookup(self, job: RenderJob) -> tuple[str | None, str | np.ndarray | None]:
+        """Return (cache key, cached result or None)."""
+        cache = get_render_cache()
+        if cache is None:
+            return None, None
+        key = job.cache_key()
+        if job.output_file_name is None:
+            path = cache.get(key)
+            if path is None:
+                return key, None
+            from PIL import Image as PILImage
+
+            return key, np.asarray(PILImage.open(path).convert("RGB"))
+        if cache.fetch(key, job.output_file_name):
+            return key, job.output_file_name
+        return key, None
+
+    def _store(self, key: str | None, result: str | np.ndarray) -> None:
+        cache = get_render_cache()
+        if cache is None or key is None:
+            return
+        if isinstance(result, np.ndarray):
+            fd, path = tempfile.mkstemp(suffix=".png", dir=self._scratch.name)
+            os.close(fd)
+            try:
+                save_image(result, path)
+                cache.put(key, path)
+            finally:
+                os.remove(path)
+        else:
+            cache.put(key, result)
+
+    def _submit_all(self, jobs: Iterable[RenderJob]):
+        hits = []
+        futures = {}
+        for index, job in enumerate(jobs):
+            key, cached = self._lookup(job)
+            if cached is not None:
+                hits.append((index, cached))
+            else:
+                futures[self.submit(job)] = (index, key)
+        return hits, futures
+
+    def render(
+        self, jobs: Iterable[RenderJob]
+    ) -> Iterator[tuple[int, str | np.ndarray]]:
+        """
+        Render jobs in parallel and yield results as they complete.
+
+        Jobs found in the render cache are yielded first without rendering.
+
+        Yields:
+            (index of the job, output path or image array)
+        """
+        hits, futures = self._submit_all(jobs)
+        yield from hits
+        for future in as_completed(futures):
+            index, key = futures[future]
+            result = future.result()
+            self._store(key, result)
+            yield index, result
+
+    async def render_async(self, job: RenderJob) -> str | np.ndarray:
+        """
+        Render one job in the pool without blocking the event loop.
+
+        Returns:
+            Output path, or the image array if the job has no output file
+        """
+        key, cached = self._lookup(job)
+        if (span := current_span()) is not None and key is not None:
+            span.set(cache="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+        result = await asyncio.wrap_future(self.submit(job))
+        self._store(key, result)
+        return result
+
+    def render_all(self, jobs: Iterable[RenderJob]) -> list[str | np.ndarray]:
+        """Render jobs in parallel and return results in submission order."""
+        results = dict(self.render(jobs))
+        return [results[index] for index in range(len(results))]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._scratch.cleanup()
+
+    def __enter__(self) -> "RenderPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_shared_pool: RenderPool | None = None
+
+
+def get_render_pool() -> RenderPool:
+    """Process-wide render pool, created on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = RenderPool()
+        atexit.register(_shared_pool.close)
+    return _shared_pool
+
+
+def render_designs(
+    design_files: list[str],
+    output_dir: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> list[str]:
+    """
+    Render several design.json files in parallel.
+
+    Args:
+        design_files: Paths to design.json files
+        output_dir: Directory to save the rendered images. Each image is named
+            after its design file, e.g. design_3.json -> design_3.png
+        width: Image width in pixels
+        height: Image height in pixels
+        backend: Rendering backend, see render_design
+
+    Returns:
+        Paths of the rendered images, in the same order as design_files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    for design_file in design_files:
+        with open(design_file, "r") as f:
+            design = RobotDesignSchema.model_validate(json.load(f))
+        stem = os.path.splitext(os.path.basename(design_file))[0]
+        jobs.append(
+            RenderJob.from_design(
+                design,
+                output_file_name=os.path.join(output_dir, f"{stem}.png"),
+                width=width,
+                height=height,
+                backend=backend,
+            )
+        )
+
+    return get_render_pool().render_all(jobs)
@@ -0,0 +1,91 @@
+"""
+Rendering tools of the rendering_agent.
+
+Same names and arguments as rendering.render_design and render_design_views,
+but the image is rendered by the shared RenderPool and awaited, so a render
+neither pays worker startup again nor blocks the event loop (and with it the
+other agents and design candidates) while POV-Ray runs.
+"""
+
+from elastica_agents.design_schema import Point3D
+from elastica_agents.tool.render_pool import RenderJob, get_render_pool
+from elastica_agents.tool.rendering import VIEWS, RenderBackend, resolve_backend
+from elastica_agents.tracing import span
+
+
+async def render_design(
+    start_points: list[Point3D],
+    end_points: list[Point3D],
+    radii: list[float],
+    output_file_name: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> None:
+    """
+    Render the robot design using Vapory.
+
+    Args:
+        start_points: List of start points for each rod
+        end_points: List of end points for each rod
+        radii: List of radii for each rod
+        output_file_name: Name of the file to save the rendered image
+        width: Image width in pixels
+        height: Image height in pixels
+        backend: "povray" ray traces the scene, "numpy" is a fast rasterizer
+            that does not need POV-Ray, "auto" uses POV-Ray if it is installed
+
+    Returns:
+        None
+    """
+    job = RenderJob(
+        start_points,
+        end_points,
+        radii,
+        output_file_name=output_file_name,
+        width=width,
+        height=height,
+        backend=resolve_backend(backend),
+    )
+    with span("render", "render_geometry", backend=job.backend):
+        await get_render_pool().render_async(job)
+
+
+async def render_design_views(
+    start_points: list[Point3D],
+    end_points: list[Point3D],
+    radii: list[float],
+    output_file_name: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> None:
+    """
+    Render the robot design from the front, side, top and an isometric view,
+    tiled into one labelled image.
+
+    Args:
+        start_points: List of start points for each rod
+        end_points: List of end points for each rod
+        radii: List of radii for each rod
+        output_file_name: Name of the file to save the rendered image
+        width: Width of the tiled image in pixels
+        height: Height of the tiled image in pixels
+        backend: "povray" ray traces the scene, "numpy" is a fast rasterizer
+            that does not need POV-Ray, "auto" uses POV-Ray if it is installed
+
+    Returns:
+        None
+    """
+    job = RenderJob(
+        start_points,
+        end_points,
+        radii,
+        output_file_name=output_file_name,
+        width=width,
+        height=height,
+        backend=resolve_backend(backend),
+        views=tuple(VIEWS),
+    )
+    with span("render", "render_geometry_views", backend=job.backend):
+        await get_render_pool().render_async(job)
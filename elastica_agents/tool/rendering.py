@@ -1,13 +1,25 @@
 import importlib.resources
+import math
 import os
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
 
 import numpy as np
 import vapory
+from vapory.config import POVRAY_BINARY
 
 from elastica_agents.design_schema import (
     Point3D,
 )
+from elastica_agents.tool.geometry import RodGeometry
+from elastica_agents.tool.rasterizer import rasterize_rods
+from elastica_agents.tool.render_cache import get_render_cache, render_key
+from elastica_agents.tracing import span
+
+RenderBackend = Literal["auto", "povray", "numpy"]
 
 
 class PVGeometry(ABC):
@@ -19,93 +31,106 @@ class PVGeometry(ABC):
         pass
 
 
-class PVRod(PVGeometry):
-    def __init__(self, start_point: Point3D, end_point: Point3D, radius: float):
-        self.start_point = [start_point.x, start_point.y, start_point.z]
-        self.end_point = [end_point.x, end_point.y, end_point.z]
-        self.radius = radius
+class PVRods(PVGeometry):
+    """
+    Every rod of a RodGeometry as one block of POV-Ray cylinders.
 
-    def __call__(self):
-        return vapory.Cylinder(
-            self.start_point,
-            self.end_point,
-            self.radius,
-            self.texture,
+    The SDL is formatted straight from the arrays, so no per-rod vapory
+    objects are created. The shared texture is declared once in the scene
+    (see ``declaration``) and referenced by name.
+    """
+
+    texture_name = "ElasticaRodTexture"
+
+    def __init__(self, geometry: RodGeometry):
+        self.geometry = geometry
+
+    @classmethod
+    def declaration(cls) -> str:
+        return f"{cls.texture_name} = {cls.texture}"
+
+    def __call__(self) -> str:
+        rows = np.hstack(
+            [
+                self.geometry.start_points,
+                self.geometry.end_points,
+                self.geometry.radii[:, None],
+            ]
         )
+        cylinder = (
+            "cylinder { <%.17g,%.17g,%.17g>, <%.17g,%.17g,%.17g>, %.17g "
+            "texture { " + self.texture_name + " } }"
+        )
+        return "\n".join(map(cylinder.__mod__, map(tuple, rows.tolist())))
 
-        # FIXME: Probably need more points
-        # return vapory.SphereSweep(
-        #     "linear_rod",
-        #     2,
-        #     self.start_point,
-        #     self.radius,
-        #     self.end_point,
-        #     self.radius,
-        #     self.texture,
-        # )
 
+# Camera settings
+DEFAULT_CAMERA_POSITION = (0.6, 0.7, -0.9)
+DEFAULT_LOOK_AT = (0.0, 0.0, 0.0)
+DEFAULT_SKY = (0.0, 1.0, 0.0)
+LIGHT_POSITION = (2, 4, -3)
 
-def render_design(
-    start_points: list[Point3D],
-    end_points: list[Point3D],
-    radii: list[float],
-    output_file_name: str,
-    width: int = 800,
-    height: int = 600,
-) -> None:
+# Multi-view cameras: (direction from the design towards the camera, sky)
+VIEWS = {
+    "front": ((0.0, 0.0, -1.0), (0.0, 1.0, 0.0)),
+    "side": ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0)),
+    "top": ((0.0, 1.0, 0.0), (0.0, 0.0, 1.0)),
+    "isometric": ((1.0, 1.0, -1.0), (0.0, 1.0, 0.0)),
+}
+
+
+def make_camera(
+    camera_position=DEFAULT_CAMERA_POSITION,
+    look_at=DEFAULT_LOOK_AT,
+    sky=DEFAULT_SKY,
+) -> vapory.Camera:
+    # angle = 30
+    return vapory.Camera(
+        "location", list(camera_position), "sky", list(sky), "look_at", list(look_at)
+    )  # , "angle", 30)
+
+
+def build_scene(
+    geometry: RodGeometry,
+    camera_position=DEFAULT_CAMERA_POSITION,
+    look_at=DEFAULT_LOOK_AT,
+    sky=DEFAULT_SKY,
+) -> vapory.Scene:
     """
-    Render the robot design using Vapory.
+    Build the POV-Ray scene for a set of rods.
 
     Args:
-        start_points: List of start points for each rod
-        end_points: List of end points for each rod
-        radii: List of radii for each rod
-        output_file_name: Name of the file to save the rendered image
-        width: Image width in pixels
-        height: Image height in pixels
+        geometry: Rods to draw
+        camera_position: Location of the camera
+        look_at: Point the camera is aimed at
+        sky: Up direction of the camera
 
     Returns:
-        None
+        vapory.Scene
     """
-    rods = []
-    for start_point, end_point, radius in zip(start_points, end_points, radii):
-        rod = PVRod(
-            start_point=start_point,
-            end_point=end_point,
-            radius=radius,
-        )
-        rods.append(rod)
-
     background_path = str(
         importlib.resources.files("elastica_agents") / "tool" / "povray_background.inc"
     )
-    light = vapory.LightSource([2, 4, -3], "color", [1, 1, 1])
+    light = vapory.LightSource(list(LIGHT_POSITION), "color", [1, 1, 1])
 
-    # Camera settings
-    camera_position = [0.6, 0.7, -0.9]
-    look_at = [0.0, 0.0, 0.0]
-    # angle = 30
-    camera = vapory.Camera(
-        "location", camera_position, "look_at", look_at
-    )  # , "angle", 30)
+    camera = make_camera(camera_position, look_at, sky)
 
-    objects = [light]
-    for rod in rods:
-        objects.append(rod())
-
-        # text_label = Text(
-        #     "ttf",
-        #     '"timrom.ttf"',
-        #     f'"{actuator.id}"',
-        #     0.1,
-        #     0.0,
-        #     "scale",
-        #     [0.5, 0.5, 0.5],
-        #     "translate",
-        #     text_position,
-        #     Texture(Pigment("color", [0, 0, 0])),
-        # )
-        # objects.append(text_label)
+    objects = [light, PVRods(geometry)()]
+
+    # for actuator in design_schema.actuators:
+    #     text_label = Text(
+    #         "ttf",
+    #         '"timrom.ttf"',
+    #         f'"{actuator.id}"',
+    #         0.1,
+    #         0.0,
+    #         "scale",
+    #         [0.5, 0.5, 0.5],
+    #         "translate",
+    #         text_position,
+    #         Texture(Pigment("color", [0, 0, 0])),
+    #     )
+    #     objects.append(text_label)
 
     # Render connections
     # for connection in design_schema.connections:
@@ -120,14 +145,338 @@ def render_design(
     #         objects.append(connection_box)
 
     # Create the scene
-    scene = vapory.Scene(camera, objects=objects, included=[background_path])
+    return vapory.Scene(
+        camera,
+        objects=objects,
+        included=[background_path],
+        declares=[PVRods.declaration()],
+    )
 
-    # Render
-    image = scene.render(width=width, height=height, antialiasing=0.01)
 
+def render_scene(
+    scene: vapory.Scene,
+    width: int = 800,
+    height: int = 600,
+    scratch_dir: str | None = None,
+) -> np.ndarray:
+    """
+    Ray trace a scene with POV-Ray and return the image as an array.
+
+    Args:
+        scene: Scene to render
+        width: Image width in pixels
+        height: Image height in pixels
+        scratch_dir: Directory for the intermediate .pov file. vapory defaults
+            to ``__temp__.pov`` in the current directory, which is not safe
+            when several renders run at once.
+
+    Returns:
+        (height, width, 3) uint8 array
+    """
+    fd, pov_file = tempfile.mkstemp(suffix=".pov", dir=scratch_dir)
+    os.close(fd)
+    try:
+        return scene.render(
+            width=width, height=height, antialiasing=0.01, tempfile=pov_file
+        )
+    finally:
+        if os.path.exists(pov_file):
+            os.remove(pov_file)
+
+
+def resolve_backend(backend: RenderBackend = "auto") -> str:
+    """Pick POV-Ray when it is installed, otherwise the NumPy rasterizer."""
+    if backend == "auto":
+        return "povray" if shutil.which(POVRAY_BINARY) else "numpy"
+    if backend not in ("povray", "numpy"):
+        raise ValueError(f"Invalid rendering backend {backend}")
+    return backend
+
+
+def render_image(
+    geometry: RodGeometry,
+    width: int = 800,
+    height: int = 600,
+    camera_position=DEFAULT_CAMERA_POSITION,
+    look_at=DEFAULT_LOOK_AT,
+    backend: RenderBackend = "auto",
+    scratch_dir: str | None = None,
+    sky=DEFAULT_SKY,
+) -> np.ndarray:
+    """Render rods with the selected backend and return the image as an array."""
+    if resolve_backend(backend) == "numpy":
+        return rasterize_rods(
+            geometry.start_points,
+            geometry.end_points,
+            geometry.radii,
+            width=width,
+            height=height,
+            camera_position=camera_position,
+            look_at=look_at,
+            light_position=LIGHT_POSITION,
+            sky=sky,
+        )
+
+    scene = build_scene(
+        geometry,
+        camera_position=camera_position,
+        look_at=look_at,
+        sky=sky,
+    )
+    return render_scene(scene, width=width, height=height, scratch_dir=scratch_dir)
+
+
+def save_image(image: np.ndarray, output_file_name: str) -> None:
     from PIL import Image as PILImage
 
     img = PILImage.fromarray(image)
     img.save(output_file_name)
 
+
+def render_geometry(
+    geometry: RodGeometry,
+    output_file_name: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> None:
+    """Render rods from the default camera to output_file_name, using the render cache."""
+    backend = resolve_backend(backend)
+    with span("render", "render_geometry", backend=backend) as current:
+        cache = get_render_cache()
+        if cache is not None:
+            key = render_key(
+                geometry.start_points,
+                geometry.end_points,
+                geometry.radii,
+                width,
+                height,
+                DEFAULT_CAMERA_POSITION,
+                DEFAULT_LOOK_AT,
+                backend,
+            )
+            hit = cache.fetch(key, output_file_name)
+            current.set(cache="hit" if hit else "miss")
+            if hit:
+                return
+
+        # Render
+        image = render_image(geometry, width=width, height=height, backend=backend)
+
+        save_image(image, output_file_name)
+        if cache is not None:
+            cache.put(key, output_file_name)
+
+
+def render_design(
+    start_points: list[Point3D],
+    end_points: list[Point3D],
+    radii: list[float],
+    output_file_name: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> None:
+    """
+    Render the robot design using Vapory.
+
+    Args:
+        start_points: List of start points for each rod
+        end_points: List of end points for each rod
+        radii: List of radii for each rod
+        output_file_name: Name of the file to save the rendered image
+        width: Image width in pixels
+        height: Image height in pixels
+        backend: "povray" ray traces the scene, "numpy" is a fast rasterizer
+            that does not need POV-Ray, "auto" uses POV-Ray if it is installed
+
+    Returns:
+        None
+    """
+    geometry = RodGeometry.from_points(start_points, end_points, radii)
+    render_geometry(
+        geometry, output_file_name, width=width, height=height, backend=backend
+    )
+
     # return image
+
+
+def view_cameras(
+    geometry: RodGeometry, views: list[str]
+) -> list[tuple[tuple, tuple, tuple]]:
+    """
+    Cameras that frame the whole design from each named view.
+
+    The camera is never closer than the default single-view camera, so small
+    designs keep the same scale as in render_design.
+
+    Returns:
+        List of (camera_position, look_at, sky)
+    """
+    center, extent = geometry.bounding_sphere()
+    # Vertical half field of view of the default POV-Ray camera is atan(0.5)
+    distance = max(
+        float(np.linalg.norm(np.subtract(DEFAULT_CAMERA_POSITION, DEFAULT_LOOK_AT))),
+        1.1 * extent / math.sin(math.atan(0.5)),
+    )
+
+    cameras = []
+    for view in views:
+        if view not in VIEWS:
+            raise ValueError(f"Invalid view {view}, choose from {list(VIEWS)}")
+        direction, sky = VIEWS[view]
+        direction = np.asarray(direction) / np.linalg.norm(direction)
+        camera_position = tuple(center + distance * direction)
+        cameras.append((camera_position, tuple(center), sky))
+    return cameras
+
+
+def tile_images(
+    images: list[np.ndarray], labels: list[str] | None = None
+) -> np.ndarray:
+    """Arrange equally sized images in a grid, optionally labelling each tile."""
+    from PIL import Image as PILImage, ImageDraw
+
+    columns = math.ceil(math.sqrt(len(images)))
+    rows = math.ceil(len(images) / columns)
+    height, width = images[0].shape[:2]
+    canvas = np.full((rows * height, columns * width, 3), 255, dtype=np.uint8)
+    for index, image in enumerate(images):
+        row, column = divmod(index, columns)
+        canvas[
+            row * height : (row + 1) * height, column * width : (column + 1) * width
+        ] = image
+
+    if labels:
+        canvas_image = PILImage.fromarray(canvas)
+        draw = ImageDraw.Draw(canvas_image)
+        for index, label in enumerate(labels):
+            row, column = divmod(index, columns)
+            draw.text((column * width + 6, row * height + 4), label, fill=(0, 0, 0))
+        canvas = np.asarray(canvas_image)
+    return canvas
+
+
+def render_views(
+    geometry: RodGeometry,
+    width: int = 800,
+    height: int = 600,
+    views: list[str] = ("front", "side", "top", "isometric"),
+    backend: RenderBackend = "auto",
+) -> np.ndarray:
+    """
+    Render several views of the same rods concurrently and tile them.
+
+    Each tile gets an equal share of width x height, so the tiled image costs
+    about as much as a single full-size render.
+    """
+    views = list(views)
+    backend = resolve_backend(backend)
+    columns = math.ceil(math.sqrt(len(views)))
+    rows = math.ceil(len(views) / columns)
+    tile_width, tile_height = width // columns, height // rows
+
+    cameras = view_cameras(geometry, views)
+    if backend == "numpy":
+
+        def render_view(camera):
+            camera_position, look_at, sky = camera
+            return rasterize_rods(
+                geometry.start_points,
+                geometry.end_points,
+                geometry.radii,
+                width=tile_width,
+                height=tile_height,
+                camera_position=camera_position,
+                look_at=look_at,
+                light_position=LIGHT_POSITION,
+                sky=sky,
+            )
+
+    else:
+        # Build the rods once and only swap the camera per view
+        scene = build_scene(geometry)
+
+        def render_view(camera):
+            view_scene = vapory.Scene(
+                make_camera(*camera),
+                objects=scene.objects,
+                included=scene.included,
+                declares=scene.declares,
+            )
+            return render_scene(view_scene, width=tile_width, height=tile_height)
+
+    with ThreadPoolExecutor(max_workers=len(views)) as executor:
+        images = list(executor.map(render_view, cameras))
+
+    return tile_images(images, labels=views)
+
+
+def render_geometry_views(
+    geometry: RodGeometry,
+    output_file_name: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> None:
+    """Render the tiled multi-view image of rods to output_file_name, using the render cache."""
+    views = list(VIEWS)
+    backend = resolve_backend(backend)
+    with span("render", "render_geometry_views", backend=backend) as current:
+        cache = get_render_cache()
+        if cache is not None:
+            cameras = view_cameras(geometry, views)
+            key = render_key(
+                geometry.start_points,
+                geometry.end_points,
+                geometry.radii,
+                width,
+                height,
+                np.ravel([camera[0] for camera in cameras]),
+                np.ravel([camera[1:] for camera in cameras]),
+                backend,
+            )
+            hit = cache.fetch(key, output_file_name)
+            current.set(cache="hit" if hit else "miss")
+            if hit:
+                return
+
+        image = render_views(
+            geometry, width=width, height=height, views=views, backend=backend
+        )
+
+        save_image(image, output_file_name)
+        if cache is not None:
+            cache.put(key, output_file_name)
+
+
+def render_design_views(
+    start_points: list[Point3D],
+    end_points: list[Point3D],
+    radii: list[float],
+    output_file_name: str,
+    width: int = 800,
+    height: int = 600,
+    backend: RenderBackend = "auto",
+) -> None:
+    """
+    Render the robot design from the front, side, top and an isometric view,
+    tiled into one labelled image.
+
+    Args:
+        start_points: List of start points for each rod
+        end_points: List of end points for each rod
+        radii: List of radii for each rod
+        output_file_name: Name of the file to save the rendered image
+        width: Width of the tiled image in pixels
+        height: Height of the tiled image in pixels
+        backend: "povray" ray traces the scene, "numpy" is a fast rasterizer
+            that does not need POV-Ray, "auto" uses POV-Ray if it is installed
+
+    Returns:
+        None
+    """
+    geometry = RodGeometry.from_points(start_points, end_points, radii)
+    render_geometry_views(
+        geometry, output_file_name, width=width, height=height, backend=backend
+    )
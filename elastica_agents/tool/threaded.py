@@ -0,0 +1,29 @@
+"""
+Run blocking agent tools off the event loop.
+
+mcp-agent calls a synchronous tool function directly on the event loop, so a
+design check or workspace estimate stalls every other agent and design
+candidate until it returns. threaded_tool wraps such a function in a
+coroutine that runs it with asyncio.to_thread; name, docstring and signature
+are kept, so the agent sees the same tool.
+
+Example:
+    Agent(name="design_agent", functions=[threaded_tool(check_design_file)])
+"""
+
+import asyncio
+import functools
+from typing import Awaitable, Callable, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def threaded_tool(function: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """Coroutine version of function that runs it in a worker thread."""
+
+    @functools.wraps(function)
+    async def tool(*args: P.args, **kwargs: P.kwargs) -> R:
+        return await asyncio.to_thread(function, *args, **kwargs)
+
+    return tool
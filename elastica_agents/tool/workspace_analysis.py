@@ -0,0 +1,52 @@
+import json
+
+from pydantic import ValidationError
+
+from elastica_agents.design_checks import check_design
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation.workspace import estimate_workspace
+from elastica_agents.tool.bulk_validation import format_validation_error
+
+
+def analyze_workspace(design_file: str) -> str:
+    """
+    Measure what a design can reach by sampling its actuation groups (each
+    activated between 0 and 1) with a fast constant-curvature model.
+
+    Args:
+        design_file: Path to the design.json file
+
+    Returns:
+        JSON with the reachable volume of the free rod tips, the number of
+        occupied voxels, and per tip its bounding box, largest displacement
+        from rest and the fraction of directions it can point in. Larger
+        values mean a more capable design.
+    """
+    try:
+        with open(design_file, "rb") as f:
+            design = RobotDesignSchema.model_validate_json(f.read())
+    except ValidationError as e:
+        return json.dumps({"error": format_validation_error(e)})
+
+    workspace = estimate_workspace(design, seed=0)
+    return json.dumps(workspace.summary([actuator.id for actuator in design.actuators]))
+
+
+def design_score(design_file) -> float:
+    """
+    Deterministic fitness of a design file for ranking design candidates.
+
+    Returns:
+        -inf for a missing or invalid file, minus the number of consistency
+        errors for an inconsistent design, otherwise the reachable volume of
+        its free rod tips
+    """
+    try:
+        with open(design_file, "rb") as f:
+            design = RobotDesignSchema.model_validate_json(f.read())
+    except (OSError, ValidationError):
+        return float("-inf")
+    errors = sum(issue.severity == "error" for issue in check_design(design))
+    if errors:
+        return -float(errors)
+    return estimate_workspace(design, seed=0).volume
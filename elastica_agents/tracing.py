@@ -0,0 +1,223 @@
+"""
+Span-based tracing of agent runs.
+
+Every planner call, agent call, LLM request, tool invocation and render is
+wrapped in a span that records its latency and attributes (prompt and
+completion tokens, cache hits, retries, time spent queueing for a scheduler
+slot). Spans nest through a context variable, so an agent call is the parent
+of its LLM requests and tool calls. Finished spans are appended as one JSON
+line each to the trace file of the run (logs/trace-<time>.jsonl in the
+workdir); summarize_spans aggregates any number of trace files into hot spots.
+
+Example:
+    configure_tracer(workdir / "logs" / "trace-20260101-120000.jsonl")
+    with span("tool", "render_design") as current:
+        ...
+        current.set(cache="hit")
+"""
+
+import contextvars
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+# Attributes that are summed into every enclosing span as well
+PROPAGATED = ("tokens_in", "tokens_out")
+
+
+class Span:
+    """One timed operation; attributes end up in its trace record."""
+
+    def __init__(self, id: int, parent: "Span | None", kind: str, name: str, attrs):
+        self.id = id
+        self.parent = parent
+        self.kind = kind
+        self.name = name
+        self.attrs = dict(attrs)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration: float | None = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, **counts) -> None:
+        """Increment counters; PROPAGATED ones also in every enclosing span."""
+        for name, value in counts.items():
+            span = self
+            while span is not None:
+                span.attrs[name] = span.attrs.get(name, 0) + value
+                span = span.parent if name in PROPAGATED else None
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._started
+
+    def record(self, run: str) -> dict:
+        return {
+            "run": run,
+            "id": self.id,
+            "parent": self.parent.id if self.parent else None,
+            "kind": self.kind,
+            "name": self.name,
+            "start": round(self.start, 3),
+            "ms": round(self.duration * 1e3, 2),
+            **self.attrs,
+        }
+
+
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "elastica_span", default=None
+)
+
+
+def current_span() -> Span | None:
+    """Innermost open span of the running task or thread, if any."""
+    return _current.get()
+
+
+class Tracer:
+    """Creates spans and appends the finished ones to a JSONL file."""
+
+    def __init__(self, path: str | Path | None = None, run: str | None = None):
+        """
+        Args:
+            path: Trace file; None keeps spans in memory only (not recorded)
+            run: Identifier written with every span (random by default)
+        """
+        self.path = None if path is None else Path(path)
+        self.run = run or uuid.uuid4().hex[:12]
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a")
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attrs) -> Iterator[Span]:
+        current = Span(next(self._ids), _current.get(), kind, name, attrs)
+        token = _current.set(current)
+        try:
+            yield current
+        except BaseException as error:
+            current.set(error=type(error).__name__)
+            raise
+        finally:
+            _current.reset(token)
+            current.finish()
+            self._write(current)
+
+    def _write(self, span: Span) -> None:
+        if self._file is None:
+            return
+        line = json.dumps(span.record(self.run), separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_tracer = Tracer()
+
+
+def configure_tracer(path: str | Path | None, run: str | None = None) -> Tracer:
+    """Record spans to path from now on (None stops recording)."""
+    global _tracer
+    _tracer.close()
+    _tracer = Tracer(path, run)
+    return _tracer
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(kind: str, name: str, **attrs):
+    """Context manager timing an operation with the process-wide tracer."""
+    return _tracer.span(kind, name, **attrs)
+
+
+def load_spans(paths: Iterable[str | Path]) -> list[dict]:
+    """Span records of trace files; directories are searched for trace-*.jsonl."""
+    spans = []
+    for path in map(Path, paths):
+        files = sorted(path.rglob("trace-*.jsonl")) if path.is_dir() else [path]
+        for file in files:
+            with open(file) as lines:
+                spans.extend(json.loads(line) for line in lines if line.strip())
+    return spans
+
+
+def summarize_spans(spans: list[dict]) -> list[dict]:
+    """
+    Statistics per (kind, name), sorted by total self time.
+
+    Self time is a span's duration minus that of its children, so time spent
+    in an agent call is not counted again for its LLM requests and tools.
+    """
+    children = defaultdict(float)
+    for record in spans:
+        if record["parent"] is not None:
+            children[record["run"], record["parent"]] += record["ms"]
+
+    groups = defaultdict(list)
+    for record in spans:
+        groups[record["kind"], record["name"]].append(record)
+
+    rows = []
+    for (kind, name), records in groups.items():
+        ms = np.array([record["ms"] for record in records])
+        self_ms = [
+            max(record["ms"] - children[record["run"], record["id"]], 0.0)
+            for record in records
+        ]
+        rows.append(
+            {
+                "kind": kind,
+                "name": name,
+                "count": len(records),
+                "runs": len({record["run"] for record in records}),
+                "total_ms": float(ms.sum()),
+                "self_ms": float(sum(self_ms)),
+                "mean_ms": float(ms.mean()),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "max_ms": float(ms.max()),
+                "tokens_in": sum(record.get("tokens_in", 0) for record in records),
+                "tokens_out": sum(record.get("tokens_out", 0) for record in records),
+                "cache_hits": sum(record.get("cache") == "hit" for record in records),
+                "retries": sum(record.get("retries", 0) for record in records),
+                "errors": sum("error" in record for record in records),
+            }
+        )
+    return sorted(rows, key=lambda row: row["self_ms"], reverse=True)
+
+
+def format_report(rows: list[dict], top: int | None = None) -> str:
+    """Plain-text table of summarize_spans rows."""
+    header = (
+        f"{'kind':<8} {'name':<28} {'count':>6} {'self s':>9} {'total s':>9} "
+        f"{'mean ms':>9} {'p95 ms':>9} {'tok in':>9} {'tok out':>8} "
+        f"{'hits':>5} {'retry':>5} {'err':>4}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows[:top]:
+        lines.append(
+            f"{row['kind']:<8} {row['name'][:28]:<28} {row['count']:>6} "
+            f"{row['self_ms'] / 1e3:>9.2f} {row['total_ms'] / 1e3:>9.2f} "
+            f"{row['mean_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['tokens_in']:>9} "
+            f"{row['tokens_out']:>8} {row['cache_hits']:>5} {row['retries']:>5} "
+            f"{row['errors']:>4}"
+        )
+    return "\n".join(lines)
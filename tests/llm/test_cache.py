@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import instructor
+import pytest
+from mcp_agent.executor.executor import AsyncioExecutor
+from openai import RateLimitError
+from openai.types.chat import ChatCompletion
+from pydantic import BaseModel
+
+from elastica_agents.llm.cache import (
+    CachedOpenAIAugmentedLLM,
+    CacheMissError,
+    CachingExecutor,
+    LLMCache,
+    configure_llm_cache,
+    get_llm_cache,
+)
+from elastica_agents.llm.scheduler import configure_llm_scheduler
+
+
+class Completions:
+    """Counts calls; named like the OpenAI resource the executor recognizes."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **arguments):
+        self.calls += 1
+        return ChatCompletion.model_validate(
+            {
+                "id": f"call-{self.calls}",
+                "object": "chat.completion",
+                "created": 0,
+                "model": arguments["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "a gripper"},
+                    }
+                ],
+            }
+        )
+
+
+def complete(executor, completions, content="design a gripper"):
+    return asyncio.run(
+        executor.execute(
+            completions.create,
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": content}],
+            tools=None,
+        )
+    )[0]
+
+
+def test_record_then_replay(tmp_path):
+    completions = Completions()
+    executor = CachingExecutor(AsyncioExecutor())
+    try:
+        configure_llm_cache(tmp_path / "llm.sqlite", mode="record")
+        first = complete(executor, completions)
+        second = complete(executor, completions)
+        assert completions.calls == 1 and second == first
+
+        cache = configure_llm_cache(tmp_path / "llm.sqlite", mode="replay")
+        assert complete(executor, completions) == first
+        with pytest.raises(CacheMissError):
+            complete(executor, completions, content="design a snake")
+        assert completions.calls == 1
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    finally:
+        configure_llm_cache(None)
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = LLMCache(tmp_path / "llm.sqlite", ttl=0.0, max_bytes=10)
+    cache.put("a", "12345")
+    assert cache.get("a") is None  # expired
+
+    cache.ttl = None
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    assert cache.get("a") == "12345"
+    cache.put("c", "12345")  # over max_bytes: "b" is least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == cache.get("c") == "12345"
+
+
+def test_structured_extraction_is_rate_limited_and_cached(tmp_path, monkeypatch):
+    class Verdict(BaseModel):
+        confirmed: bool
+
+    response = httpx.Response(429, request=httpx.Request("POST", "http://api"))
+    outcomes = [RateLimitError("slow down", response=response, body=None)]
+
+    def create(**arguments):
+        if outcomes:
+            # instructor reports API errors wrapped in its own exception
+            raise RuntimeError("retries exhausted") from outcomes.pop()
+        return Verdict(confirmed=True)
+
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    monkeypatch.setattr(instructor, "from_openai", lambda *args, **kwargs: client)
+
+    async def generate_str(message, request_params=None):
+        return "VERDICT: CONFIRMED"
+
+    async def select_model(params):
+        return "gpt-4o-mini"
+
+    llm = SimpleNamespace(
+        generate_str=generate_str,
+        get_request_params=lambda params: params,
+        select_model=select_model,
+        context=SimpleNamespace(
+            config=SimpleNamespace(openai=SimpleNamespace(api_key="key", base_url=None))
+        ),
+    )
+    scheduler = configure_llm_scheduler(backoff=0.01)
+    try:
+        configure_llm_cache(tmp_path / "llm.sqlite", mode="record")
+        for _ in range(2):
+            verdict = asyncio.run(
+                CachedOpenAIAugmentedLLM.generate_structured(llm, "judge", Verdict)
+            )
+            assert verdict == Verdict(confirmed=True)
+        assert scheduler.retries == 1
+        assert get_llm_cache().stats()["hits"] == 1
+    finally:
+        configure_llm_cache(None)
+        configure_llm_scheduler()
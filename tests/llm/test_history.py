@@ -0,0 +1,56 @@
+from mcp_agent.workflows.orchestrator.orchestrator_models import (
+    AgentTask,
+    PlanResult,
+    Step,
+    StepResult,
+    TaskWithResult,
+    format_plan_result,
+)
+
+from elastica_agents.llm import history as history_module
+from elastica_agents.llm.history import PlanHistory, estimate_tokens
+
+
+def add_step(plan_result, index, result="x" * 400):
+    task = AgentTask(description=f"task {index}", agent="design_agent")
+    step = StepResult(
+        step=Step(description=f"step {index}", tasks=[task]),
+        task_results=[TaskWithResult(**task.model_dump(), result=result)],
+    )
+    plan_result.add_step_result(step)
+
+
+def test_unbounded_history_matches_format_plan_result():
+    plan_result = PlanResult(objective="design a gripper", step_results=[])
+    history = PlanHistory(plan_result, token_budget=None, recent_steps=100)
+    assert history.render() == format_plan_result(plan_result)
+    for index in range(4):
+        add_step(plan_result, index)
+        assert history.render() == format_plan_result(plan_result)
+
+    plan_result.is_complete, plan_result.result = True, "a gripper"
+    assert history.render() == format_plan_result(plan_result)
+
+
+def test_steps_are_formatted_once_and_compacted_under_budget(monkeypatch):
+    calls = []
+    original = history_module.format_step_result
+
+    def counting(step_result):
+        calls.append(step_result.step.description)
+        return original(step_result)
+
+    monkeypatch.setattr(history_module, "format_step_result", counting)
+    plan_result = PlanResult(objective="design a gripper", step_results=[])
+    history = PlanHistory(plan_result, token_budget=300, recent_steps=2)
+
+    for index in range(30):
+        add_step(plan_result, index)
+        rendered = history.render()
+        assert history.render() is rendered  # cached until the plan changes
+
+    assert calls == [f"step {index}" for index in range(30)]
+    assert history.tokens <= 300
+    assert "step 29" in rendered and "x" * 400 in rendered
+    assert "(summarized)" in rendered and "earlier steps omitted" in rendered
+    assert estimate_tokens(rendered) < estimate_tokens(format_plan_result(plan_result))
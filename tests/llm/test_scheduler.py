@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from elastica_agents.llm.scheduler import PLANNER, WORKER, LLMScheduler, TokenBucket
+
+
+def test_planner_calls_are_granted_slots_first():
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = []
+
+    async def call(name, delay=0.01):
+        await asyncio.sleep(delay)
+        order.append(name)
+
+    async def main():
+        first = asyncio.create_task(scheduler.run(call("first", 0.05)))
+        await asyncio.sleep(0.01)
+        workers = [
+            asyncio.create_task(scheduler.run(call(f"worker {i}"), WORKER))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0)
+        planner = asyncio.create_task(scheduler.run(call("planner"), PLANNER))
+        await asyncio.gather(first, planner, *workers)
+
+    asyncio.run(main())
+    assert order == ["first", "planner", "worker 0", "worker 1"]
+    assert scheduler.active == 0
+
+
+def test_deadline_cancels_the_call_and_frees_its_slot():
+    scheduler = LLMScheduler(max_concurrency=1, timeout=0.05)
+    cancelled = []
+
+    async def hung():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        with pytest.raises(TimeoutError):
+            await scheduler.run(hung())
+        return await scheduler.run(asyncio.sleep(0, result="next"))
+
+    assert asyncio.run(main()) == "next"
+    assert cancelled and scheduler.stats()["timeouts"] == 1
+
+
+def test_rate_limited_requests_are_retried_with_backoff():
+    scheduler = LLMScheduler(rate_limits={"gpt-4o-mini": 600}, backoff=0.01)
+    response = httpx.Response(429, request=httpx.Request("POST", "http://api"))
+    outcomes = [RateLimitError("slow down", response=response, body=None), "done"]
+
+    async def send():
+        return [outcomes.pop(0)]
+
+    assert asyncio.run(scheduler.request("gpt-4o-mini", send)) == ["done"]
+    assert scheduler.retries == 1
+
+
+def test_token_bucket_spaces_out_requests():
+    bucket = TokenBucket(rate=10.0, capacity=1.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
@@ -0,0 +1,144 @@
+import asyncio
+import re
+import threading
+from types import SimpleNamespace
+
+from mcp_agent.agents.agent import Agent
+from mcp_agent.executor.executor import AsyncioExecutor
+from mcp_agent.workflows.llm.augmented_llm import AugmentedLLM
+from mcp_agent.workflows.orchestrator.orchestrator_models import AgentTask, NextStep
+
+from elastica_agents.llm.workflow import ElasticaSynthesizeTeam
+
+
+def make_context():
+    return SimpleNamespace(
+        executor=AsyncioExecutor(), model_selector=None, server_registry=None
+    )
+
+
+class FakeLLM(AugmentedLLM):
+    """Scripted stand-in for an OpenAI-backed agent or planner."""
+
+    def __init__(self, name, context, respond):
+        super().__init__(agent=Agent(name=name), context=context)
+        self.respond = respond
+        self.in_flight = self.peak = 0
+        self.prompts = []
+
+    async def _call(self, message):
+        self.prompts.append(message)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.respond(message)
+
+    async def generate(self, message, request_params=None):
+        return [await self._call(message)]
+
+    async def generate_str(self, message, request_params=None):
+        return str(await self._call(message))
+
+    async def generate_structured(self, message, response_model, request_params=None):
+        return await self._call(message)
+
+
+def candidate_of(message: str) -> int:
+    return int(re.search(r"candidate (\d+) of", message).group(1))
+
+
+def test_best_of_n_prunes_low_scores_and_limits_concurrency():
+    context = make_context()
+    # Candidate k would finish after its k-th iteration
+    planned = {}
+
+    def plan(message):
+        if "Synthesize" in message:
+            return "done"
+        index = candidate_of(message)
+        planned[index] = planned.get(index, 0) + 1
+        return NextStep(
+            description="design",
+            tasks=[AgentTask(description="design it", agent="design_agent")],
+            is_complete=planned[index] > index,
+        )
+
+    scored_on = set()
+
+    def scorer(index, plan_result):
+        scored_on.add(threading.get_ident())
+        return -abs(index - 3)
+
+    planner = FakeLLM("planner", context, plan)
+    designer = FakeLLM("design_agent", context, lambda message: "design.json")
+    team = ElasticaSynthesizeTeam(
+        llm_factory=None,
+        planner=planner,
+        available_llms=[designer],
+        plan_type="iterative",
+        context=context,
+        n_candidates=4,
+        max_concurrency=2,
+        scorer=scorer,
+        prune_after=1,
+    )
+
+    result = asyncio.run(team.execute("design a gripper"))
+
+    # Candidate 3 scores best; the others are pruned before they can finish
+    assert candidate_of(result.objective) == 3 and result.is_complete
+    assert planned == {1: 1, 2: 2, 3: 4, 4: 1}
+    assert designer.peak <= 2 and planner.peak <= 2
+    # The scorer runs off the event loop's thread
+    assert scored_on and threading.get_ident() not in scored_on
+
+
+def pipeline_team(context, evaluations):
+    """Pipeline team whose evaluator answers with evaluations in turn."""
+
+    def plan(message):
+        if "Synthesize" in message:
+            return "done"
+        return NextStep(description="finish", tasks=[], is_complete=True)
+
+    planner = FakeLLM("planner", context, plan)
+    agents = [
+        FakeLLM("design_agent", context, lambda message: "design.json"),
+        FakeLLM("rendering_agent", context, lambda message: "design.png"),
+        FakeLLM("evaluator_agent", context, lambda message: evaluations.pop(0)),
+    ]
+    team = ElasticaSynthesizeTeam(
+        llm_factory=None,
+        planner=planner,
+        available_llms=agents,
+        plan_type="pipeline",
+        context=context,
+    )
+    return team, planner
+
+
+def test_pipeline_follows_verdicts_without_planner():
+    team, planner = pipeline_team(
+        make_context(),
+        ["Too short.\nVERDICT: REJECTED", "Looks good.\n**Verdict**: confirmed"],
+    )
+
+    result = asyncio.run(team.execute("design a gripper"))
+
+    assert planner.prompts == []
+    assert result.is_complete and "Looks good" in result.result
+    assert [step.task_results[0].agent for step in result.step_results] == [
+        "design_agent",
+        "rendering_agent",
+        "evaluator_agent",
+    ] * 2
+
+
+def test_pipeline_asks_planner_without_verdict():
+    team, planner = pipeline_team(make_context(), ["It might work."])
+
+    result = asyncio.run(team.execute("design a gripper"))
+
+    assert result.is_complete and len(result.step_results) == 3
+    assert len(planner.prompts) == 2  # next step, then the synthesis
@@ -0,0 +1,29 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation import actuation_grid, build_simulation, simulate_sweep
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def test_sweep_matches_serial_simulation():
+    with open(DESIGN_FILE, "r") as f:
+        design = RobotDesignSchema.model_validate(json.load(f))
+    actuations = actuation_grid([0.0, 1.0], 2)
+
+    result = simulate_sweep(design, actuations, duration=0.05, max_workers=2)
+
+    assert actuations.shape == (4, 2)
+    assert result.positions.shape == (4, 2, 21, 3) and not result.errors
+    assert np.all(result.timings > 0.0)
+    serial = build_simulation(design, actuation=actuations[3])
+    serial.run(0.05)
+    assert np.allclose(result.tip_positions[3], serial.tip_positions())
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation import build_simulation, get_setup
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def test_setup_maps_design_and_is_cached():
+    design = load_design()
+    setup = get_setup(design)
+
+    assert setup.channels == ["bend_group", "twist_group"]
+    # Both actuators start at the origin, where they are joined and clamped
+    assert setup.joints == [(0, 0, 1, 0)] and setup.bases == [(0, 0)]
+    assert get_setup(load_design()) is setup
+    with pytest.raises(ValueError):
+        setup.curvature([1.0])
+
+
+def test_bending_group_bends_towards_its_direction():
+    design = load_design()
+    rest = build_simulation(design, actuation=[0.0, 0.0])
+    bent = build_simulation(design, actuation=[1.0, 0.0])
+
+    rest.run(0.2)
+    bent.run(0.2)
+
+    shift = bent.tip_positions() - rest.tip_positions()
+    assert np.all(np.isfinite(shift))
+    assert shift[0, 1] > 0.01  # actuator_1 bends along +y
+    assert shift[1, 0] > 0.01  # actuator_2 bends along +x
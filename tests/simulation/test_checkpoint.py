@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation import (
+    SettledStateCache,
+    SimulationSettings,
+    SimulationState,
+    build_simulation,
+    settled_state,
+    simulate_sweep,
+)
+from elastica_agents.simulation.checkpoint import settled_key
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def test_restored_snapshot_continues_exactly(tmp_path):
+    design = load_design()
+    reference = build_simulation(design, actuation=[1.0, 0.5])
+    reference.run(0.03)
+
+    first_half = build_simulation(design, actuation=[1.0, 0.5])
+    first_half.run(0.015)
+    first_half.snapshot().save(tmp_path / "state.npz")
+    state = SimulationState.load(tmp_path / "state.npz")
+    resumed = build_simulation(design, state=state)
+    resumed.run(0.015)
+
+    assert resumed.time == reference.time
+    assert np.array_equal(resumed.tip_positions(), reference.tip_positions())
+
+
+def test_settled_states_are_cached_by_design(tmp_path):
+    design = load_design()
+    settings = SimulationSettings(damping_constant=0.2)
+    cache = SettledStateCache(tmp_path)
+
+    state = settled_state(design, settings, cache=cache, tolerance=1.0)
+    assert settled_state(load_design(), settings, cache=cache, tolerance=1) is state
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    reloaded = settled_state(
+        design, settings, cache=SettledStateCache(tmp_path), tolerance=1.0
+    )
+    assert np.array_equal(reloaded.position, state.position)
+
+    # A warm start ramps actuation in from the settled shape
+    simulation = build_simulation(
+        design, actuation=[1.0, 0.0], settings=settings, state=state
+    )
+    assert simulation.time == state.time
+    assert np.allclose(simulation.tip_positions(), state.position[:, -1])
+    simulation.run(0.02)
+    assert np.all(np.isfinite(simulation.tip_positions()))
+
+
+def test_settle_arguments_are_part_of_the_key():
+    design = load_design()
+    key = settled_key(design)
+
+    assert settled_key(design, SimulationSettings(), max_duration=2.0) == key
+    assert settled_key(design, tolerance=1.0) != key
+    assert settled_key(design, max_duration=1.0) != key
+    assert settled_key(design, check_interval=0.02) != key
+    with pytest.raises(TypeError):
+        settled_key(design, tolerence=1.0)
+
+
+def test_states_that_never_settled_are_not_cached(tmp_path):
+    design = load_design()
+    cache = SettledStateCache(tmp_path)
+
+    state = settled_state(design, cache=cache, max_duration=0.01, tolerance=0.0)
+    assert state.time > 0.0
+    assert len(cache) == 0 and not list(tmp_path.glob("*.npz"))
+
+
+def test_warm_started_sweep_matches_serial_warm_start():
+    design = load_design()
+    result = simulate_sweep(
+        design, [[1.0, 0.0]], duration=0.02, max_workers=1, warm_start=True
+    )
+    serial = build_simulation(design, actuation=[1.0, 0.0], state=settled_state(design))
+    serial.run(0.02)
+    assert not result.errors
+    assert np.allclose(result.tip_positions[0], serial.tip_positions())
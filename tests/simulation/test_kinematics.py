@@ -0,0 +1,80 @@
+import numpy as np
+
+from elastica_agents.design_schema import (
+    Actuator,
+    ActuatorMode,
+    BendingParameter,
+    Connection,
+    Point3D,
+    RobotDesignSchema,
+    RotationMatrix,
+)
+from elastica_agents.simulation.kinematics import preview_kinematics
+
+FRAME = RotationMatrix(d1=(1, 0, 0), d2=(0, 1, 0), d3=(0, 0, 1))
+FLIPPED = RotationMatrix(d1=(1, 0, 0), d2=(0, -1, 0), d3=(0, 0, -1))
+
+
+def bending_rod(name, start, end, orientation=FRAME) -> Actuator:
+    return Actuator(
+        id=name,
+        mode=[ActuatorMode.BENDING],
+        actuation_parameter=[
+            BendingParameter(bending_direction=(0, 1, 0), max_bending_magnitude=1.0)
+        ],
+        start_point=Point3D(x=0, y=0, z=start),
+        end_point=Point3D(x=0, y=0, z=end),
+        radius=0.01,
+        orientation=orientation,
+    )
+
+
+def chain(*actuators) -> RobotDesignSchema:
+    connections = [
+        Connection(
+            actuators=[first.id, second.id], rigid_link_locations=[], orientation=FRAME
+        )
+        for first, second in zip(actuators[:-1], actuators[1:])
+    ]
+    return RobotDesignSchema(
+        actuators=list(actuators), connections=connections, actuation_groups=[]
+    )
+
+
+def arc_tip(curvature: float, length: float) -> np.ndarray:
+    """Tip of a rod along +z bent towards +y with constant curvature."""
+    return (
+        np.array([0.0, (1.0 - np.cos(curvature * length)), np.sin(curvature * length)])
+        / curvature
+    )
+
+
+def test_serial_chain_bends_as_one_arc():
+    design = chain(bending_rod("a", 0.0, 0.5), bending_rod("b", 0.5, 1.0))
+    levels = np.array([0.0, 0.25, 1.0])
+    preview = preview_kinematics(design, np.column_stack([levels, levels]))
+
+    assert preview.centerlines.shape == (3, 2, 11, 3)
+    assert np.allclose(preview.tip_positions[0], [[0, 0, 0.5], [0, 0, 1.0]])
+    assert np.allclose(preview.tip_displacements[0], 0.0)
+    for sample, level in enumerate(levels[1:], start=1):
+        assert np.allclose(preview.tip_positions[sample, 0], arc_tip(level, 0.5))
+        assert np.allclose(preview.tip_positions[sample, 1], arc_tip(level, 1.0))
+        # The frame at the tip turns by the total bending angle about -x
+        angle = level * 1.0
+        d3 = preview.tip_directors[sample, 1, 2]
+        assert np.allclose(d3, [0.0, np.sin(angle), np.cos(angle)])
+
+    # Arc length is preserved
+    segments = np.diff(preview.centerlines[2], axis=1)
+    assert np.allclose(np.linalg.norm(segments, axis=2).sum(axis=1), 0.5, atol=1e-3)
+
+
+def test_child_held_at_its_end_stays_attached():
+    design = chain(bending_rod("a", 0.0, 0.5), bending_rod("b", 1.0, 0.5, FLIPPED))
+    preview = preview_kinematics(design, [[1.0, 1.0]])
+
+    joint = preview.centerlines[0, 0, -1]
+    assert np.allclose(preview.centerlines[0, 1, -1], joint)
+    # b continues a's arc, in the opposite direction of its own tangent
+    assert np.allclose(preview.centerlines[0, 1, 0], arc_tip(1.0, 1.0))
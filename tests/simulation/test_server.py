@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation import build_simulation
+from elastica_agents.simulation.server import (
+    QueueFullError,
+    SimulationService,
+    create_app,
+    create_mcp,
+)
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+@pytest.fixture
+def design_json():
+    with open(DESIGN_FILE, "r") as f:
+        return json.load(f)
+
+
+def test_identical_requests_share_one_job(design_json):
+    service = SimulationService(
+        max_workers=1, executor=ThreadPoolExecutor(max_workers=1)
+    )
+    request = {"design": design_json, "actuation": [1.0, 0.0], "duration": 0.02}
+    with TestClient(create_app(service, mcp=False)) as client:
+        first = client.post("/simulations", json=request)
+        second = client.post("/simulations", json=request)
+        other = client.post("/simulations", json={**request, "actuation": [0.0, 1.0]})
+        assert first.status_code == second.status_code == 202
+        assert not first.json()["coalesced"] and second.json()["coalesced"]
+        assert first.json()["job_id"] == second.json()["job_id"]
+        assert other.json()["job_id"] != first.json()["job_id"]
+
+        job_id = first.json()["job_id"]
+        result = client.get(f"/simulations/{job_id}/result", params={"wait": 60})
+        assert result.status_code == 200
+        assert result.json()["status"] == "done" and result.json()["requests"] == 2
+        assert client.get("/simulations/unknown").status_code == 404
+
+    serial = build_simulation(
+        RobotDesignSchema.model_validate(design_json), actuation=[1.0, 0.0]
+    )
+    serial.run(0.02)
+    assert np.allclose(result.json()["tip_positions"], serial.tip_positions())
+
+
+def test_full_queue_refuses_new_work(design_json):
+    design = RobotDesignSchema.model_validate(design_json)
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    async def scenario():
+        service = SimulationService(max_workers=1, queue_size=1, executor=executor)
+        await service.start()
+        try:
+            service.submit(design, [0.0, 0.0], 0.01)
+            await asyncio.sleep(0.01)  # the worker takes the first job
+            service.submit(design, [0.5, 0.0], 0.01)
+            with pytest.raises(QueueFullError):
+                service.submit(design, [1.0, 0.0], 0.01)
+            # Identical requests never need a queue slot
+            _, coalesced = service.submit(design, [0.5, 0.0], 0.01)
+            assert coalesced and service.stats()["queued"] == 1
+        finally:
+            release.set()
+            await service.stop()
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+
+def test_mcp_tool_rejects_invalid_requests(tmp_path):
+    mcp = create_mcp(SimulationService(max_workers=1))
+    bad_json = tmp_path / "bad.json"
+    bad_json.write_text("{")
+
+    async def simulate(design_file, **kwargs):
+        _, structured = await mcp.call_tool(
+            "simulate_design", {"design_file": str(design_file), **kwargs}
+        )
+        return json.loads(structured["result"])
+
+    async def scenario():
+        too_long = await simulate(DESIGN_FILE, duration=1e9)
+        assert too_long["status"] == "rejected" and "duration" in too_long["error"]
+        assert (await simulate(DESIGN_FILE, duration=0.0))["status"] == "rejected"
+        assert (await simulate(bad_json))["status"] == "rejected"
+        missing = await simulate(tmp_path / "missing.json")
+        assert missing["status"] == "error"
+        assert missing["error"].startswith("FileNotFoundError")
+
+    asyncio.run(scenario())
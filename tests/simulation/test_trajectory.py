@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation import (
+    SimulationSettings,
+    Trajectory,
+    TrajectoryWriter,
+    build_simulation,
+    trajectory_callbacks,
+)
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def test_simulation_streams_trajectory_to_disk(tmp_path):
+    with open(DESIGN_FILE, "r") as f:
+        design = RobotDesignSchema.model_validate(json.load(f))
+    settings = SimulationSettings(n_elements=10)
+
+    with TrajectoryWriter(tmp_path / "run", 2, 10, chunk_steps=4) as writer:
+        simulation = build_simulation(
+            design,
+            actuation=[1.0, 0.0],
+            settings=settings,
+            callbacks=trajectory_callbacks(writer, step_skip=50),
+        )
+        simulation.step(500)
+
+    trajectory = Trajectory(tmp_path / "run")
+
+    # Step 0 plus every 50th of 500 steps
+    assert len(trajectory) == 11
+    assert isinstance(trajectory.positions, np.memmap)
+    assert np.allclose(trajectory.times, np.arange(11) * 50 * settings.time_step)
+    assert np.allclose(trajectory.rod(0)[-1], simulation.rods[0].position_collection.T)
+    directors = np.moveaxis(simulation.rods[1].director_collection, -1, 0)
+    assert np.allclose(trajectory.directors[-1, 1], directors)
+    window = trajectory.window(0.0075, 0.0275)
+    assert trajectory.times[window].tolist() == trajectory.times[2:6].tolist()
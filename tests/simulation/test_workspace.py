@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.simulation import estimate_workspace, preview_kinematics
+from elastica_agents.simulation.workspace import end_rods, voxel_codes, voxel_indices
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def test_voxel_codes_round_trip():
+    points = np.array([[0.0, 0.0, 0.0], [-0.31, 0.42, 1.7], [0.005, -0.005, 0.0]])
+    assert voxel_indices(voxel_codes(points, 0.01)).tolist() == [
+        [0, 0, 0],
+        [-31, 42, 170],
+        [0, -1, 0],
+    ]
+
+
+def test_workspace_covers_sampled_tips_and_converges():
+    design = load_design()
+    workspace = estimate_workspace(design, voxel_size=0.005, batch_size=512, seed=0)
+
+    assert end_rods(design).tolist() == [0, 1]
+    assert workspace.converged and workspace.n_samples < 200_000
+    assert workspace.history[-1] == len(workspace.voxels)
+    assert workspace.volume == len(workspace.voxels) * 0.005**3
+    grid, _ = workspace.occupancy()
+    assert grid.sum() == len(workspace.voxels)
+
+    # Every preview of a fully actuated design lands in the estimated workspace
+    tips = preview_kinematics(design, [[1.0, 1.0], [1.0, 0.0]]).tip_positions
+    occupied = set(voxel_codes(workspace.voxels * 0.005 + 0.0025, 0.005).tolist())
+    assert set(voxel_codes(tips.reshape(-1, 3), 0.005).tolist()) <= occupied
+    assert np.all(workspace.tip_lower <= tips.min(axis=0) + 1e-3)
+    assert np.all(workspace.tip_upper >= tips.max(axis=0) - 1e-3)
+    assert np.allclose(workspace.max_displacement, [0.0624, 0.0375], atol=1e-3)
+
+    summary = workspace.summary([actuator.id for actuator in design.actuators])
+    assert set(summary["tips"]) == {"actuator_1", "actuator_2"}
+    json.dumps(summary)
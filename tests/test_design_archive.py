@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.design_archive import DesignArchive, write_archive
+from elastica_agents.design_schema import RobotDesignSchema
+
+DESIGN_FILE = (
+    Path(__file__).parents[1]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def test_archive_round_trips_designs(tmp_path):
+    first = load_design()
+    second = load_design()
+    second.actuators[0].radius = 0.05
+    second.actuators.pop()
+    designs = [first, RobotDesignSchema(), second]
+
+    assert write_archive(tmp_path / "designs", designs) == 3
+    archive = DesignArchive(tmp_path / "designs")
+
+    assert len(archive) == 3
+    assert [archive.design(i) for i in range(3)] == designs
+    assert archive.design(-1) == second
+
+
+def test_columns_are_memory_mapped_across_designs(tmp_path):
+    design = load_design()
+    write_archive(tmp_path / "designs", [design, design])
+    archive = DesignArchive(tmp_path / "designs")
+
+    radii = archive.column("radii")
+
+    assert isinstance(archive.column("rods"), np.memmap)
+    assert radii.tolist() == [0.03] * 4
+    assert archive.design_of("actuators").tolist() == [0, 0, 1, 1]
+    assert np.array_equal(archive[1].directors[1], design.actuators[1].orientation.Q())
@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+from elastica_agents.design_checks import check_design
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.tool.design_check import check_design_file
+from elastica_agents.tool.workspace_analysis import design_score
+
+DESIGN_FILE = (
+    Path(__file__).parents[1]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def test_example_design_is_consistent():
+    assert check_design(load_design()) == []
+    assert check_design(RobotDesignSchema()) == []
+    assert json.loads(check_design_file(str(DESIGN_FILE))) == []
+
+
+def test_inconsistent_design_reports_each_issue():
+    design = load_design()
+    design.actuators[1].orientation.d3 = (0.0, 0.0, 1.0)
+    design.actuators[0].radius = 0.2
+    design.actuators[1].mode[0] = "twisting_clockwise"
+    design.connections[0].actuators.append("missing")
+    design.actuation_groups[1].actuators_actuation.append(("actuator_2", 3))
+
+    issues = {
+        (issue.code, issue.actuator, issue.connection, issue.group)
+        for issue in check_design(design)
+    }
+
+    assert issues == {
+        ("directors_not_orthonormal", "actuator_2", None, None),
+        ("d3_not_along_rod", "actuator_2", None, None),
+        ("not_slender", "actuator_1", None, None),
+        ("parameter_mode_mismatch", "actuator_2", None, None),
+        ("unknown_actuator", None, 0, None),
+        ("invalid_mode_index", None, None, "twist_group"),
+    }
+
+
+def test_unconnected_overlapping_rods_are_reported():
+    design = load_design()
+    crossing = design.actuators[1].model_copy(deep=True)
+    crossing.id = "actuator_3"
+    crossing.start_point.z = crossing.end_point.z = 0.25
+    crossing.start_point.y = -0.25
+    design.actuators.append(crossing)
+
+    issues = [issue for issue in check_design(design) if issue.code == "rods_intersect"]
+
+    assert [issue.actuator for issue in issues] == ["actuator_1"]
+    assert "actuator_3" in issues[0].message
+
+
+def test_non_finite_geometry_is_reported_instead_of_crashing(tmp_path):
+    design = load_design()
+    design.actuators[0].end_point.x = float("inf")
+    design.connections[0].rigid_link_locations[0].y = float("nan")
+    path = tmp_path / "design_1.json"
+    # model_dump_json would write inf and NaN as null
+    path.write_text(json.dumps(design.model_dump()))
+
+    issues = [
+        (issue.code, issue.actuator, issue.connection)
+        for issue in check_design(design)
+        if issue.severity == "error"
+    ]
+
+    assert issues == [
+        ("non_finite_geometry", "actuator_1", None),
+        ("non_finite_geometry", None, 0),
+    ]
+    codes = [issue["code"] for issue in json.loads(check_design_file(str(path)))]
+    assert codes == ["non_finite_geometry"] * 2
+    assert design_score(path) == -2.0
+
+
+def test_rechecking_an_unchanged_file_is_not_a_repeat(tmp_path):
+    first, second = tmp_path / "design_1.json", tmp_path / "design_2.json"
+    first.write_text(DESIGN_FILE.read_text())
+    second.write_text(DESIGN_FILE.read_text())
+
+    assert json.loads(check_design_file(str(first))) == []
+    assert json.loads(check_design_file(str(first))) == []
+    # Another candidate's file has its own history
+    assert json.loads(check_design_file(str(second))) == []
+
+    design = load_design()
+    design.actuators[0].end_point.z = 2.0
+    first.write_text(design.model_dump_json())
+    assert json.loads(check_design_file(str(first))) == []
+
+    first.write_text(DESIGN_FILE.read_text())
+    issues = json.loads(check_design_file(str(first)))
+    assert [issue["code"] for issue in issues] == ["repeated_design"]
+    assert "the same as attempt 1" in issues[0]["message"]
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+from elastica_agents.design_hash import (
+    N_FEATURES,
+    DesignSimilarityIndex,
+    design_features,
+    design_hash,
+)
+from elastica_agents.design_schema import RobotDesignSchema
+
+DESIGN_FILE = (
+    Path(__file__).parents[1]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def renamed_and_reordered() -> RobotDesignSchema:
+    design = load_design()
+    names = {"actuator_1": "b", "actuator_2": "a"}
+    for actuator in design.actuators:
+        actuator.id = names[actuator.id]
+    design.actuators.reverse()
+    for connection in design.connections:
+        connection.actuators = [names[name] for name in reversed(connection.actuators)]
+    for group in design.actuation_groups:
+        group.name = group.name.upper()
+        group.actuators_actuation = [
+            (names[name], mode) for name, mode in group.actuators_actuation
+        ]
+    design.actuation_groups.reverse()
+    return design
+
+
+def test_hash_ignores_ids_and_ordering():
+    design = load_design()
+
+    assert design_hash(design) == design_hash(renamed_and_reordered())
+    assert len(design_features(design)) == N_FEATURES
+
+    design.actuators[0].radius = 0.031
+    assert design_hash(design) != design_hash(load_design())
+
+
+def test_similarity_index_finds_exact_and_near_duplicates():
+    index = DesignSimilarityIndex()
+    index.add("first", load_design(), value="design_1.png")
+
+    exact = index.match(renamed_and_reordered())
+    assert exact.key == "first" and exact.value == "design_1.png" and exact.exact
+
+    nudged = load_design()
+    nudged.actuators[0].end_point.z = 0.501
+    near = index.match(nudged)
+    assert near is not None and not near.exact
+
+    nudged.actuators[0].end_point.z = 2.0
+    assert index.match(nudged) is None
+    assert index.match(RobotDesignSchema()) is None
@@ -0,0 +1,87 @@
+from elastica_agents.design_index import design_index, invalidate_design_index
+from elastica_agents.design_schema import (
+    Actuator,
+    ActuationGroup,
+    Connection,
+    Point3D,
+    RobotDesignSchema,
+    RotationMatrix,
+)
+
+FRAME = RotationMatrix(d1=(1, 0, 0), d2=(0, 1, 0), d3=(0, 0, 1))
+
+
+def make_design() -> RobotDesignSchema:
+    """a - b, then b branches into c and d; d continues to e. f is on its own."""
+    actuators = [
+        Actuator(
+            id=name,
+            mode=[],
+            actuation_parameter=[],
+            start_point=Point3D(x=0, y=0, z=0),
+            end_point=Point3D(x=0, y=0, z=1),
+            radius=0.01,
+            orientation=FRAME,
+        )
+        for name in "abcdef"
+    ]
+    links = [["a", "b"], ["b", "c", "d"], ["d", "e"], ["e", "missing"]]
+    connections = [
+        Connection(actuators=link, rigid_link_locations=[], orientation=FRAME)
+        for link in links
+    ]
+    groups = [ActuationGroup(name="g", actuators_actuation=[("c", 0), ("x", 1)])]
+    return RobotDesignSchema(
+        actuators=actuators, connections=connections, actuation_groups=groups
+    )
+
+
+def test_index_resolves_ids_and_adjacency():
+    index = design_index(make_design())
+
+    assert index.row("d") == 3
+    assert index.connections_of(3).tolist() == [1, 2]
+    assert index.actuators_of(3).tolist() == [4, -1]
+    assert index.neighbors_of(1).tolist() == [0, 2, 3]
+    assert index.groups["g"] == [(2, 0), (-1, 1)]
+
+
+def test_kinematic_tree_branches_and_chains():
+    index = design_index(make_design())
+
+    assert index.parent.tolist() == [-1, 0, 1, 1, 3, -1]
+    assert index.depth.tolist() == [0, 1, 2, 2, 3, 0]
+    assert index.roots.tolist() == [0, 5]
+    assert index.branch_points().tolist() == [1]
+    assert index.serial_chains() == [[0, 1], [2], [3, 4], [5]]
+
+    assert design_index(make_design(), root=4).parent.tolist() == [1, 3, 3, 4, -1, -1]
+
+
+def test_index_is_cached_until_connectivity_changes():
+    design = make_design()
+    index = design_index(design)
+
+    assert design_index(design) is index
+    design.actuators[0].radius = 0.5
+    assert design_index(design) is index
+
+    design.connections[0].actuators.append("f")
+    assert design_index(design) is index  # in-place edits need invalidating
+    invalidate_design_index(design)
+    rebuilt = design_index(design)
+    assert rebuilt is not index
+    assert rebuilt.parent[5] == 0
+
+    design.connections.pop()
+    assert design_index(design) is not rebuilt
+    design.actuators = design.actuators[:3]
+    assert len(design_index(design)) == 3
+
+
+def test_indexing_does_not_change_equality():
+    design = make_design()
+    design_index(design)
+
+    assert design == design.model_copy(deep=True)
+    assert design == make_design()
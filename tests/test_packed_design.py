@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from elastica_agents.design_schema import RobotDesignSchema
+from elastica_agents.packed_design import PackedDesign
+from elastica_agents.tool.geometry import RodGeometry
+
+DESIGN_FILE = (
+    Path(__file__).parents[1]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def load_design() -> RobotDesignSchema:
+    with open(DESIGN_FILE, "r") as f:
+        return RobotDesignSchema.model_validate(json.load(f))
+
+
+def test_round_trip_is_lossless():
+    design = load_design()
+    design.connections[0].actuators.append("missing_actuator")
+
+    packed = PackedDesign.from_design(design)
+
+    assert packed.to_design() == design
+    assert packed.ids[packed.n_actuators :] == ["missing_actuator"]
+    assert (
+        PackedDesign.from_design(RobotDesignSchema()).to_design() == RobotDesignSchema()
+    )
+
+
+def test_rod_arrays_are_views_of_one_buffer():
+    design = load_design()
+    packed = PackedDesign.from_design(design)
+    geometry = RodGeometry.from_packed(packed)
+
+    assert np.shares_memory(geometry.directors, packed.rods)
+    assert np.array_equal(packed.directors[1], design.actuators[1].orientation.Q())
+    assert packed.radii.tolist() == [actuator.radius for actuator in design.actuators]
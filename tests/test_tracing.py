@@ -0,0 +1,64 @@
+import asyncio
+
+from click.testing import CliRunner
+
+from elastica_agents.cli.trace_report import main as trace_report
+from elastica_agents.tracing import (
+    configure_tracer,
+    current_span,
+    load_spans,
+    span,
+    summarize_spans,
+)
+
+
+def test_spans_nest_across_tasks_and_are_summarized(tmp_path):
+    tracer = configure_tracer(tmp_path / "logs" / "trace-1.jsonl", run="one")
+
+    async def agent(name):
+        with span("agent", name):
+            await asyncio.sleep(0.01)
+            with span("llm", "gpt-4o-mini") as llm:
+                llm.add(tokens_in=10, tokens_out=5)
+                llm.set(cache="hit")
+            with span("tool", "render_design"):
+                await asyncio.sleep(0.02)
+
+    async def main():
+        with span("run", "elastica-agents"):
+            await asyncio.gather(agent("design_agent"), agent("rendering_agent"))
+
+    try:
+        asyncio.run(main())
+        assert current_span() is None
+    finally:
+        configure_tracer(None)
+
+    spans = load_spans([tmp_path])
+    assert len(spans) == 7 and {record["run"] for record in spans} == {"one"}
+    run = next(record for record in spans if record["kind"] == "run")
+    agents = [record for record in spans if record["kind"] == "agent"]
+    assert all(record["parent"] == run["id"] for record in agents)
+    # Token counts add up in the enclosing spans
+    assert run["tokens_in"] == 20 and agents[0]["tokens_out"] == 5
+
+    rows = {(row["kind"], row["name"]): row for row in summarize_spans(spans)}
+    tool = rows["tool", "render_design"]
+    assert tool["count"] == 2 and tool["self_ms"] >= 40
+    assert rows["llm", "gpt-4o-mini"]["cache_hits"] == 2
+    # Time of the children is not counted again for the run
+    assert rows["run", "elastica-agents"]["self_ms"] < run["ms"] / 2
+    assert tracer.path == tmp_path / "logs" / "trace-1.jsonl"
+
+
+def test_report_command(tmp_path):
+    configure_tracer(tmp_path / "trace-2.jsonl")
+    try:
+        with span("render", "render_geometry", backend="numpy"):
+            pass
+    finally:
+        configure_tracer(None)
+
+    result = CliRunner().invoke(trace_report, [str(tmp_path)])
+    assert result.exit_code == 0
+    assert "1 runs, 1 spans" in result.output and "render_geometry" in result.output
@@ -0,0 +1,73 @@
+import shutil
+from pathlib import Path
+
+from elastica_agents.tool import bulk_validation
+from elastica_agents.tool.bulk_validation import (
+    iter_design_sources,
+    validate_archive,
+    validate_design,
+    validate_designs,
+)
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def test_invalid_designs_are_reported_without_stopping(tmp_path):
+    shutil.copy(DESIGN_FILE, tmp_path / "good.json")
+    (tmp_path / "bad.json").write_text('{"actuators": [{"id": 1}]}')
+    (tmp_path / "broken.json").write_text("{")
+    archive = tmp_path / "designs.jsonl"
+    archive.write_text(DESIGN_FILE.read_text().replace("\n", "") + "\n\n[]\n")
+
+    results = list(validate_designs(iter_design_sources(tmp_path), max_workers=2))
+    results += list(validate_designs(iter_design_sources(archive), max_workers=1))
+
+    assert [Path(r.source).name for r in results] == [
+        "bad.json",
+        "broken.json",
+        "good.json",
+        "designs.jsonl:1",
+        "designs.jsonl:3",
+    ]
+    assert [r.ok for r in results] == [False, False, True, True, False]
+    assert "actuators.0.id" in results[0].error
+
+
+def test_checks_report_non_finite_geometry_and_failures(monkeypatch):
+    payload = DESIGN_FILE.read_bytes().replace(b'"x": 0.0', b'"x": Infinity', 1)
+
+    result = validate_design("inf.json", payload, checks=True)
+    assert not result.ok and "non_finite_geometry" in result.error
+
+    def broken_check(design):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(bulk_validation, "check_design", broken_check)
+    result = validate_design("good.json", DESIGN_FILE.read_bytes(), checks=True)
+    assert result.error == "check failed: ValueError: boom"
+
+
+def test_validate_archive_reports_counts(tmp_path):
+    lines = []
+    assert validate_archive(DESIGN_FILE, max_workers=1, echo=lines.append) == (1, 0)
+    assert "1 valid, 0 invalid" in lines[-1]
+
+
+def test_items_are_pulled_lazily():
+    pulled = []
+
+    def sources():
+        for index in range(1000):
+            pulled.append(index)
+            yield f"missing-{index}.json", b"{"
+
+    results = validate_designs(sources(), max_workers=2, chunksize=3)
+    first = next(results)
+    assert first.source == "missing-0.json" and not first.ok
+    assert len(pulled) <= 2 * 2 * 3
+    results.close()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from elastica_agents.tool.collision import (
+    connected_pairs,
+    find_self_intersections,
+    segment_distances,
+)
+from elastica_agents.tool.geometry import RodGeometry
+
+
+def test_segment_distances_cover_crossing_parallel_and_degenerate_segments():
+    p1 = np.array([[-1.0, 0, 0], [0, 0, 0], [0, 0, 0], [2.0, 0, 0]])
+    q1 = np.array([[1.0, 0, 0], [1.0, 0, 0], [0, 0, 0], [3.0, 0, 0]])
+    p2 = np.array([[0, -1.0, 1], [0, 1.0, 0], [0, 0, 3], [0, 0, 0]])
+    q2 = np.array([[0, 1.0, 1], [1.0, 1.0, 0], [0, 0, 3], [1.0, 0, 0]])
+
+    assert np.allclose(segment_distances(p1, q1, p2, q2), [1.0, 1.0, 3.0, 1.0])
+
+
+def test_self_intersections_match_brute_force_and_skip_connected_rods():
+    rng = np.random.default_rng(0)
+    starts = rng.random((300, 3))
+    ends = starts + rng.normal(scale=0.05, size=(300, 3))
+    radii = np.full(300, 0.005)
+    geometry = RodGeometry.from_points(starts, ends, radii)
+
+    pairs, penetration = find_self_intersections(geometry)
+
+    i, j = np.triu_indices(300, k=1)
+    distance = segment_distances(starts[i], ends[i], starts[j], ends[j])
+    hit = distance < radii[i] + radii[j]
+    assert len(pairs) > 0
+    assert set(map(tuple, pairs.tolist())) == set(zip(i[hit].tolist(), j[hit].tolist()))
+    assert np.all(penetration > 0.0)
+
+    exclude = connected_pairs(np.array([0, 2]), pairs[0])
+    remaining, _ = find_self_intersections(geometry, exclude=exclude)
+    assert len(remaining) == len(pairs) - 1
@@ -0,0 +1,29 @@
+import numpy as np
+
+from elastica_agents.design_schema import Point3D
+from elastica_agents.tool.geometry import RodGeometry
+
+
+def test_from_points_builds_frames_along_rods():
+    geometry = RodGeometry.from_points(
+        [Point3D(x=0, y=0, z=0), Point3D(x=1, y=1, z=1)],
+        [Point3D(x=0, y=0, z=2), Point3D(x=1, y=1, z=1)],
+        [0.1, 0.2],
+    )
+
+    assert len(geometry) == 2
+    assert geometry.directors.shape == (2, 3, 3)
+    assert np.allclose(geometry.directors[0, 2], (0.0, 0.0, 1.0))
+    # Frames are orthonormal, including the zero-length rod
+    for frame in geometry.directors:
+        assert np.allclose(frame @ frame.T, np.eye(3))
+    assert np.allclose(geometry.lengths, (2.0, 0.0))
+
+
+def test_bounding_sphere_encloses_rods():
+    geometry = RodGeometry.from_points([[-1.0, 0.0, 0.0]], [[1.0, 0.0, 0.0]], [0.5])
+
+    center, extent = geometry.bounding_sphere()
+
+    assert np.allclose(center, 0.0) and np.isclose(extent, 1.5)
+    assert RodGeometry.from_points([], [], []).bounding_sphere()[1] == 0.0
@@ -0,0 +1,41 @@
+import numpy as np
+
+from elastica_agents.tool.rasterizer import camera_basis, project, rasterize_rods
+
+
+def test_look_at_projects_to_image_centre():
+    camera = camera_basis((0.6, 0.7, -0.9), (0.0, 0.0, 0.0), 80, 60)
+
+    col, row, depth = project(np.zeros(3), *camera, 80, 60)
+
+    assert np.isclose(col, 40.0) and np.isclose(row, 30.0) and depth > 0.0
+
+
+def test_rasterize_rods_draws_rod_over_background():
+    empty = rasterize_rods(np.zeros((0, 3)), np.zeros((0, 3)), [], 80, 60)
+    image = rasterize_rods([[0.0, -0.2, 0.0]], [[0.0, 0.2, 0.0]], [0.05], 80, 60)
+
+    assert image.shape == (60, 80, 3) and image.dtype == np.uint8
+    # The rod passes through the look-at point, so the centre pixel changes
+    assert not np.array_equal(image[30, 40], empty[30, 40])
+    assert np.array_equal(image[0, 0], empty[0, 0])
+
+
+def test_many_rods_render_independently_of_order():
+    rng = np.random.default_rng(0)
+    start = rng.uniform(-0.3, 0.3, (60, 3))
+    end = start + rng.normal(0.0, 0.1, (60, 3))
+    radii = rng.uniform(0.005, 0.02, 60)
+
+    # Not a multiple of the tile size, and the rods overlap in depth
+    image = rasterize_rods(start, end, radii, 83, 61)
+    reversed_image = rasterize_rods(start[::-1], end[::-1], radii[::-1], 83, 61)
+    empty = rasterize_rods(np.zeros((0, 3)), np.zeros((0, 3)), [], 83, 61)
+
+    assert np.array_equal(image, reversed_image)
+    for rod in range(0, 60, 10):
+        alone = rasterize_rods(
+            start[rod : rod + 1], end[rod : rod + 1], radii[rod], 83, 61
+        )
+        covered = np.any(alone != empty, axis=-1)
+        assert np.all(np.any(image[covered] != empty[covered], axis=-1))
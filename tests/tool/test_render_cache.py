@@ -0,0 +1,69 @@
+import os
+
+from elastica_agents.design_schema import Point3D
+from elastica_agents.tool.render_cache import RenderCache, render_key
+
+CAMERA = ((0.6, 0.7, -0.9), (0.0, 0.0, 0.0))
+
+
+def test_render_key_ignores_rod_order():
+    starts = [Point3D(x=0, y=0, z=0), Point3D(x=0, y=0, z=0)]
+    ends = [Point3D(x=0, y=0, z=0.5), Point3D(x=0, y=0.5, z=0)]
+    radii = [0.03, 0.02]
+
+    key = render_key(starts, ends, radii, 800, 600, *CAMERA)
+
+    assert key == render_key(starts[::-1], ends[::-1], radii[::-1], 800, 600, *CAMERA)
+    assert key != render_key(starts, ends, [0.03, 0.03], 800, 600, *CAMERA)
+    assert key != render_key(starts, ends, radii, 400, 300, *CAMERA)
+
+
+def test_render_cache_evicts_least_recently_used(tmp_path):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"x" * 100)
+    cache = RenderCache(tmp_path / "cache", max_bytes=250)
+
+    cache.put("a", str(image))
+    cache.put("b", str(image))
+    os.utime(cache.directory / "a.png", (1, 1))
+    os.utime(cache.directory / "b.png", (2, 2))
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", str(image))
+
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_fetch_of_evicted_entry_counts_as_miss(tmp_path, monkeypatch):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"x" * 100)
+    cache = RenderCache(tmp_path / "cache")
+    cache.put("a", str(image))
+
+    def evicted(source, destination):
+        raise FileNotFoundError(source)
+
+    monkeypatch.setattr("shutil.copyfile", evicted)
+    assert not cache.fetch("a", str(tmp_path / "out.png"))
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_put_scans_the_directory_only_when_full(tmp_path, monkeypatch):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"x" * 100)
+    cache = RenderCache(tmp_path / "cache", max_bytes=250)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+
+    cache.put("a", str(image))
+    cache.put("b", str(image))
+    cache.put("b", str(image))  # replacing an entry does not grow the cache
+    assert scans == []
+
+    cache.put("c", str(image))
+    assert scans == [1] and cache.stats()["bytes"] <= 250
+    assert RenderCache(tmp_path / "cache", max_bytes=250)._bytes == cache._bytes
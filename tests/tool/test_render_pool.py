@@ -0,0 +1,78 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from elastica_agents.tool import render_pool
+from elastica_agents.tool.render_cache import configure_render_cache
+from elastica_agents.tool.render_pool import RenderJob, RenderPool, render_designs
+
+DESIGN_FILE = (
+    Path(__file__).parents[2]
+    / "examples"
+    / "base_handling_design_schema"
+    / "design1.json"
+)
+
+
+def make_job(length: float, **kwargs) -> RenderJob:
+    return RenderJob(
+        start_points=[[0.0, 0.0, 0.0]],
+        end_points=[[0.0, 0.0, length]],
+        radii=[0.03],
+        width=64,
+        height=48,
+        backend="numpy",
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def pool():
+    with RenderPool(max_workers=2, warm=False) as pool:
+        yield pool
+
+
+def test_render_all_keeps_submission_order(pool):
+    jobs = [make_job(length) for length in (0.2, 0.5, 0.8)]
+
+    images = pool.render_all(jobs)
+
+    assert [image.shape for image in images] == [(48, 64, 3)] * 3
+    for job, image in zip(jobs, images):
+        assert np.array_equal(image, render_pool._run_job(job))
+    assert sorted(index for index, _ in pool.render(jobs)) == [0, 1, 2]
+
+
+def test_cached_jobs_are_not_rendered_again(pool, tmp_path, monkeypatch):
+    cache = configure_render_cache(tmp_path / "cache")
+    try:
+        jobs = [
+            make_job(0.5, output_file_name=str(tmp_path / "a.png")),
+            make_job(0.5),
+        ]
+        first = pool.render_all(jobs)
+        assert cache.stats()["entries"] == 1  # both jobs are the same image
+
+        monkeypatch.setattr(pool, "submit", None)  # any render would fail
+        os.remove(tmp_path / "a.png")
+        second = pool.render_all(jobs)
+    finally:
+        configure_render_cache(None)
+
+    assert second[0] == first[0] and os.path.exists(second[0])
+    assert np.array_equal(second[1], first[1])
+
+
+def test_render_designs_creates_output_dir(pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(render_pool, "_shared_pool", pool)
+    design_file = tmp_path / "design_3.json"
+    shutil.copy(DESIGN_FILE, design_file)
+    output_dir = tmp_path / "images" / "run"
+
+    paths = render_designs([str(design_file)], str(output_dir), 64, 48, "numpy")
+
+    assert paths == [str(output_dir / "design_3.png")]
+    assert os.path.exists(paths[0])
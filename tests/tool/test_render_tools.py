@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from mcp.server.fastmcp.tools import Tool
+from PIL import Image
+
+from elastica_agents.design_schema import Point3D
+from elastica_agents.tool import render_pool, rendering
+from elastica_agents.tool.render_cache import configure_render_cache
+from elastica_agents.tool.render_pool import RenderPool
+from elastica_agents.tool.render_tools import render_design, render_design_views
+
+ROD = dict(
+    start_points=[Point3D(x=0.0, y=0.0, z=0.0)],
+    end_points=[Point3D(x=0.0, y=0.0, z=0.5)],
+    radii=[0.03],
+    width=64,
+    height=48,
+    backend="numpy",
+)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    with RenderPool(max_workers=2, warm=False) as pool:
+        monkeypatch.setattr(render_pool, "_shared_pool", pool)
+        yield pool
+
+
+def load(path) -> np.ndarray:
+    return np.asarray(Image.open(path).convert("RGB"))
+
+
+def test_agent_tools_render_in_the_pool(pool, tmp_path):
+    # Arguments as the LLM sends them
+    arguments = json.loads(json.dumps(ROD, default=lambda point: point.model_dump()))
+
+    async def main():
+        tools = [
+            Tool.from_function(render_design),
+            Tool.from_function(render_design_views),
+        ]
+        assert all(tool.is_async for tool in tools)
+        await asyncio.gather(
+            tools[0].run({**arguments, "output_file_name": str(tmp_path / "pool.png")}),
+            tools[1].run(
+                {**arguments, "output_file_name": str(tmp_path / "pool_views.png")}
+            ),
+        )
+
+    asyncio.run(main())
+
+    rendering.render_design(**ROD, output_file_name=str(tmp_path / "local.png"))
+    rendering.render_design_views(
+        **ROD, output_file_name=str(tmp_path / "local_views.png")
+    )
+    assert np.array_equal(load(tmp_path / "pool.png"), load(tmp_path / "local.png"))
+    assert np.array_equal(
+        load(tmp_path / "pool_views.png"), load(tmp_path / "local_views.png")
+    )
+
+
+def test_agent_tools_share_the_render_cache(pool, tmp_path, monkeypatch):
+    cache = configure_render_cache(tmp_path / "cache")
+    try:
+        rendering.render_design_views(
+            **ROD, output_file_name=str(tmp_path / "local_views.png")
+        )
+        monkeypatch.setattr(pool, "submit", None)  # any render would fail
+        output = tmp_path / "pool_views.png"
+        asyncio.run(render_design_views(**ROD, output_file_name=str(output)))
+        assert cache.stats()["hits"] == 1 and output.exists()
+    finally:
+        configure_render_cache(None)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from elastica_agents.design_schema import Point3D
+from elastica_agents.tool.geometry import RodGeometry
+from elastica_agents.tool.rasterizer import camera_basis, project
+from elastica_agents.tool.rendering import (
+    DEFAULT_CAMERA_POSITION,
+    DEFAULT_LOOK_AT,
+    VIEWS,
+    render_design_views,
+    render_views,
+    tile_images,
+    view_cameras,
+)
+
+LARGE = RodGeometry.from_points(
+    [[0.0, 0.0, 0.0], [0.0, 0.0, 2.0]], [[0.0, 0.0, 2.0], [1.5, 1.0, 2.0]], [0.05, 0.05]
+)
+
+
+def test_view_cameras_frame_the_design_bounds():
+    center, extent = LARGE.bounding_sphere()
+    views = list(VIEWS)
+
+    for view, (position, look_at, sky) in zip(views, view_cameras(LARGE, views)):
+        assert np.allclose(look_at, center)
+        offset = np.subtract(position, center)
+        direction = np.asarray(VIEWS[view][0]) / np.linalg.norm(VIEWS[view][0])
+        assert np.allclose(offset / np.linalg.norm(offset), direction)
+
+        # Every rod end lands inside a square image
+        camera = camera_basis(position, look_at, 100, 100, sky=sky)
+        points = np.vstack([LARGE.start_points, LARGE.end_points])
+        col, row, depth = project(points, *camera, 100, 100)
+        assert np.all(depth > extent)
+        assert np.all((col > 0) & (col < 100) & (row > 0) & (row < 100))
+
+
+def test_small_designs_keep_the_default_camera_distance():
+    small = RodGeometry.from_points([[0.0, 0.0, 0.0]], [[0.0, 0.0, 0.1]], [0.01])
+    (position, look_at, _), *_ = view_cameras(small, ["front"])
+
+    default = np.linalg.norm(np.subtract(DEFAULT_CAMERA_POSITION, DEFAULT_LOOK_AT))
+    assert np.isclose(np.linalg.norm(np.subtract(position, look_at)), default)
+    with pytest.raises(ValueError):
+        view_cameras(small, ["below"])
+
+
+def test_tile_images_shape_and_labels():
+    images = [np.full((30, 40, 3), 200, dtype=np.uint8) for _ in range(3)]
+
+    plain = tile_images(images)
+    labelled = tile_images(images, labels=["front", "side", "top"])
+
+    # Three tiles fill a 2 x 2 grid; the empty slot stays white
+    assert plain.shape == labelled.shape == (60, 80, 3)
+    assert np.all(plain[30:, 40:] == 255)
+    for row, column in [(0, 0), (0, 40), (30, 0)]:
+        corner = (slice(row + 4, row + 16), slice(column + 6, column + 36))
+        assert labelled[corner].min() < 100 and plain[corner].min() == 200
+    assert np.all(labelled[30:, 40:] == 255)
+
+
+def test_render_views_tiles_every_view(tmp_path):
+    image = render_views(LARGE, width=160, height=120, backend="numpy")
+
+    assert image.shape == (120, 160, 3)
+    tiles = [image[:60, :80], image[:60, 80:], image[60:, :80], image[60:, 80:]]
+    assert all(len(np.unique(tile.reshape(-1, 3), axis=0)) > 2 for tile in tiles)
+
+    output = tmp_path / "views.png"
+    render_design_views(
+        [Point3D(x=0, y=0, z=0)],
+        [Point3D(x=0, y=0, z=0.5)],
+        [0.03],
+        str(output),
+        width=160,
+        height=120,
+        backend="numpy",
+    )
+    assert output.exists()
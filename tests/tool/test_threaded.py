@@ -0,0 +1,28 @@
+import asyncio
+import threading
+
+from mcp.server.fastmcp.tools import Tool
+
+from elastica_agents.tool.threaded import threaded_tool
+
+
+def blocking_tool(design_file: str, scale: float = 1.0) -> str:
+    """Report the calling thread."""
+    return f"{design_file} {scale} {threading.get_ident()}"
+
+
+def test_threaded_tool_keeps_the_tool_and_runs_off_the_loop_thread():
+    plain = Tool.from_function(blocking_tool)
+    threaded = Tool.from_function(threaded_tool(blocking_tool))
+
+    assert threaded.is_async and not plain.is_async
+    assert (threaded.name, threaded.description, threaded.parameters) == (
+        plain.name,
+        plain.description,
+        plain.parameters,
+    )
+
+    result = asyncio.run(threaded.run({"design_file": "design.json", "scale": 2}))
+    name, scale, thread = result.split()
+    assert (name, float(scale)) == ("design.json", 2.0)
+    assert int(thread) != threading.get_ident()